@@ -1,8 +1,11 @@
-from app import app, db
-from models import Event, Location, User, UserRole
+from app import create_app
+from models import db, Event, Location, User, UserRole
+from services import event_calendar
 from datetime import datetime
 from werkzeug.security import generate_password_hash
 
+app = create_app()
+
 # 데이터베이스 초기화 및 더미 데이터 추가
 with app.app_context():
     db.create_all()
@@ -67,4 +70,7 @@ with app.app_context():
         db.session.rollback()
         print(f"잘못된 데이터 추가 실패: {e}")
 
+    # 달력 날짜별 행사 수를 추가한 이벤트에 맞춘다
+    event_calendar.rebuild()
+
     print("더미 데이터 추가 완료!")
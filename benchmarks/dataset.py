@@ -0,0 +1,153 @@
+# 벤치마크용 대용량 데이터 생성
+# 모든 행을 INSERT ... executemany로 청크 단위로 넣고, 비정규화 카운터도 생성하면서 함께 계산한다.
+# 같은 --seed 값이면 항상 같은 데이터가 만들어진다.
+#
+#   python benchmarks/dataset.py --database-url sqlite:////tmp/bench.db --events 100000 --participants 5000000
+import argparse
+import os
+import random
+import sys
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+
+from models import db, User, UserRole, Location, Event, Participant, Feedback, RATINGS
+from services import event_calendar
+
+BENCH_PASSWORD = 'bench1234'
+CHUNK_SIZE = 10000
+
+LOCATIONS = ['체육관', '음악실', '강당', '과학실', '도서관', '운동장', '미술실', '시청각실']
+TITLE_WORDS = ['과학', '전시회', '음악', '콘서트', '체육대회', '독서', '토론', '미술', '축제', '코딩', '캠프', '발표회', '합창', '연극']
+DESCRIPTION_WORDS = ['학생들이', '준비한', '학교에서', '진행하는', '행사입니다', '누구나', '참여할', '수', '있습니다', '함께', '즐기는', '시간']
+
+
+def _insert_chunks(table, rows, chunk_size=CHUNK_SIZE):
+    # rows는 제너레이터여도 된다 (청크만 메모리에 올린다)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            db.session.execute(insert(table), chunk)
+            db.session.commit()
+            chunk = []
+    if chunk:
+        db.session.execute(insert(table), chunk)
+        db.session.commit()
+
+
+def seed(events=1000, participants=20000, users=200, feedback_per_event=2, seed_value=42, verbose=True):
+    # 빈 스키마에 데이터를 채우고 벤치마크 시나리오가 쓸 계정 정보를 반환 (앱 컨텍스트 안에서 호출)
+    rng = random.Random(seed_value)
+    password = generate_password_hash(BENCH_PASSWORD)  # 해시는 한 번만 계산해서 재사용
+
+    def log(message):
+        if verbose:
+            print(message, flush=True)
+
+    # 사용자: 1 = superadmin, 2 = admin, 나머지 = user
+    roles = [UserRole.SUPERADMIN, UserRole.ADMIN] + [UserRole.USER] * max(users - 2, 1)
+    _insert_chunks(User, (
+        {'id': i, 'name': f'사용자{i}', 'email': f'user{i}@bench.example.com', 'password': password, 'role': role}
+        for i, role in enumerate(roles, start=1)
+    ))
+    log(f'users: {len(roles)}')
+
+    _insert_chunks(Location, ({'id': i, 'name': name} for i, name in enumerate(LOCATIONS, start=1)))
+
+    # 참가자는 앞쪽 행사에 몰리도록 분포시킨다 (인기 행사 쏠림 재현)
+    participant_counts = [0] * (events + 1)
+    participant_event_ids = []
+    for _ in range(participants):
+        event_id = int(events * rng.random() ** 2) + 1
+        participant_event_ids.append(event_id)
+        participant_counts[event_id] += 1
+
+    rating_sums = [0] * (events + 1)
+    rating_histograms = [[0] * 6 for _ in range(events + 1)]
+    feedback_rows = []
+    for event_id in range(1, events + 1):
+        for _ in range(feedback_per_event):
+            rating = rng.randint(1, 5)
+            rating_sums[event_id] += rating
+            rating_histograms[event_id][rating] += 1
+            feedback_rows.append({
+                'event_id': event_id,
+                'feedback_text': ' '.join(rng.choices(DESCRIPTION_WORDS, k=6)),
+                'rating': rating,
+            })
+
+    today = date.today()
+    _insert_chunks(Event, (
+        {
+            'id': event_id,
+            'title': f"{' '.join(rng.choices(TITLE_WORDS, k=2))} {event_id}",
+            'date': today + timedelta(days=1 + event_id % 365),
+            'location_id': rng.randint(1, len(LOCATIONS)),
+            'description': ' '.join(rng.choices(DESCRIPTION_WORDS + TITLE_WORDS, k=12)),
+            'user_id': 1 if event_id % 2 else 2,
+            'participant_count': participant_counts[event_id],
+            'attended_count': participant_counts[event_id],
+            'rating_sum': rating_sums[event_id],
+            'rating_count': feedback_per_event,
+            **{f'rating_{rating}_count': rating_histograms[event_id][rating] for rating in RATINGS},
+        }
+        for event_id in range(1, events + 1)
+    ))
+    log(f'events: {events}')
+
+    _insert_chunks(Participant, (
+        {
+            'name': f'학생{index}',
+            'contact': f'010{index:08d}',
+            'student_id': f'{index:010d}',
+            'event_id': event_id,
+            'user_id': rng.randint(3, len(roles)),
+            'attendance': True,
+            'waitlisted': False,
+            'uuid': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        }
+        for index, event_id in enumerate(participant_event_ids)
+    ))
+    log(f'participants: {participants}')
+
+    _insert_chunks(Feedback, feedback_rows)
+    log(f'feedback: {len(feedback_rows)}')
+
+    event_calendar.rebuild()  # 달력 날짜별 버킷
+
+    return {
+        'events': events,
+        'participants': participants,
+        'users': len(roles),
+        'password': BENCH_PASSWORD,
+        'superadmin_email': 'user1@bench.example.com',
+        'admin_email': 'user2@bench.example.com',
+        'user_email': 'user3@bench.example.com',
+        'next_participant_index': participants,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크용 대용량 데이터 생성')
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--participants', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', default=None, help='기본값: DATABASE_URL 환경 변수')
+    args = parser.parse_args()
+
+    from app import create_app
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database_url} if args.database_url else None)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed(args.events, args.participants, args.users, seed_value=args.seed)
+
+
+if __name__ == '__main__':
+    main()
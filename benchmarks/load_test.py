@@ -0,0 +1,511 @@
+# 블루프린트 전체 라우트 부하 테스트
+# 임시 SQLite(또는 --database-url로 지정한 MySQL)에 데이터를 채운 뒤, 라우트마다 여러 클라이언트
+# 스레드가 Flask 테스트 클라이언트로 동시에 요청을 보내 p50/p95/p99 지연 시간, 처리량,
+# 요청당 쿼리 수를 측정한다. 쿼리 수는 스트리밍 응답도 본문까지 포함하도록 응답 헤더 대신
+# SQL 프로파일러의 엔드포인트별 리포트에서 읽는다. 예상한 상태 코드/리다이렉트 위치가 아니거나
+# error 플래시가 남은 응답은 오류로 센다 (실패해도 200이나 폼으로의 리다이렉트를 돌려주는 라우트가 많다).
+#
+#   python benchmarks/load_test.py --events 100000 --participants 5000000 --save-baseline
+#   python benchmarks/load_test.py --compare                 # 저장된 기준선과 비교 (p95가 20% 넘게 느려지면 실패)
+#   python benchmarks/load_test.py --only event_bp.list_events --clients 32
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# name: 보고서 이름, role: 로그인할 계정(None/user/admin/superadmin)
+# prepare(ctx, n): 시나리오 전에 필요한 데이터 준비 (시간 측정 제외)
+# call(client, ctx, i): 측정할 요청 한 건
+# expect: 성공 시 상태 코드 또는 리다이렉트될 경로
+Scenario = namedtuple('Scenario', ['name', 'role', 'call', 'prepare', 'expect'])
+
+
+def scenario(name, role=None, prepare=None, expect=200):
+    def decorator(call):
+        SCENARIOS.append(Scenario(name, role, call, prepare, expect))
+        return call
+    return decorator
+
+
+SCENARIOS = []
+
+
+def _random_event_id(ctx):
+    return ctx['rng'].randint(1, ctx['events'])
+
+
+def _future_day(days=30):
+    return date.today() + timedelta(days=days)
+
+
+def _future_date(days=30):
+    # 폼에 넣을 문자열
+    return _future_day(days).isoformat()
+
+
+def _unique(ctx):
+    # 스레드 간에 겹치지 않는 번호 (학번/연락처/이메일 생성용)
+    with ctx['lock']:
+        ctx['next_participant_index'] += 1
+        return ctx['next_participant_index']
+
+
+# --- 데이터 준비 함수 ---------------------------------------------------------
+
+def _prepare_users(ctx, n, key):
+    from werkzeug.security import generate_password_hash
+    from models import db, User, UserRole
+    password = generate_password_hash(ctx['password'])
+    users = [User(name=f'{key}{i}', email=f'{key}{i}-{time.time_ns()}@bench.example.com', password=password, role=UserRole.USER)
+             for i in range(n)]
+    db.session.add_all(users)
+    db.session.commit()
+    ctx[key] = [user.id for user in users]
+    ctx[f'{key}_emails'] = [user.email for user in users]
+
+
+def _prepare_disposable_events(ctx, n):
+    from models import db, Event
+    from services import event_calendar
+    events = [Event(title=f'삭제용 행사 {i}', date=_future_day(), user_id=2) for i in range(n)]
+    db.session.add_all(events)
+    for event in events:
+        event_calendar.event_added(event.date)  # 삭제할 때 줄어들 날짜 버킷
+    db.session.commit()
+    ctx['disposable_events'] = [event.id for event in events]
+
+
+def _prepare_participants(ctx, n):
+    from models import db, Participant
+    rows = db.session.query(Participant.event_id, Participant.uuid)\
+        .filter(Participant.id.in_(ctx['rng'].sample(range(1, ctx['participants'] + 1), min(n, ctx['participants']))))\
+        .all()
+    ctx['participant_refs'] = [(row.event_id, row.uuid) for row in rows] or [(1, 'missing')]
+
+
+def _prepare_cancellable(ctx, n):
+    import uuid
+    from models import db, Participant
+    from services import counters
+    refs = []
+    for _ in range(n):
+        index = _unique(ctx)
+        participant = Participant(name=f'취소{index}', contact=f'019{index:08d}', student_id=f'c{index:09d}',
+                                  event_id=_random_event_id(ctx), user_id=3, uuid=str(uuid.uuid4()))
+        db.session.add(participant)
+        counters.participant_added(participant.event_id, attended=True)
+        refs.append((participant.event_id, participant.uuid))
+    db.session.commit()
+    ctx['cancellable'] = refs
+
+
+def _prepare_feedback(ctx, n):
+    from models import db, Feedback
+    from services import counters
+    feedbacks = [Feedback(event_id=_random_event_id(ctx), feedback_text='삭제용 피드백', rating=3) for _ in range(n)]
+    db.session.add_all(feedbacks)
+    for feedback in feedbacks:
+        counters.feedback_added(feedback.event_id, feedback.rating)
+    db.session.commit()
+    ctx['feedback_refs'] = [(feedback.event_id, feedback.id) for feedback in feedbacks]
+
+
+def _prepare_second_page(ctx, n):
+    from models import Event
+    from services.pagination import encode_cursor
+    rows = Event.query.order_by(Event.date.desc(), Event.id.desc()).limit(20).all()
+    ctx['second_page_cursor'] = encode_cursor(rows[-1].date, rows[-1].id) if rows else ''
+
+
+# --- 시나리오 ---------------------------------------------------------------
+
+@scenario('home')
+def _home(client, ctx, i):
+    return client.get('/')
+
+
+@scenario('auth_bp.register[GET]')
+def _register_form(client, ctx, i):
+    return client.get('/auth/register')
+
+
+@scenario('auth_bp.register[POST]', expect='/')
+def _register(client, ctx, i):
+    index = _unique(ctx)
+    return client.post('/auth/register', data={'name': f'신규{index}', 'email': f'new{index}-{time.time_ns()}@bench.example.com', 'password': ctx['password']})
+
+
+@scenario('auth_bp.login[GET]')
+def _login_form(client, ctx, i):
+    return client.get('/auth/login')
+
+
+@scenario('auth_bp.login[POST]', expect='/')
+def _login(client, ctx, i):
+    return client.post('/auth/login', data={'email': ctx['user_email'], 'password': ctx['password']})
+
+
+@scenario('auth_bp.logout', role='user', expect='/')
+def _logout(client, ctx, i):
+    return client.get('/auth/logout')
+
+
+@scenario('auth_bp.mypage[user]', role='user')
+def _mypage_user(client, ctx, i):
+    return client.get('/auth/mypage')
+
+
+@scenario('auth_bp.mypage[superadmin]', role='superadmin')
+def _mypage_superadmin(client, ctx, i):
+    return client.get('/auth/mypage')
+
+
+@scenario('auth_bp.request_admin', role='user', expect='/auth/mypage')
+def _request_admin(client, ctx, i):
+    return client.post('/auth/request_admin')
+
+
+@scenario('auth_bp.approve_admin', role='superadmin', prepare=lambda ctx, n: _prepare_users(ctx, n, 'approve'), expect='/auth/mypage')
+def _approve_admin(client, ctx, i):
+    return client.post(f"/auth/approve_admin/{ctx['approve'][i]}")
+
+
+@scenario('auth_bp.delete_admin_request', role='superadmin', prepare=lambda ctx, n: _prepare_users(ctx, n, 'reject'), expect='/auth/mypage')
+def _delete_admin_request(client, ctx, i):
+    return client.post(f"/auth/delete_admin_request/{ctx['reject'][i]}")
+
+
+@scenario('auth_bp.delete_account', prepare=lambda ctx, n: _prepare_users(ctx, n, 'leaving'), expect='/')
+def _delete_account(client, ctx, i):
+    # 탈퇴할 계정마다 로그인이 필요하므로 로그인 요청 시간도 함께 측정된다
+    client.post('/auth/login', data={'email': ctx['leaving_emails'][i], 'password': ctx['password']})
+    return client.post('/auth/delete_account')
+
+
+@scenario('event_bp.list_events')
+def _list_events(client, ctx, i):
+    return client.get('/events/')
+
+
+@scenario('event_bp.list_events[page2]', prepare=_prepare_second_page)
+def _list_events_page2(client, ctx, i):
+    return client.get('/events/', query_string={'cursor': ctx['second_page_cursor']})
+
+
+@scenario('event_bp.list_events[search]')
+def _search_events(client, ctx, i):
+    return client.get('/events/', query_string={'search': ctx['rng'].choice(['과학', '음악 콘서트', '코딩 캠프', '축제'])})
+
+
+@scenario('event_bp.event_detail')
+def _event_detail(client, ctx, i):
+    return client.get(f'/events/{_random_event_id(ctx)}')
+
+
+@scenario('event_bp.create_event[GET]', role='admin')
+def _create_event_form(client, ctx, i):
+    return client.get('/events/create')
+
+
+@scenario('event_bp.create_event[POST]', role='admin', expect='/events/')
+def _create_event(client, ctx, i):
+    return client.post('/events/create', data={'title': f'벤치마크 행사 {i}', 'date': _future_date(), 'location': '강당', 'description': '부하 테스트'})
+
+
+@scenario('event_bp.update_event[GET]', role='admin')
+def _update_event_form(client, ctx, i):
+    return client.get(f'/events/update/{_random_event_id(ctx)}')
+
+
+@scenario('event_bp.update_event[POST]', role='admin', expect='/auth/mypage')
+def _update_event(client, ctx, i):
+    return client.post(f'/events/update/{_random_event_id(ctx)}', data={'title': f'수정된 행사 {i}', 'date': _future_date(), 'location': '강당', 'description': '수정'})
+
+
+@scenario('event_bp.delete_event', role='admin', prepare=_prepare_disposable_events, expect='/events/')
+def _delete_event(client, ctx, i):
+    return client.post(f"/events/delete/{ctx['disposable_events'][i]}")
+
+
+@scenario('event_bp.register_participant[GET]', role='user')
+def _register_participant_form(client, ctx, i):
+    return client.get(f'/events/{_random_event_id(ctx)}/register_participant')
+
+
+@scenario('event_bp.register_participant[POST]', role='user')
+def _register_participant(client, ctx, i):
+    index = _unique(ctx)
+    return client.post(f'/events/{_random_event_id(ctx)}/register_participant',
+                       data={'name': f'학생{index}', 'contact': f'011{index:08d}', 'student_id': f'r{index:09d}'})
+
+
+@scenario('event_bp.event_stats')
+def _event_stats(client, ctx, i):
+    return client.get(f'/events/stats/{_random_event_id(ctx)}')
+
+
+@scenario('event_bp.participant_list')
+def _participant_list(client, ctx, i):
+    return client.get(f'/events/{_random_event_id(ctx)}/participants')
+
+
+@scenario('event_bp.import_participants', role='admin')
+def _import_participants(client, ctx, i):
+    rows = ['이름,연락처,학번']
+    for _ in range(50):
+        index = _unique(ctx)
+        rows.append(f'학생{index},012{index:08d},i{index:09d}')
+    roster = io.BytesIO('\n'.join(rows).encode('utf-8'))
+    return client.post(f'/events/{_random_event_id(ctx)}/participants/import',
+                       data={'file': (roster, 'roster.csv')}, headers={'Accept': 'application/json'})
+
+
+@scenario('event_bp.participant_details[GET]', prepare=_prepare_participants)
+def _participant_details(client, ctx, i):
+    event_id, participant_uuid = ctx['participant_refs'][i % len(ctx['participant_refs'])]
+    return client.get(f'/events/{event_id}/participants/{participant_uuid}')
+
+
+@scenario('event_bp.participant_details[POST]', prepare=_prepare_participants, expect='/auth/mypage')
+def _participant_details_update(client, ctx, i):
+    event_id, participant_uuid = ctx['participant_refs'][i % len(ctx['participant_refs'])]
+    index = _unique(ctx)
+    return client.post(f'/events/{event_id}/participants/{participant_uuid}',
+                       data={'name': '수정', 'contact': f'013{index:08d}', 'student_id': f'u{index:09d}', 'attendance': 'False'})
+
+
+@scenario('event_bp.cancel_participant', prepare=_prepare_cancellable, expect='/auth/mypage')
+def _cancel_participant(client, ctx, i):
+    event_id, participant_uuid = ctx['cancellable'][i]
+    return client.post(f'/events/{event_id}/participants/{participant_uuid}/cancel')
+
+
+@scenario('event_bp.leave_feedback', expect='/auth/mypage')
+def _leave_feedback(client, ctx, i):
+    return client.post(f'/events/{_random_event_id(ctx)}/leave_feedback', data={'feedback_text': '좋았습니다', 'rating': '5'})
+
+
+@scenario('event_bp.delete_feedback', prepare=_prepare_feedback, expect='/auth/mypage')
+def _delete_feedback(client, ctx, i):
+    event_id, feedback_id = ctx['feedback_refs'][i]
+    return client.post(f'/events/{event_id}/delete_feedback/{feedback_id}')
+
+
+@scenario('event_bp.most_popular_event')
+def _most_popular_event(client, ctx, i):
+    return client.get('/events/most_popular_event', query_string={'n': 10})
+
+
+@scenario('api_bp.list_events')
+def _api_list_events(client, ctx, i):
+    return client.get('/api/v2/events', query_string={'fields': 'id,title,date'})
+
+
+@scenario('api_bp.event_detail')
+def _api_event_detail(client, ctx, i):
+    return client.get(f'/api/v2/events/{_random_event_id(ctx)}', query_string={'fields': 'id,title,participant_count'})
+
+
+@scenario('api_bp.participant_list')
+def _api_participant_list(client, ctx, i):
+    return client.get(f'/api/v2/events/{_random_event_id(ctx)}/participants')
+
+
+@scenario('api_bp.event_stats')
+def _api_event_stats(client, ctx, i):
+    return client.get(f'/api/v2/events/{_random_event_id(ctx)}/stats')
+
+
+@scenario('api_bp.bulk_checkin', role='admin', prepare=_prepare_participants)
+def _api_bulk_checkin(client, ctx, i):
+    # 유효한 코드 하나 + 잘못 찍힌 코드 하나
+    event_id, participant_uuid = ctx['participant_refs'][i % len(ctx['participant_refs'])]
+    return client.post(f'/api/v2/events/{event_id}/checkin', json={'uuids': [participant_uuid, 'not-a-ticket']})
+
+
+@scenario('admin_bp.sql_report', role='admin')
+def _sql_report(client, ctx, i):
+    return client.get('/admin/sql_report')
+
+
+# --- 실행 -------------------------------------------------------------------
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def _login(client, ctx, role):
+    email = {'user': ctx['user_email'], 'admin': ctx['admin_email'], 'superadmin': ctx['superadmin_email']}[role]
+    client.post('/auth/login', data={'email': email, 'password': ctx['password']})
+
+
+def _failed(item, client, response):
+    # 예상한 상태 코드/리다이렉트 위치가 아니거나 error 플래시가 있으면 실패
+    if isinstance(item.expect, str):
+        location = urlsplit(response.headers.get('Location', '')).path
+        ok = response.status_code in (301, 302, 303) and location == item.expect
+    else:
+        ok = response.status_code == item.expect
+    # 리다이렉트를 따라가지 않으므로 플래시를 비워 세션 쿠키에 쌓이지 않게 한다
+    with client.session_transaction() as sess:
+        flashes = sess.pop('_flashes', [])
+    return not ok or any(category == 'error' for category, _ in flashes)
+
+
+def run_scenario(app, item, ctx, clients, requests):
+    from services.sql_profiler import get_store
+    if item.prepare:
+        with app.app_context():
+            item.prepare(ctx, requests)
+
+    # 시나리오마다 리포트를 비운다 (역할 로그인은 auth_bp.login에 따로 쌓인다)
+    profile_store = get_store(app)
+    profile_store.reset()
+    latencies, errors = [], []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+    barrier = threading.Barrier(clients + 1)
+
+    def worker():
+        client = app.test_client()
+        if item.role:
+            _login(client, ctx, item.role)
+        barrier.wait()
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            started = time.perf_counter()
+            response = item.call(client, ctx, i)
+            response.get_data()  # 스트리밍 응답도 끝까지 읽는다
+            elapsed = time.perf_counter() - started
+            failed = _failed(item, client, response)
+            with lock:
+                latencies.append(elapsed)
+                if failed:
+                    errors.append(response.status_code)
+            response.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - began
+
+    latencies.sort()
+    stats = profile_store.report().get(item.name.split('[', 1)[0])
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 3),
+        'throughput_rps': round(len(latencies) / wall, 1) if wall else 0.0,
+        'queries_per_request': stats['avg_queries'] if stats else 0.0,
+    }
+
+
+def compare(results, baseline, tolerance):
+    # p95가 기준선보다 tolerance 비율 넘게 느려진 라우트 목록
+    regressions = []
+    print()
+    print(f"{'route':45} {'p95 base':>10} {'p95 now':>10} {'delta':>8} {'q/req base':>11} {'q/req now':>10}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f'{name:45} {"-":>10} {result["p95_ms"]:>10.2f} {"new":>8}')
+            continue
+        delta = (result['p95_ms'] - base['p95_ms']) / base['p95_ms'] if base['p95_ms'] else 0.0
+        flag = ''
+        if delta > tolerance or result['queries_per_request'] > base['queries_per_request'] or result['errors']:
+            regressions.append(name)
+            flag = '  <-- regression'
+        print(f"{name:45} {base['p95_ms']:>10.2f} {result['p95_ms']:>10.2f} {delta:>+8.1%} "
+              f"{base['queries_per_request']:>11.2f} {result['queries_per_request']:>10.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='라우트 부하 테스트')
+    parser.add_argument('--database-url', default=None, help='기본값: 임시 SQLite 파일')
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--participants', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help='라우트당 요청 수')
+    parser.add_argument('--only', action='append', help='지정한 라우트만 실행 (여러 번 지정 가능)')
+    parser.add_argument('--cache-backend', default='none', help="페이지 캐시 백엔드 (기본 none: DB 경로를 측정)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--compare', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'load_test.db')
+    from app import create_app
+    from models import db
+    from benchmarks.dataset import seed
+
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'SQL_PROFILING': True,
+        'CACHE_BACKEND': args.cache_backend,
+        'SECRET_KEY': os.getenv('SECRET_KEY', 'bench-secret'),
+    })
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        ctx = seed(args.events, args.participants, args.users, seed_value=args.seed)
+    ctx['rng'] = random.Random(args.seed)
+    ctx['lock'] = threading.Lock()
+
+    selected = [item for item in SCENARIOS if not args.only or item.name in args.only]
+    results = {}
+    print(f"{'route':45} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>9} {'q/req':>7} {'errors':>6}")
+    for item in selected:
+        result = run_scenario(app, item, ctx, args.clients, args.requests)
+        results[item.name] = result
+        print(f"{item.name:45} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+              f"{result['throughput_rps']:>9.1f} {result['queries_per_request']:>7.2f} {result['errors']:>6}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'dataset': {'events': args.events, 'participants': args.participants, 'database': database_url.split(':', 1)[0]},
+                'clients': args.clients,
+                'routes': results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f'\n기준선을 저장했습니다: {args.baseline}')
+
+    if args.compare:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['routes']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f'\n성능 저하: {", ".join(regressions)}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
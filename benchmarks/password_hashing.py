@@ -0,0 +1,78 @@
+# 로그인 비밀번호 검증 처리량 벤치마크
+# 요청 스레드에서 바로 해시를 검증하는 경우(inline)와 HashingPool 워커 수를 늘려가는 경우의
+# 초당 검증 수를 비교하고, 대기열이 가득 찼을 때 거절(503)된 요청 수도 함께 보여준다.
+#
+#   python benchmarks/password_hashing.py --clients 64 --logins 400
+#   python benchmarks/password_hashing.py --workers 1 2 4 8 --queue 16
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from services.password_hashing import DEFAULT_METHOD, HashingBusy, HashingPool, _verify
+
+PASSWORD = 'bench1234'
+
+
+def run(verify, clients, logins):
+    results = {'ok': 0, 'busy': 0}
+    lock = threading.Lock()
+    remaining = iter(range(logins))
+    start = threading.Barrier(clients + 1)
+
+    def client():
+        start.wait()
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            try:
+                verify()
+                key = 'ok'
+            except HashingBusy:
+                key = 'busy'
+            with lock:
+                results[key] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - began
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description='로그인 비밀번호 검증 처리량 벤치마크')
+    parser.add_argument('--clients', type=int, default=32, help='동시에 로그인하는 요청 스레드 수')
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, max(cores // 2, 1), cores}))
+    parser.add_argument('--queue', type=int, default=None, help='대기열 한도 (기본값: 워커 수 x 4)')
+    parser.add_argument('--method', default=DEFAULT_METHOD)
+    args = parser.parse_args()
+
+    stored = generate_password_hash(PASSWORD, method=args.method)
+    print(f'cores={cores} clients={args.clients} logins={args.logins} method={args.method}')
+    print(f"{'mode':>12} {'logins/s':>10} {'ok':>6} {'503':>6} {'elapsed':>9}")
+
+    results, elapsed = run(lambda: check_password_hash(stored, PASSWORD), args.clients, args.logins)
+    print(f"{'inline':>12} {results['ok'] / elapsed:>10.1f} {results['ok']:>6} {results['busy']:>6} {elapsed:>8.2f}s")
+
+    for workers in args.workers:
+        pool = HashingPool(workers=workers, queue_limit=args.queue)
+        pool.run(_verify, stored, PASSWORD)  # 워커 프로세스를 미리 띄운다
+        results, elapsed = run(lambda: pool.run(_verify, stored, PASSWORD), args.clients, args.logins)
+        pool.shutdown()
+        print(f"{f'pool x{workers}':>12} {results['ok'] / elapsed:>10.1f} {results['ok']:>6} {results['busy']:>6} {elapsed:>8.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# 앱 시작 시간 측정
+# 새 파이썬 프로세스에서 `import app` + create_app()에 걸리는 시간을 여러 번 재고, 중앙값이
+# 예산(--budget-ms)을 넘거나 시작 중에 DB 연결을 시도하면 종료 코드 1로 끝난다.
+# tests/test_startup.py가 같은 측정으로 pytest에서 예산을 확인한다.
+# 접속할 수 없는 DB 주소를 넘겨서, 시작 과정이 DB 없이도 끝나는지 함께 확인한다.
+#
+#   python benchmarks/startup_time.py --budget-ms 800 --runs 7
+#   python benchmarks/startup_time.py --importtime     # 모듈별 import 시간 상위 항목 출력
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 존재하지 않는 디렉터리의 SQLite 파일: 연결을 열려고 하면 바로 실패한다
+UNREACHABLE_DATABASE_URL = 'sqlite:////nonexistent-school-event-hub/startup.db'
+
+PROBE = '''
+import time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app({'SQLALCHEMY_DATABASE_URI': %r, 'WARMUP': False})
+created = time.perf_counter()
+print(f'{(imported - started) * 1000:.3f} {(created - imported) * 1000:.3f}')
+''' % UNREACHABLE_DATABASE_URL
+
+
+def measure_once(importtime=False):
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', PROBE]
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    import_ms, create_ms = (float(value) for value in result.stdout.split())
+    return import_ms, create_ms, result.stderr
+
+
+def _top_imports(stderr, limit=15):
+    # -X importtime 출력: "import time: self [us] | cumulative | imported package"
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace('import time:', '|', 1).split('|')]
+        rows.append((int(cumulative_us), int(self_us), name))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='앱 시작 시간 측정')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=1000.0, help='import + create_app 중앙값 상한')
+    parser.add_argument('--importtime', action='store_true')
+    args = parser.parse_args()
+
+    try:
+        samples = [measure_once() for _ in range(args.runs)]
+    except RuntimeError as e:
+        # 연결할 수 없는 DB 주소로도 앱 생성이 실패했다면 시작 중에 DB를 사용한 것이다
+        print(f'FAIL: startup raised without a reachable database\n{e}')
+        sys.exit(1)
+
+    import_ms = statistics.median(sample[0] for sample in samples)
+    create_ms = statistics.median(sample[1] for sample in samples)
+    total_ms = import_ms + create_ms
+    print(f'runs          : {args.runs}')
+    print(f'import app    : {import_ms:.1f} ms (median)')
+    print(f'create_app()  : {create_ms:.1f} ms (median)')
+    print(f'total         : {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)')
+
+    if args.importtime:
+        print('\ncumulative(us)  self(us)  module')
+        for cumulative_us, self_us, name in _top_imports(measure_once(importtime=True)[2]):
+            print(f'{cumulative_us:>14}  {self_us:>8}  {name}')
+
+    if total_ms > args.budget_ms:
+        print('FAIL: startup over budget')
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
@@ -23,6 +23,20 @@ CREATE TABLE `event` (
     location_id INT,
     description TEXT,
     user_id INT NOT NULL,
+    participant_count INT NOT NULL DEFAULT 0,
+    attended_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_count INT NOT NULL DEFAULT 0,
+    rating_1_count INT NOT NULL DEFAULT 0,
+    rating_2_count INT NOT NULL DEFAULT 0,
+    rating_3_count INT NOT NULL DEFAULT 0,
+    rating_4_count INT NOT NULL DEFAULT 0,
+    rating_5_count INT NOT NULL DEFAULT 0,
+    capacity INT NULL,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    version INT NOT NULL DEFAULT 0,
+    roster_version INT NOT NULL DEFAULT 0,
+    deleted BOOLEAN NOT NULL DEFAULT FALSE,  -- 백그라운드 삭제 대기 (목록/상세에서 숨김)
     CONSTRAINT fk_event_location FOREIGN KEY (location_id) REFERENCES `location`(id) ON DELETE SET NULL,
     CONSTRAINT fk_event_user FOREIGN KEY (user_id) REFERENCES `user`(id) ON DELETE CASCADE,
     CONSTRAINT check_title_not_empty CHECK (title <> '')
@@ -34,9 +48,10 @@ CREATE TABLE `participant` (
     contact VARCHAR(15) NOT NULL,
     student_id VARCHAR(15) NOT NULL,
     event_id INT NOT NULL,
-    user_id INT NOT NULL,
+    user_id INT NULL,  -- 명렬표로 일괄 등록한 참가자는 NULL
     attendance BOOLEAN DEFAULT TRUE,
-    uuid VARCHAR(36) NOT NULL UNIQUE,
+    uuid BINARY(16) NOT NULL UNIQUE,  -- UUID_TO_BIN(UUID())
+    waitlisted BOOLEAN NOT NULL DEFAULT FALSE,
     CONSTRAINT fk_participant_event FOREIGN KEY (event_id) REFERENCES `event`(id) ON DELETE CASCADE,
     CONSTRAINT fk_participant_user FOREIGN KEY (user_id) REFERENCES `user`(id) ON DELETE CASCADE,
     CONSTRAINT unique_event_contact UNIQUE (event_id, contact),
@@ -53,15 +68,27 @@ CREATE TABLE `feedback` (
     CONSTRAINT check_rating_range CHECK (rating >= 1 AND rating <= 5)
 );
 
+-- 날짜별 행사 수 (달력 격자용)
+CREATE TABLE `event_day` (
+    day DATE PRIMARY KEY,
+    event_count INT NOT NULL DEFAULT 0
+);
+
 -- 인덱스 생성
 CREATE INDEX idx_user_email ON `user` (email);
+CREATE INDEX idx_user_role ON `user` (role, id);
 
 CREATE INDEX idx_event_title ON `event` (title);
 CREATE INDEX idx_event_date ON `event` (date);
 CREATE INDEX idx_event_user_id ON `event` (user_id);
+CREATE INDEX idx_event_user_date ON `event` (user_id, date, id);
+CREATE INDEX idx_event_date_location ON `event` (date, location_id, deleted, id);
+CREATE INDEX idx_event_updated_at ON `event` (updated_at);
+CREATE INDEX idx_event_date_popularity ON `event` (date, participant_count, deleted, id);
 
 CREATE INDEX idx_participant_event_id ON `participant` (event_id);
 CREATE INDEX idx_participant_user_id ON `participant` (user_id);
+CREATE INDEX idx_participant_waitlist ON `participant` (event_id, waitlisted, id);
 
 CREATE INDEX idx_feedback_event_id ON `feedback` (event_id);
 
@@ -94,11 +121,12 @@ BEGIN
 END $$
 
 -- 이벤트 업데이트 시 과거 날짜 방지
+-- 날짜를 바꿀 때만 검사한다 (지난 행사의 카운터 갱신 UPDATE는 통과해야 한다)
 CREATE TRIGGER trg_prevent_past_event_date_update
 BEFORE UPDATE ON `event`
 FOR EACH ROW
 BEGIN
-    IF NEW.date < CURRENT_DATE() THEN
+    IF NEW.date <> OLD.date AND NEW.date < CURRENT_DATE() THEN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = '이벤트 날짜는 과거일 수 없습니다.';
     END IF;
 END $$
@@ -162,7 +190,7 @@ SELECT
     p.name AS participant_name,
     p.contact AS participant_contact,
     p.attendance,
-    p.uuid,
+    BIN_TO_UUID(p.uuid) AS uuid,
     e.id AS event_id,
     e.title AS event_title,
     e.date AS event_date,
@@ -172,7 +200,7 @@ FROM
     `participant` p
 JOIN
     `event` e ON p.event_id = e.id
-JOIN
+LEFT JOIN
     `user` u ON p.user_id = u.id;
 
 -- 이벤트 참석률 뷰
@@ -188,8 +216,8 @@ JOIN
 GROUP BY
     e.id;
 
--- 이벤트 제목과 설명에 대한 전체 텍스트 검색 인덱스 생성
-ALTER TABLE `event` ADD FULLTEXT INDEX idx_event_full_text_search (title, description);
+-- 이벤트 제목과 설명에 대한 전체 텍스트 검색 인덱스 생성 (한국어 검색을 위해 ngram 파서 사용)
+ALTER TABLE `event` ADD FULLTEXT INDEX idx_event_full_text_search (title, description) WITH PARSER ngram;
 
 -- 참가자의 이름과 연락처에 대한 인덱스 생성
 CREATE INDEX idx_participant_name_contact ON `participant` (name, contact);
@@ -217,14 +245,30 @@ INSERT INTO `event` (title, date, location_id, description, user_id) VALUES
 
 -- 수정된 participant 데이터 삽입
 INSERT INTO `participant` (name, contact, student_id, event_id, user_id, attendance, uuid) VALUES
-('김철민', '01012345678', '2018123456', 1, 2, TRUE, UUID()),
-('이수진', '01087654321', '2019123456', 1, 2, FALSE, UUID()),
-('박영수', '01011112222', '2017123456', 2, 3, TRUE, UUID()),
-('최은희', '01033334444', '2020123456', 3, 2, TRUE, UUID());
+('김철민', '01012345678', '2018123456', 1, 2, TRUE, UUID_TO_BIN(UUID())),
+('이수진', '01087654321', '2019123456', 1, 2, FALSE, UUID_TO_BIN(UUID())),
+('박영수', '01011112222', '2017123456', 2, 3, TRUE, UUID_TO_BIN(UUID())),
+('최은희', '01033334444', '2020123456', 3, 2, TRUE, UUID_TO_BIN(UUID()));
 
 SELECT * FROM `event`;
 
 INSERT INTO `feedback` (event_id, feedback_text, rating) VALUES
 (1, '매우 유익한 시간이었습니다.', 5),
 (2, '좋은 네트워킹 기회였습니다.', 4),
-(3, 'AI에 대해 많이 배웠습니다.', 5);
\ No newline at end of file
+(3, 'AI에 대해 많이 배웠습니다.', 5);
+
+-- 더미 데이터 기준으로 비정규화 카운터 채우기
+UPDATE `event` e SET
+    participant_count = (SELECT COUNT(*) FROM `participant` p WHERE p.event_id = e.id AND p.waitlisted = FALSE),
+    attended_count = (SELECT COUNT(*) FROM `participant` p WHERE p.event_id = e.id AND p.attendance = TRUE AND p.waitlisted = FALSE),
+    rating_sum = (SELECT IFNULL(SUM(f.rating), 0) FROM `feedback` f WHERE f.event_id = e.id),
+    rating_count = (SELECT COUNT(*) FROM `feedback` f WHERE f.event_id = e.id),
+    rating_1_count = (SELECT COUNT(*) FROM `feedback` f WHERE f.event_id = e.id AND f.rating = 1),
+    rating_2_count = (SELECT COUNT(*) FROM `feedback` f WHERE f.event_id = e.id AND f.rating = 2),
+    rating_3_count = (SELECT COUNT(*) FROM `feedback` f WHERE f.event_id = e.id AND f.rating = 3),
+    rating_4_count = (SELECT COUNT(*) FROM `feedback` f WHERE f.event_id = e.id AND f.rating = 4),
+    rating_5_count = (SELECT COUNT(*) FROM `feedback` f WHERE f.event_id = e.id AND f.rating = 5);
+
+-- 달력 날짜별 행사 수 채우기
+INSERT INTO `event_day` (day, event_count)
+SELECT date, COUNT(*) FROM `event` GROUP BY date;
\ No newline at end of file
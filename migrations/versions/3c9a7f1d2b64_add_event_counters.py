@@ -0,0 +1,41 @@
+"""Add denormalized participant/attendance/rating counters to Event
+
+Revision ID: 3c9a7f1d2b64
+Revises: 986b8088eb9e
+Create Date: 2026-10-18 10:12:41.530218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a7f1d2b64'
+down_revision = '986b8088eb9e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('participant_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('attended_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+
+    # 기존 데이터로 카운터 채우기 (대용량이면 이후 `flask repair-counters`로 나눠서 재계산 가능)
+    op.execute("""
+    UPDATE event SET
+        participant_count = (SELECT COUNT(*) FROM participant WHERE participant.event_id = event.id),
+        attended_count = (SELECT COUNT(*) FROM participant WHERE participant.event_id = event.id AND participant.attendance),
+        rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM feedback WHERE feedback.event_id = event.id),
+        rating_count = (SELECT COUNT(*) FROM feedback WHERE feedback.event_id = event.id)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
+        batch_op.drop_column('attended_count')
+        batch_op.drop_column('participant_count')
@@ -0,0 +1,26 @@
+"""Index event.updated_at for search index sync
+
+Revision ID: a3d9e2b7c615
+Revises: f1c7a9d4b286
+Create Date: 2026-10-18 22:51:19.640283
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d9e2b7c615'
+down_revision = 'f1c7a9d4b286'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.create_index('idx_event_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_index('idx_event_updated_at')
@@ -0,0 +1,34 @@
+"""Add event capacity and participant waitlist
+
+Revision ID: a41e6c0b7d93
+Revises: 3c9a7f1d2b64
+Create Date: 2026-10-18 11:03:27.861540
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41e6c0b7d93'
+down_revision = '3c9a7f1d2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('capacity', sa.Integer(), nullable=True))
+
+    with op.batch_alter_table('participant', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('waitlisted', sa.Boolean(), server_default=sa.false(), nullable=False))
+        batch_op.create_index('idx_participant_waitlist', ['event_id', 'waitlisted', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('participant', schema=None) as batch_op:
+        batch_op.drop_index('idx_participant_waitlist')
+        batch_op.drop_column('waitlisted')
+
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_column('capacity')
@@ -0,0 +1,26 @@
+"""Add event.updated_at for template fragment cache versions
+
+Revision ID: a8c3e5f1d476
+Revises: f4b6d2a7c913
+Create Date: 2026-10-18 19:05:12.408331
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c3e5f1d476'
+down_revision = 'f4b6d2a7c913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,43 @@
+"""Only reject past event dates on UPDATE when the date itself changes
+
+Revision ID: b5d8f2c4e619
+Revises: a8c3e5f1d476
+Create Date: 2026-10-18 20:12:37.551904
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d8f2c4e619'
+down_revision = 'a8c3e5f1d476'
+branch_labels = None
+depends_on = None
+
+TRIGGER = """
+CREATE TRIGGER trg_prevent_past_event_date_update
+BEFORE UPDATE ON `event`
+FOR EACH ROW
+BEGIN
+    IF {condition} THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = '이벤트 날짜는 과거일 수 없습니다.';
+    END IF;
+END
+"""
+
+
+def _replace_trigger(condition):
+    # 트리거는 eventmanagement.sql로 만든 MySQL DB에만 있다
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.execute('DROP TRIGGER IF EXISTS trg_prevent_past_event_date_update')
+    op.execute(TRIGGER.format(condition=condition))
+
+
+def upgrade():
+    # 지난 행사의 카운터 UPDATE(참가/출석/피드백)가 막히지 않도록 날짜가 바뀔 때만 검사
+    _replace_trigger('NEW.date <> OLD.date AND NEW.date < CURRENT_DATE()')
+
+
+def downgrade():
+    _replace_trigger('NEW.date < CURRENT_DATE()')
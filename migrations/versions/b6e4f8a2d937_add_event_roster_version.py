@@ -0,0 +1,26 @@
+"""Add event.roster_version bumped only when seated participants change
+
+Revision ID: b6e4f8a2d937
+Revises: a3d9e2b7c615
+Create Date: 2026-10-18 23:32:46.105388
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e4f8a2d937'
+down_revision = 'a3d9e2b7c615'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('roster_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_column('roster_version')
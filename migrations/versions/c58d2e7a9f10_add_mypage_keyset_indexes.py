@@ -0,0 +1,32 @@
+"""Add keyset indexes for mypage sections
+
+Revision ID: c58d2e7a9f10
+Revises: a41e6c0b7d93
+Create Date: 2026-10-18 14:22:05.318427
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c58d2e7a9f10'
+down_revision = 'a41e6c0b7d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.create_index('idx_event_user_date', ['user_id', 'date', 'id'], unique=False)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_index('idx_user_role', ['role', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index('idx_user_role')
+
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_index('idx_event_user_date')
@@ -0,0 +1,26 @@
+"""Add event.version row counter for cross-worker ETags
+
+Revision ID: c7e1a4b9d352
+Revises: b5d8f2c4e619
+Create Date: 2026-10-18 20:41:09.173620
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e1a4b9d352'
+down_revision = 'b5d8f2c4e619'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_column('version')
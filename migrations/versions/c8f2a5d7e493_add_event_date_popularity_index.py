@@ -0,0 +1,26 @@
+"""Index event date and participant count for popular event lookups
+
+Revision ID: c8f2a5d7e493
+Revises: b6e4f8a2d937
+Create Date: 2026-10-18 23:58:07.318642
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8f2a5d7e493'
+down_revision = 'b6e4f8a2d937'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.create_index('idx_event_date_popularity', ['date', 'participant_count', 'deleted', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_index('idx_event_date_popularity')
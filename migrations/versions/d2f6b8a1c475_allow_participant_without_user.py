@@ -0,0 +1,27 @@
+"""Allow participant.user_id to be NULL for roster-imported participants
+
+Revision ID: d2f6b8a1c475
+Revises: c7e1a4b9d352
+Create Date: 2026-10-18 21:03:44.602187
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6b8a1c475'
+down_revision = 'c7e1a4b9d352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('participant', schema=None) as batch_op:
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=True)
+
+
+def downgrade():
+    # 계정 없는 참가자가 있으면 되돌릴 수 없다
+    with op.batch_alter_table('participant', schema=None) as batch_op:
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=False)
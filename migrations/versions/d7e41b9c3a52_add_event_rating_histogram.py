@@ -0,0 +1,36 @@
+"""Add per-rating feedback counters to Event
+
+Revision ID: d7e41b9c3a52
+Revises: c58d2e7a9f10
+Create Date: 2026-10-18 16:05:37.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7e41b9c3a52'
+down_revision = 'c58d2e7a9f10'
+branch_labels = None
+depends_on = None
+
+RATINGS = (1, 2, 3, 4, 5)
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        for rating in RATINGS:
+            batch_op.add_column(sa.Column(f'rating_{rating}_count', sa.Integer(), server_default='0', nullable=False))
+
+    # 기존 피드백으로 평점 분포 채우기 (대용량이면 이후 `flask repair-counters`로 나눠서 재계산 가능)
+    op.execute('UPDATE event SET ' + ', '.join(
+        f'rating_{rating}_count = (SELECT COUNT(*) FROM feedback WHERE feedback.event_id = event.id AND feedback.rating = {rating})'
+        for rating in RATINGS
+    ))
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        for rating in reversed(RATINGS):
+            batch_op.drop_column(f'rating_{rating}_count')
@@ -0,0 +1,67 @@
+"""Store participant.uuid as BINARY(16)
+
+Revision ID: e3a9c5f8b217
+Revises: d7e41b9c3a52
+Create Date: 2026-10-18 17:41:12.664089
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a9c5f8b217'
+down_revision = 'd7e41b9c3a52'
+branch_labels = None
+depends_on = None
+
+CHUNK_SIZE = 5000
+
+
+def _convert_rows(convert):
+    # MySQL 외(SQLite 등)는 파이썬에서 id 순으로 나눠 변환
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text('SELECT id, uuid FROM participant WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': CHUNK_SIZE}
+        ).fetchall()
+        if not rows:
+            return
+        bind.execute(
+            sa.text('UPDATE participant SET uuid = :uuid WHERE id = :id'),
+            [{'id': row.id, 'uuid': convert(row.uuid)} for row in rows]
+        )
+        last_id = rows[-1].id
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        # 새 컬럼에 변환해 넣고 바꿔치기 (기존 UNIQUE 인덱스는 컬럼과 함께 삭제된다)
+        op.execute('ALTER TABLE participant ADD COLUMN uuid_bin BINARY(16) NULL')
+        op.execute("UPDATE participant SET uuid_bin = UNHEX(REPLACE(uuid, '-', ''))")
+        op.execute('ALTER TABLE participant DROP COLUMN uuid, '
+                   'CHANGE COLUMN uuid_bin uuid BINARY(16) NOT NULL, ADD UNIQUE KEY uuid (uuid)')
+        return
+
+    _convert_rows(lambda value: uuid.UUID(value).bytes)
+    with op.batch_alter_table('participant', schema=None) as batch_op:
+        batch_op.alter_column('uuid', existing_type=sa.String(length=36), type_=sa.BINARY(length=16), existing_nullable=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute('ALTER TABLE participant ADD COLUMN uuid_text VARCHAR(36) NULL')
+        op.execute('UPDATE participant SET uuid_text = LOWER(CONCAT_WS(\'-\', '
+                   'HEX(SUBSTR(uuid, 1, 4)), HEX(SUBSTR(uuid, 5, 2)), HEX(SUBSTR(uuid, 7, 2)), '
+                   'HEX(SUBSTR(uuid, 9, 2)), HEX(SUBSTR(uuid, 11, 6))))')
+        op.execute('ALTER TABLE participant DROP COLUMN uuid, '
+                   'CHANGE COLUMN uuid_text uuid VARCHAR(36) NOT NULL, ADD UNIQUE KEY uuid (uuid)')
+        return
+
+    _convert_rows(lambda value: str(uuid.UUID(bytes=bytes(value))))
+    with op.batch_alter_table('participant', schema=None) as batch_op:
+        batch_op.alter_column('uuid', existing_type=sa.BINARY(length=16), type_=sa.String(length=36), existing_nullable=False)
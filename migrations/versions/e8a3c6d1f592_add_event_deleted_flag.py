@@ -0,0 +1,31 @@
+"""Add event.deleted flag to hide events awaiting background purge
+
+Revision ID: e8a3c6d1f592
+Revises: d2f6b8a1c475
+Create Date: 2026-10-18 22:14:37.508216
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a3c6d1f592'
+down_revision = 'd2f6b8a1c475'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted', sa.Boolean(), server_default=sa.false(), nullable=False))
+        # 달력 장소 필터가 삭제 대기 행사를 거를 때도 테이블을 읽지 않도록 인덱스에 포함
+        batch_op.drop_index('idx_event_date_location')
+        batch_op.create_index('idx_event_date_location', ['date', 'location_id', 'deleted', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_index('idx_event_date_location')
+        batch_op.create_index('idx_event_date_location', ['date', 'location_id', 'id'], unique=False)
+        batch_op.drop_column('deleted')
@@ -0,0 +1,41 @@
+"""Rebuild the event FULLTEXT index with the ngram parser
+
+Revision ID: f1c7a9d4b286
+Revises: e8a3c6d1f592
+Create Date: 2026-10-18 22:48:05.317942
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c7a9d4b286'
+down_revision = 'e8a3c6d1f592'
+branch_labels = None
+depends_on = None
+
+INDEX = 'idx_event_full_text_search'
+
+
+def _replace_index(parser):
+    # FULLTEXT 인덱스는 eventmanagement.sql로 만든 MySQL DB에만 있다 (다른 DB는 프로세스 내 색인 사용)
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+    exists = bind.execute(sa.text(
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'event' AND index_name = :name"
+    ), {'name': INDEX}).scalar()
+    if exists:
+        op.execute(f'ALTER TABLE `event` DROP INDEX {INDEX}')
+    op.execute(f'ALTER TABLE `event` ADD FULLTEXT INDEX {INDEX} (title, description){parser}')
+
+
+def upgrade():
+    # 기본 파서는 한국어 단어를 나누지 않으므로 ngram 파서로 다시 만든다
+    _replace_index(' WITH PARSER ngram')
+
+
+def downgrade():
+    _replace_index('')
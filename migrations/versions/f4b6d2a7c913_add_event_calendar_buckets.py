@@ -0,0 +1,36 @@
+"""Add event_day calendar buckets and (date, location_id, id) index
+
+Revision ID: f4b6d2a7c913
+Revises: e3a9c5f8b217
+Create Date: 2026-10-18 18:32:50.217604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b6d2a7c913'
+down_revision = 'e3a9c5f8b217'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('event_day',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('event_count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.create_index('idx_event_date_location', ['date', 'location_id', 'id'], unique=False)
+
+    # 기존 행사로 날짜별 행사 수 채우기
+    op.execute('INSERT INTO event_day (day, event_count) SELECT date, COUNT(*) FROM event GROUP BY date')
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_index('idx_event_date_location')
+
+    op.drop_table('event_day')
@@ -1,12 +1,42 @@
 from flask_sqlalchemy import SQLAlchemy
 import re
-from sqlalchemy.sql import func
 
 import enum
-from sqlalchemy import Enum
-from datetime import datetime
+import uuid as uuid_lib
+from sqlalchemy import BINARY, Enum
+from sqlalchemy.types import TypeDecorator
+from datetime import datetime, timedelta
 
-db = SQLAlchemy()
+from services.db_routing import RoutingSession
+
+# GET 요청의 읽기는 replica로 보낸다 (replica가 설정된 경우)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# 연락처 형식 (10-15자리 숫자, 선택적 + 접두사)
+CONTACT_PATTERN = re.compile(r'^\+?\d{10,15}$')
+RATINGS = (5, 4, 3, 2, 1)  # 피드백 평점 (표시 순서)
+
+
+# UUID를 BINARY(16)으로 저장하고 파이썬에서는 문자열('xxxxxxxx-xxxx-...')로 다룬다.
+# 바인딩할 때는 문자열과 uuid.UUID를 모두 받는다
+class BinaryUUID(TypeDecorator):
+    impl = BINARY
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(length=16)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid_lib.UUID):
+            value = uuid_lib.UUID(str(value))
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return str(uuid_lib.UUID(bytes=bytes(value)))
 
 class UserRole(enum.Enum):
     USER = "user"
@@ -21,10 +51,15 @@ class User(db.Model):
     name = db.Column(db.String(50), nullable=False)
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
     password = db.Column(db.String(255), nullable=False)
-    events = db.relationship('Event', backref='user', lazy=True)  # 관계 설정
-    participants = db.relationship('Participant', foreign_keys='Participant.user_id', lazy=True)
+    # 자식 행은 ON DELETE CASCADE로 DB가 지운다 (passive_deletes: 삭제 전에 자식을 읽지 않음)
+    events = db.relationship('Event', backref='user', lazy=True, cascade="all, delete-orphan", passive_deletes=True)  # 관계 설정
+    participants = db.relationship('Participant', foreign_keys='Participant.user_id', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
     role = db.Column(Enum(UserRole), default=UserRole.USER, nullable=False)  # Enum 필드
 
+    __table_args__ = (
+        db.Index('idx_user_role', 'role', 'id'),  # 관리자 권한 요청 목록 키셋 페이지
+    )
+
     def is_admin(self):
         return self.role in [UserRole.ADMIN, UserRole.SUPERADMIN]
 
@@ -36,7 +71,7 @@ class Location(db.Model):
     __tablename__ = 'location'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False, unique=True)
-    events = db.relationship('Event', backref='location', lazy=True)
+    events = db.relationship('Event', backref='location', lazy=True, passive_deletes=True)  # ON DELETE SET NULL
 
 # Event 테이블
 class Event(db.Model):
@@ -47,33 +82,89 @@ class Event(db.Model):
     location_id = db.Column(db.Integer, db.ForeignKey('location.id', ondelete='SET NULL'))
     description = db.Column(db.Text)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True)  # 외래키 인덱스 추가
-    participants = db.relationship('Participant', backref='event', lazy=True, cascade="all, delete-orphan")
-    feedbacks = db.relationship('Feedback', backref='event', lazy=True, cascade="all, delete-orphan")
+    # 비정규화 카운터 (services/counters.py에서 참가/출석/피드백 변경 시 같은 트랜잭션으로 갱신)
+    participant_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    attended_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # 평점별 피드백 수 (평점 분포를 피드백을 읽지 않고 보여준다)
+    rating_1_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_2_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_3_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_4_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_5_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    capacity = db.Column(db.Integer, nullable=True)  # 정원 (None이면 제한 없음)
+    # 행사 내용(제목/날짜/설명/장소/정원)을 고치거나 삭제 대기로 숨긴 시각 (카운터 변경에는 바뀌지 않음).
+    # 템플릿 조각 캐시 키와, 워커마다 있는 검색 색인이 다른 워커의 변경을 찾는 데 쓴다 (services/search.py)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=db.func.now())
+    # 행 버전. 행사나 참가자/피드백이 바뀔 때마다 같은 트랜잭션에서 1씩 올린다 (services/counters.py).
+    # 워커 메모리의 캐시 버전과 달리 모든 워커/프로세스가 같은 값을 보므로 API ETag 등에 쓴다
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # 좌석이 배정된 참가자 명단 버전. 신청/취소/승격/일괄 등록으로 participant_count가 바뀔 때만 올린다
+    # (체크인/피드백에는 바뀌지 않으므로 체크인 명단 색인을 계속 쓸 수 있다, services/checkin.py)
+    roster_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # 백그라운드 삭제(services/deletion.py)를 기다리는 행사. 삭제 요청과 같은 트랜잭션에서 켜고
+    # 목록/상세/검색/달력/순위표는 이 행사를 없는 것으로 본다
+    deleted = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    participants = db.relationship('Participant', backref='event', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
+    feedbacks = db.relationship('Feedback', backref='event', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
 
     __table_args__ = (
         db.CheckConstraint("title <> ''", name="check_title_not_empty"),
+        db.Index('idx_event_user_date', 'user_id', 'date', 'id'),  # 마이페이지 '내가 생성한 행사' 키셋 페이지
+        db.Index('idx_event_date_location', 'date', 'location_id', 'deleted', 'id'),  # 달력 기간/장소 조회 (커버링)
+        db.Index('idx_event_updated_at', 'updated_at'),  # 검색 색인 동기화
+        db.Index('idx_event_date_popularity', 'date', 'participant_count', 'deleted', 'id'),  # 기간별 인기 행사 (순위표 보충 조회)
     )
 
     def __init__(self, **kwargs):
-        date = kwargs.get('date')
-        if isinstance(date, str):  # 날짜가 문자열로 들어왔을 경우
-            date = datetime.strptime(date, '%Y-%m-%d')
-        if date and date < datetime.utcnow():  # 날짜가 과거인지 확인
-            raise ValueError("이벤트 날짜는 과거일 수 없습니다.")
+        if kwargs.get('date'):
+            kwargs['date'] = self.parse_date(kwargs['date'])
         super().__init__(**kwargs)
 
     @staticmethod
-    def get_most_popular_event():
-        result = db.session.query(
-            Event.title,
-            func.count(Participant.id).label("participant_count")
-        ).join(Participant, Event.id == Participant.event_id)\
-         .group_by(Event.id)\
-         .order_by(func.count(Participant.id).desc())\
-         .limit(1)\
-         .first()
-        
-        return result
+    def parse_date(value):
+        # 폼 문자열/datetime을 date로 바꾼다 (SQLite Date 타입은 date 객체만 받는다)
+        if isinstance(value, str):  # 날짜가 문자열로 들어왔을 경우
+            value = datetime.strptime(value, '%Y-%m-%d')
+        if isinstance(value, datetime):
+            value = value.date()
+        if value < datetime.utcnow().date():  # 날짜가 과거인지 확인 (DB 트리거와 같이 오늘까지 허용)
+            raise ValueError("이벤트 날짜는 과거일 수 없습니다.")
+        return value
+
+    def mark_updated(self):
+        # 내용 수정 시각을 남긴다. MySQL DATETIME은 초 단위이므로 같은 초에 다시 고쳐도
+        # 조각 캐시 키가 바뀌도록 이전 값보다 최소 1초 뒤로 잡는다
+        now = datetime.utcnow().replace(microsecond=0)
+        self.updated_at = max(now, self.updated_at + timedelta(seconds=1)) if self.updated_at else now
+
+    @property
+    def is_full(self):
+        return self.capacity is not None and self.participant_count >= self.capacity
+
+    @property
+    def attendance_rate(self):
+        return (self.attended_count / self.participant_count * 100) if self.participant_count else 0
+
+    @property
+    def average_rating(self):
+        return (self.rating_sum / self.rating_count) if self.rating_count else 0
+
+    @property
+    def rating_histogram(self):
+        # [(평점, 개수, 비율%)] 5점부터
+        histogram = []
+        for rating in RATINGS:
+            count = getattr(self, f'rating_{rating}_count')
+            histogram.append((rating, count, (count / self.rating_count * 100) if self.rating_count else 0))
+        return histogram
+
+# 날짜별 행사 수 (달력 격자용, services/event_calendar.py에서 행사 생성/수정/삭제와 함께 갱신)
+class EventDay(db.Model):
+    __tablename__ = 'event_day'
+    day = db.Column(db.Date, primary_key=True)
+    event_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
 # Participant 테이블
 class Participant(db.Model):
@@ -83,20 +174,22 @@ class Participant(db.Model):
     contact = db.Column(db.String(15), nullable=False)
     student_id = db.Column(db.String(15), nullable=False)
     event_id = db.Column(db.Integer, db.ForeignKey('event.id', ondelete='CASCADE'), nullable=False, index=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True)  # 외래 키 추가
+    # 신청한 사용자. 명렬표로 일괄 등록한 참가자는 계정과 연결하지 않으므로 NULL
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=True, index=True)  # 외래 키 추가
     attendance = db.Column(db.Boolean, default=True)
-    uuid = db.Column(db.String(36), unique=True, nullable=False)
+    uuid = db.Column(BinaryUUID(), unique=True, nullable=False)  # 체크인 QR 코드에 들어가는 값
+    waitlisted = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())  # 정원 초과 대기자
 
     __table_args__ = (
         db.UniqueConstraint('event_id', 'contact', name='unique_event_contact'),
         db.UniqueConstraint('event_id', 'student_id', name='unique_event_student_id'),  # 학번 중복 방지
+        db.Index('idx_participant_waitlist', 'event_id', 'waitlisted', 'id'),  # 대기자 승격 순서 조회
     )
 
     # contact 유효성 검사
     @staticmethod
     def validate_contact(contact):
-        pattern = r'^\+?\d{10,15}$'
-        if not re.match(pattern, contact):
+        if not CONTACT_PATTERN.match(contact):
             raise ValueError("Invalid contact format. It must be a phone number with 10-15 digits.")
 
     def __init__(self, **kwargs):
@@ -0,0 +1,70 @@
+from flask import Blueprint, current_app, jsonify, session
+from models import db
+from services.sql_profiler import get_store
+from services.db_routing import pool_report
+from services import jobs, principal
+
+# 관리자 전용 운영 정보 블루프린트
+admin_bp = Blueprint('admin_bp', __name__, url_prefix='/admin')
+
+
+def _current_admin():
+    user = principal.current_principal()
+    if user is None or not user.is_admin():
+        return None
+    return user
+
+
+# 엔드포인트별 SQL 쿼리 수 / DB 시간 / N+1 의심 쿼리 리포트
+@admin_bp.route('/sql_report', methods=['GET'])
+def sql_report():
+    if _current_admin() is None:
+        return jsonify({"message": "Forbidden"}), 403
+
+    return jsonify({
+        "enabled": bool(current_app.config.get('SQL_PROFILING')),
+        "endpoints": get_store(current_app).report()
+    })
+
+
+@admin_bp.route('/sql_report/reset', methods=['POST'])
+def reset_sql_report():
+    if _current_admin() is None:
+        return jsonify({"message": "Forbidden"}), 403
+
+    get_store(current_app).reset()
+    return jsonify({"message": "SQL report reset"})
+
+
+# bind(primary/replica)별 연결 풀 상태와 연결 대기 시간
+@admin_bp.route('/db_pool', methods=['GET'])
+def db_pool():
+    if _current_admin() is None:
+        return jsonify({"message": "Forbidden"}), 403
+
+    return jsonify({
+        "replicas": current_app.extensions.get('db_replicas', []),
+        "pools": pool_report(db)
+    })
+
+
+# 작업 종류별 대기열 깊이/대기 시간/최근 실패
+@admin_bp.route('/jobs', methods=['GET'])
+def job_queue():
+    if _current_admin() is None:
+        return jsonify({"message": "Forbidden"}), 403
+
+    report = jobs.get_queue().stats()
+    runner = current_app.extensions.get('job_runner')
+    report['running'] = runner.running() if runner else {}
+    return jsonify(report)
+
+
+@admin_bp.route('/jobs/<int:job_id>/retry', methods=['POST'])
+def retry_job(job_id):
+    if _current_admin() is None:
+        return jsonify({"message": "Forbidden"}), 403
+
+    if not jobs.get_queue().retry(job_id):
+        return jsonify({"message": "Failed job not found"}), 404
+    return jsonify({"message": "Job requeued"})
@@ -0,0 +1,243 @@
+import hashlib
+import json
+from datetime import date
+
+from flask import Blueprint, Response, jsonify, request
+
+from models import db, Event, Location, Participant, RATINGS
+from services import checkin, principal
+from services.pagination import EventPage, clamp_per_page, decode_cursor, encode_cursor
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 사용
+    orjson = None
+
+# 모바일 앱/사이니지용 JSON API
+api_bp = Blueprint('api_bp', __name__, url_prefix='/api/v2')
+
+# ?fields= 로 고를 수 있는 필드 -> 컬럼
+EVENT_FIELDS = {
+    'id': Event.id,
+    'title': Event.title,
+    'date': Event.date,
+    'description': Event.description,
+    'location': Location.name,
+    'capacity': Event.capacity,
+}
+# 참가 신청마다 바뀌는 카운터는 상세에서만 제공
+EVENT_DETAIL_FIELDS = dict(EVENT_FIELDS, **{
+    'participant_count': Event.participant_count,
+    'attended_count': Event.attended_count,
+    'rating_count': Event.rating_count,
+})
+PARTICIPANT_FIELDS = {
+    'id': Participant.id,
+    'name': Participant.name,
+    'attendance': Participant.attendance,
+    'waitlisted': Participant.waitlisted,
+}
+# 연락처/학번은 관리자에게만
+PARTICIPANT_ADMIN_FIELDS = dict(PARTICIPANT_FIELDS, **{
+    'contact': Participant.contact,
+    'student_id': Participant.student_id,
+    'uuid': Participant.uuid,
+})
+DEFAULT_EVENT_FIELDS = ['id', 'title', 'date', 'location']
+DEFAULT_PARTICIPANT_FIELDS = ['id', 'name', 'attendance', 'waitlisted']
+
+
+class InvalidFields(Exception):
+    pass
+
+
+def _parse_fields(allowed, default):
+    value = request.args.get('fields')
+    if not value:
+        return default
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in allowed]
+    if unknown or not fields:
+        raise InvalidFields(unknown)
+    return list(dict.fromkeys(fields))
+
+
+def _invalid_fields(error, allowed):
+    return jsonify({
+        "message": f"Unknown fields: {', '.join(error.args[0])}",
+        "allowed": sorted(allowed)
+    }), 400
+
+
+def _default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def _etag(*parts):
+    # 요청 URL + 행 버전(Event.version)(+ 권한)으로 강한 ETag를 만든다.
+    # 행 버전은 DB 값이므로 어느 워커가 응답해도, 다른 워커/작업 프로세스가 고친 뒤에도 맞다
+    raw = '|'.join([request.full_path, *map(str, parts)])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _not_modified(etag):
+    # If-None-Match가 맞으면 본문을 만들지 않고 304
+    if etag not in request.if_none_match:
+        return None
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _json(payload, etag):
+    response = Response(_dumps(payload), mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # 매번 재검증
+    return response
+
+
+def _project(row, fields):
+    return {name: getattr(row, name) for name in fields}
+
+
+def _event_query(fields, columns):
+    # 요청한 필드의 컬럼만 SELECT (location은 요청했을 때만 조인).
+    # 조인 전에 기준 테이블을 정해 둔다 (조인 뒤에는 select_from을 부를 수 없다)
+    selected = [columns[name].label(name) for name in fields]
+    query = db.session.query(*selected).select_from(Event)
+    if 'location' in fields:
+        query = query.outerjoin(Location, Location.id == Event.location_id)
+    return query
+
+
+@api_bp.route('/events', methods=['GET'])
+def list_events():
+    try:
+        fields = _parse_fields(EVENT_FIELDS, DEFAULT_EVENT_FIELDS)
+    except InvalidFields as e:
+        return _invalid_fields(e, EVENT_FIELDS)
+
+    # 키셋 커서에 필요한 date/id와 ETag용 행 버전은 응답에 없어도 함께 읽는다
+    selected = list(dict.fromkeys(fields + ['date', 'id']))
+    query = _event_query(selected, EVENT_FIELDS).add_columns(Event.version.label('_version'))
+    page = EventPage(query, request.args.get('cursor'), clamp_per_page(request.args.get('per_page')))
+    rows = list(page)
+
+    etag = _etag(page.next_cursor, *[f'{row.id}:{row._version}' for row in rows])
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+    items = [_project(row, fields) for row in rows]
+    return _json({"events": items, "next_cursor": page.next_cursor}, etag)
+
+
+@api_bp.route('/events/<int:event_id>', methods=['GET'])
+def event_detail(event_id):
+    try:
+        fields = _parse_fields(EVENT_DETAIL_FIELDS, DEFAULT_EVENT_FIELDS)
+    except InvalidFields as e:
+        return _invalid_fields(e, EVENT_DETAIL_FIELDS)
+
+    row = _event_query(fields, EVENT_DETAIL_FIELDS)\
+        .add_columns(Event.version.label('_version'))\
+        .filter(Event.id == event_id, Event.deleted.is_(False)).first()
+    if row is None:
+        return jsonify({"message": "Event not found"}), 404
+
+    etag = _etag(row._version)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+    return _json(_project(row, fields), etag)
+
+
+@api_bp.route('/events/<int:event_id>/participants', methods=['GET'])
+def participant_list(event_id):
+    user = principal.current_principal()
+    is_admin = user is not None and user.is_admin()
+    allowed = PARTICIPANT_ADMIN_FIELDS if is_admin else PARTICIPANT_FIELDS
+    try:
+        fields = _parse_fields(allowed, DEFAULT_PARTICIPANT_FIELDS)
+    except InvalidFields as e:
+        return _invalid_fields(e, allowed)
+
+    # 참가자가 바뀌면 행사 행 버전도 오른다 (PK 조회 한 번으로 304 여부를 정한다)
+    version = db.session.query(Event.version).filter(Event.id == event_id, Event.deleted.is_(False)).scalar()
+    if version is None:
+        return jsonify({"message": "Event not found"}), 404
+    # 관리자와 일반 사용자의 응답이 다르므로 ETag에 포함
+    etag = _etag(version, is_admin)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    # 신청 순서(id) 오름차순 키셋
+    per_page = clamp_per_page(request.args.get('per_page'))
+    query = db.session.query(*[allowed[name].label(name) for name in fields])\
+        .add_columns(Participant.id.label('_id'))\
+        .filter(Participant.event_id == event_id)
+    values = decode_cursor(request.args.get('cursor'))
+    if values and len(values) == 1 and isinstance(values[0], int):
+        query = query.filter(Participant.id > values[0])
+    rows = query.order_by(Participant.id).limit(per_page + 1).all()
+
+    return _json({
+        "event_id": event_id,
+        "participants": [_project(row, fields) for row in rows[:per_page]],
+        "next_cursor": encode_cursor(rows[per_page - 1]._id) if len(rows) > per_page else None
+    }, etag)
+
+
+@api_bp.route('/events/<int:event_id>/stats', methods=['GET'])
+def event_stats(event_id):
+    # 비정규화 카운터만 읽는다
+    event = db.session.query(
+        Event.id, Event.version, Event.capacity, Event.participant_count, Event.attended_count,
+        Event.rating_sum, Event.rating_count,
+        *[getattr(Event, f'rating_{rating}_count') for rating in RATINGS]
+    ).filter(Event.id == event_id, Event.deleted.is_(False)).first()
+    if event is None:
+        return jsonify({"message": "Event not found"}), 404
+
+    etag = _etag(event.version)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    return _json({
+        "event_id": event.id,
+        "capacity": event.capacity,
+        "participant_count": event.participant_count,
+        "attended_count": event.attended_count,
+        "attendance_rate": round(event.attended_count / event.participant_count * 100, 2) if event.participant_count else 0,
+        "rating_count": event.rating_count,
+        "average_rating": round(event.rating_sum / event.rating_count, 2) if event.rating_count else 0,
+        "rating_histogram": {str(rating): getattr(event, f'rating_{rating}_count') for rating in RATINGS},
+    }, etag)
+
+
+# QR 일괄 체크인: {"uuids": [...]} (관리자 전용)
+@api_bp.route('/events/<int:event_id>/checkin', methods=['POST'])
+def bulk_checkin(event_id):
+    user = principal.current_principal()
+    if user is None or not user.is_admin():
+        return jsonify({"message": "Forbidden"}), 403
+
+    payload = request.get_json(silent=True) or {}
+    scans = payload.get('uuids')
+    if not isinstance(scans, list):
+        return jsonify({"message": "uuids must be a list"}), 400
+    try:
+        result = checkin.check_in(event_id, scans)
+    except checkin.CheckinError as e:
+        return jsonify({"message": str(e)}), 400
+    return jsonify(result.to_dict())
@@ -1,6 +1,12 @@
 from flask import Blueprint, render_template, request, redirect, url_for, session, flash
-from werkzeug.security import generate_password_hash, check_password_hash
 from models import db, User, Event, UserRole, Participant
+from services.password_hashing import HashingBusy, hash_password, verify_password, upgrade_hash
+from services import deletion, principal
+from services.mypage import CURSOR_PARAMS, load_mypage
+from services.pagination import clamp_per_page
+
+# 해시 작업 대기열이 가득 찼을 때 응답
+BUSY_HEADERS = {'Retry-After': '1'}
 
 auth_bp = Blueprint('auth_bp', __name__, url_prefix='/auth')
 
@@ -17,8 +23,12 @@ def register():
             flash('이미 존재하는 이메일입니다.', 'error')
             return render_template('register.html')
 
-        # 사용자 생성 및 저장
-        hashed_password = generate_password_hash(password)
+        # 사용자 생성 및 저장 (해시는 별도 프로세스에서 계산)
+        try:
+            hashed_password = hash_password(password)
+        except HashingBusy:
+            flash('요청이 많아 잠시 후 다시 시도해주세요.', 'error')
+            return render_template('register.html'), 503, BUSY_HEADERS
         user = User(name=name, email=email, password=hashed_password)
         try:
             db.session.add(user)
@@ -39,7 +49,17 @@ def login():
         password = request.form.get('password')
 
         user = User.query.filter_by(email=email).first()
-        if user and check_password_hash(user.password, password):
+        try:
+            valid = user is not None and verify_password(user.password, password)
+        except HashingBusy:
+            flash('요청이 많아 잠시 후 다시 시도해주세요.', 'error')
+            return render_template('login.html'), 503, BUSY_HEADERS
+
+        if valid:
+            # 예전 파라미터로 저장된 해시는 이번 로그인에서 새로 저장
+            if upgrade_hash(user, password):
+                db.session.commit()
+
             # 세션 초기화
             session.clear()
             session['user_id'] = user.id
@@ -61,7 +81,10 @@ def logout():
 
 @auth_bp.route('/request_admin', methods=['POST'])
 def request_admin():
-    user = User.query.get(session['user_id'])
+    user = principal.current_principal()
+    if user is None:
+        flash('로그인이 필요합니다.', 'error')
+        return redirect(url_for('auth_bp.login'))
     if user.role != UserRole.USER:
         flash('이미 관리자 권한이 있습니다.', 'info')
         return redirect(url_for('auth_bp.mypage'))
@@ -78,35 +101,32 @@ def mypage():
         flash('로그인이 필요합니다.', 'error')
         return redirect(url_for('auth_bp.login'))
 
-    # 현재 로그인한 사용자 정보 가져오기
-    user = User.query.get(session['user_id'])
-
-    # 사용자가 생성한 행사
-    created_events = Event.query.filter_by(user_id=user.id).all()
-
-    # 사용자가 신청한 행사
-    registered_events = db.session.query(
-        Event.id.label('id'),
-        Event.title.label('title'),
-        Event.date.label('date'),
-        Event.description.label('description'),
-        Participant.attendance.label('attendance'),
-        Participant.uuid.label('participant_uuid')
-    ).join(Participant, Event.id == Participant.event_id)\
-     .filter(Participant.user_id == user.id)\
-     .all()
-
-    # 관리자 권한 요청 목록 (superadmin 전용)
-    admin_requests = None
-    if user.is_superadmin():
-        admin_requests = User.query.filter_by(role=UserRole.USER).all()
+    # 현재 로그인한 사용자 정보 (캐시된 id/이름/권한)
+    user = principal.current_principal()
+    if user is None:
+        session.clear()
+        flash('로그인이 필요합니다.', 'error')
+        return redirect(url_for('auth_bp.login'))
+
+    # 섹션(생성한 행사 / 신청한 행사 / 권한 요청)마다 따로 페이지를 넘긴다
+    per_page = clamp_per_page(request.args.get('per_page'))
+    cursors = {name: request.args.get(name) for name in CURSOR_PARAMS}
+    data = load_mypage(user, cursors, per_page)
+
+    def page_url(param, cursor):
+        # 다른 섹션의 현재 위치는 유지하고 해당 섹션만 이동
+        args = {name: value for name, value in cursors.items() if value}
+        args[param] = cursor
+        return url_for('auth_bp.mypage', per_page=per_page, **args)
 
     return render_template(
         'mypage.html',
         user=user,
-        events=created_events,
-        registered_events=registered_events,
-        admin_requests=admin_requests
+        events=data.events,
+        registered_events=data.registered_events,
+        admin_requests=data.admin_requests,
+        cursors=cursors,
+        page_url=page_url
     )
 
 # 관리자 권한 요청 승인
@@ -117,8 +137,8 @@ def approve_admin(user_id):
         return redirect(url_for('auth_bp.login'))
 
     # 현재 로그인한 사용자 확인
-    current_user = User.query.get(session['user_id'])
-    if not current_user.is_superadmin():
+    current_user = principal.current_principal()
+    if current_user is None or not current_user.is_superadmin():
         flash('이 작업을 수행할 권한이 없습니다.', 'error')
         return redirect(url_for('auth_bp.mypage'))
 
@@ -131,6 +151,7 @@ def approve_admin(user_id):
     try:
         user.role = UserRole.ADMIN
         db.session.commit()
+        principal.invalidate(user.id)
         flash(f'{user.name}님의 권한이 관리자(Admin)로 변경되었습니다.', 'success')
     except Exception as e:
         db.session.rollback()
@@ -146,8 +167,8 @@ def delete_admin_request(user_id):
         return redirect(url_for('auth_bp.login'))
 
     # 현재 로그인한 사용자 확인
-    current_user = User.query.get(session['user_id'])
-    if not current_user.is_superadmin():
+    current_user = principal.current_principal()
+    if current_user is None or not current_user.is_superadmin():
         flash('이 작업을 수행할 권한이 없습니다.', 'error')
         return redirect(url_for('auth_bp.mypage'))
 
@@ -158,9 +179,10 @@ def delete_admin_request(user_id):
         return redirect(url_for('auth_bp.mypage'))
 
     try:
-        db.session.delete(user)
-        db.session.commit()
-        flash(f'{user.name}님의 권한 요청이 삭제되었습니다.', 'success')
+        name = user.name
+        deletion.delete_account(user_id)
+        principal.invalidate(user_id)
+        flash(f'{name}님의 권한 요청이 삭제되었습니다.', 'success')
     except Exception as e:
         db.session.rollback()
         flash(f'요청 삭제 중 오류가 발생했습니다: {str(e)}', 'error')
@@ -175,15 +197,10 @@ def delete_account():
 
     try:
         user_id = session['user_id']
-        # 현재 사용자를 가져옵니다.
-        user = User.query.get(user_id)
-
-        # 사용자가 생성한 모든 이벤트 삭제
-        Event.query.filter_by(user_id=user_id).delete()
 
-        # 사용자 삭제
-        db.session.delete(user)
-        db.session.commit()
+        # 사용자와 사용자가 생성한 이벤트 삭제 (자식 행은 DB cascade, 큰 계정은 백그라운드에서 나눠 삭제)
+        deletion.delete_account(user_id)
+        principal.invalidate(user_id)
 
         # 세션 초기화
         session.clear()
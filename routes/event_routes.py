@@ -1,26 +1,75 @@
-from flask import Blueprint, jsonify, render_template, session, request, redirect, url_for, flash
-from models import db, User, Event, Participant, Feedback, Location
+from flask import Blueprint, Response, current_app, jsonify, render_template, stream_template, stream_with_context, session, request, redirect, url_for, flash
+from models import db, User, Event, Participant, Feedback
 import uuid
-from services.event_service import get_most_popular_event
+from datetime import date, timedelta
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from services.pagination import EventPage, clamp_per_page
+from services import cache, checkin, counters, deletion, event_calendar, export, feedback as feedback_service, jobs, leaderboard, locations, notifications, participant_import, principal, registration, search, seating
 
 # 이벤트 블루프린트 정의
 event_bp = Blueprint('event_bp', __name__, url_prefix='/events')
 
+
+def _get_event_or_404(event_id, *options):
+    # 백그라운드 삭제를 기다리는 행사(Event.deleted)는 없는 행사로 본다
+    return Event.query.options(*options).filter(Event.id == event_id, Event.deleted.is_(False)).first_or_404()
+
 # 이벤트 조회
 @event_bp.route('/')
+@cache.cached_page()
 def list_events():
     search_query = request.args.get('search', '')  # 검색어 가져오기 (기본값: 빈 문자열)
-    
+    cursor = request.args.get('cursor')
+    per_page = clamp_per_page(request.args.get('per_page'))
+
     if search_query:
-        # 제목 또는 설명에 검색어가 포함된 이벤트를 필터링 (대소문자 구분 없음)
-        events = Event.query.filter(
-            Event.title.ilike(f"%{search_query}%") | Event.description.ilike(f"%{search_query}%")
-        ).all()
+        # 전문 검색 엔진으로 관련도 순 조회 (MySQL FULLTEXT 또는 프로세스 내 역색인)
+        events = search.search_events(search_query, cursor=cursor, per_page=per_page)
     else:
-        # 검색어가 없으면 모든 이벤트 반환
-        events = Event.query.order_by(Event.date.desc()).all()
-    
-    return render_template('events.html', events=events, search_query=search_query)
+        # 검색어가 없으면 (date, id) 키셋 커서로 최신 날짜 순 조회
+        events = EventPage(Event.query, cursor=cursor, per_page=per_page)
+
+    context = dict(events=events, search_query=search_query, per_page=per_page)
+    if session.get('_flashes'):
+        # 스트리밍 중에 꺼낸 flash는 이미 보낸 세션 쿠키에서 지워지지 않으므로 한 번에 렌더링한다
+        return render_template('events.html', **context)
+    # stream_template은 stream_with_context를 적용해 행을 읽는 대로 응답을 보낸다
+    return Response(stream_template('events.html', **context))
+
+# 달력 (월/주 보기) JSON: ?from=YYYY-MM-DD&to=YYYY-MM-DD&location=장소
+# days는 날짜별 행사 수, events는 (date, id) 순 키셋 페이지. ?include=days 이면 격자용 수만 보낸다
+@event_bp.route('/calendar', methods=['GET'])
+def calendar():
+    today = date.today()
+    try:
+        date_from = date.fromisoformat(request.args['from']) if request.args.get('from') else today.replace(day=1)
+        date_to = date.fromisoformat(request.args['to']) if request.args.get('to') else date_from + timedelta(days=41)
+    except ValueError:
+        return jsonify({"message": "Dates must be YYYY-MM-DD"}), 400
+    if date_from > date_to or (date_to - date_from).days >= event_calendar.MAX_RANGE_DAYS:
+        return jsonify({"message": f"Range must be 1-{event_calendar.MAX_RANGE_DAYS} days"}), 400
+
+    location_name = request.args.get('location')
+    location_id = locations.lookup(location_name) if location_name else None
+    include = set(request.args.get('include', 'days,events').split(','))
+    payload = {"from": date_from.isoformat(), "to": date_to.isoformat(), "location": location_name}
+
+    # 없는 장소로 거르면 빈 결과
+    missing_location = bool(location_name) and location_id is None
+    if 'days' in include:
+        payload["days"] = {} if missing_location else event_calendar.day_counts(date_from, date_to, location_id)
+    if 'events' in include:
+        per_page = max(1, min(request.args.get('per_page', event_calendar.DEFAULT_PER_PAGE, type=int), event_calendar.MAX_PER_PAGE))
+        page = event_calendar.CalendarPage([], None) if missing_location else event_calendar.events_in_range(
+            date_from, date_to, location_id, request.args.get('cursor'), per_page
+        )
+        payload["events"] = [
+            {"id": row.id, "title": row.title, "date": row.date.isoformat(), "location": row.location}
+            for row in page.items
+        ]
+        payload["next_cursor"] = page.next_cursor
+    return jsonify(payload)
 
 # 새로운 이벤트 등록
 @event_bp.route('/create', methods=['GET', 'POST'])
@@ -30,8 +79,8 @@ def create_event():
         return redirect(url_for('auth_bp.login'))
     
     # 권한 확인
-    user = User.query.get(session['user_id'])
-    if not user.is_admin() and not user.is_superadmin():
+    user = principal.current_principal()
+    if user is None or (not user.is_admin() and not user.is_superadmin()):
         flash('이벤트 생성 권한이 없습니다. 관리자 권한을 요청하세요.', 'error')
         return redirect(url_for('event_bp.list_events'))
 
@@ -40,30 +89,36 @@ def create_event():
         date = request.form.get('date')
         location_name = request.form.get('location')
         description = request.form.get('description')
+        capacity = request.form.get('capacity', type=int)  # 비워두면 정원 제한 없음
 
         # 필수 필드 확인
         if not title or not date or not location_name:
             flash('모든 필드를 입력해야 합니다.', 'error')
             return render_template('create_event.html')
 
-        # 위치 저장 또는 기존 위치 확인
-        location = Location.query.filter_by(name=location_name).first()
-        if not location:
-            location = Location(name=location_name)
-            db.session.add(location)
-            db.session.commit()
+        if capacity is not None and capacity < 1:
+            flash('정원은 1명 이상이어야 합니다.', 'error')
+            return render_template('create_event.html')
 
-        # 이벤트 생성
-        event = Event(
-            title=title,
-            date=date,
-            location_id=location.id,
-            description=description,
-            user_id=user.id
-        )
+        # 이벤트 생성 (장소는 캐시에서 찾고 없으면 upsert)
+        try:
+            event = Event(
+                title=title,
+                date=date,
+                location_id=locations.resolve(location_name),
+                description=description,
+                capacity=capacity,
+                user_id=user.id
+            )
+        except ValueError as e:
+            flash(f'날짜가 올바르지 않습니다: {e}', 'error')
+            return render_template('create_event.html')
         try:
             db.session.add(event)
+            event_calendar.event_added(event.date)
             db.session.commit()
+            search.index_event(event)
+            cache.bump_global()
             flash('이벤트가 성공적으로 생성되었습니다.', 'success')
             return redirect(url_for('event_bp.list_events'))
         except Exception as e:
@@ -75,11 +130,13 @@ def create_event():
 # 이벤트 삭제
 @event_bp.route('/delete/<int:id>', methods=['POST'])
 def delete_event(id):
-    event = Event.query.get_or_404(id)
+    _get_event_or_404(id)
     try:
-        db.session.delete(event)
-        db.session.commit()
-        flash('이벤트가 성공적으로 삭제되었습니다.', 'success')
+        # 참가자/피드백은 DB의 ON DELETE CASCADE로 삭제 (큰 행사는 백그라운드에서 나눠 삭제)
+        if deletion.delete_event(id):
+            flash('이벤트 삭제가 시작되었습니다. 참가자가 많아 잠시 후 완료됩니다.', 'success')
+        else:
+            flash('이벤트가 성공적으로 삭제되었습니다.', 'success')
     except Exception as e:
         db.session.rollback()
         flash(f'이벤트 삭제 중 오류가 발생했습니다: {str(e)}', 'error')
@@ -87,15 +144,17 @@ def delete_event(id):
 
 
 @event_bp.route('/<int:event_id>')
+@cache.cached_page(event_scoped=True)
 def event_detail(event_id):
-    event = Event.query.get_or_404(event_id)  # ID로 이벤트 검색
+    # 템플릿이 event.location을 읽으므로 함께 조회 (지연 로딩 쿼리 제거)
+    event = _get_event_or_404(event_id, joinedload(Event.location))  # ID로 이벤트 검색
     return render_template('event_detail.html', event=event)
 
 # 참가자 등록
 @event_bp.route('/<int:event_id>/register_participant', methods=['GET', 'POST'])
 def register_participant(event_id):
     # 이벤트가 존재하는지 확인
-    event = Event.query.get_or_404(event_id)
+    event = _get_event_or_404(event_id)
 
     # 로그인 확인
     if 'user_id' not in session:
@@ -114,8 +173,11 @@ def register_participant(event_id):
             flash('이름과 연락처를 모두 입력해야 합니다.', 'error')
             return render_template('event_detail.html', event=event)
 
+        # 서지 모드에서는 사전 조회 없이 unique 제약 조건과 그룹 커밋에 맡긴다
+        surge_mode = current_app.config.get('REGISTRATION_SURGE_MODE', False)
+
         # 학번 중복 확인
-        if Participant.query.filter_by(event_id=event_id, student_id=student_id).first():
+        if not surge_mode and Participant.query.filter_by(event_id=event_id, student_id=student_id).first():
             flash('이미 해당 학번으로 등록된 참가자가 있습니다.', 'error')
             return render_template('register_participant.html', event=event)
 
@@ -123,25 +185,56 @@ def register_participant(event_id):
             # 연락처 유효성 검사
             Participant.validate_contact(contact)
 
-            # 참가자 생성
-            participant = Participant(
+            values = dict(
                 name=name,
                 contact=contact,
                 student_id=student_id,
                 event_id=event_id,
                 uuid=participant_uuid,
-                attendance=True,
                 user_id=session['user_id']  # 현재 로그인한 사용자의 ID를 할당
             )
-            db.session.add(participant)
-            db.session.commit()
-
-            flash('참가 신청이 성공적으로 완료되었습니다!', 'success')
+            if surge_mode:
+                # 배처가 다른 신청과 묶어 커밋할 때까지 대기
+                seated = registration.submit(values, event)
+            else:
+                # 좌석 배정 (정원이 찼으면 대기자로 등록)
+                seated = seating.reserve_seat(event_id)
+
+                # 참가자 생성
+                participant = Participant(attendance=seated, waitlisted=not seated, **values)
+                db.session.add(participant)
+                if not seated:
+                    counters.touch(event_id)  # 대기자 등록은 카운터를 바꾸지 않는다
+                db.session.commit()
+                cache.bump_event(event_id)
+                if seated:
+                    leaderboard.participant_added(event)
+
+            # 확인 알림은 작업 큐에서 보낸다 (서지 모드에서는 배처가 배치마다 한 번에 기록한다).
+            # 신청은 이미 커밋됐으므로 기록에 실패해도 성공으로 응답한다
+            if not surge_mode:
+                try:
+                    notifications.confirm_registration(participant_uuid)
+                except Exception:
+                    current_app.logger.exception('참가자 %s 확인 알림 작업을 기록하지 못했습니다.', participant_uuid)
+
+            if seated:
+                flash('참가 신청이 성공적으로 완료되었습니다!', 'success')
+            else:
+                flash('정원이 가득 차 대기자 명단에 등록되었습니다. 자리가 나면 자동으로 참가 확정됩니다.', 'info')
             participant_link = url_for('event_bp.participant_details', event_id=event_id, uuid=participant_uuid, _external=True)
             return render_template('register_success.html', participant_link=participant_link)
 
         except ValueError as ve:
             flash(f'유효하지 않은 연락처 형식입니다: {ve}', 'error')
+        except IntegrityError as ie:
+            # 동시에 들어온 중복 신청은 unique 제약 조건에서 걸러진다
+            db.session.rollback()
+            message = registration.integrity_error_message(ie)
+            if message:
+                flash(message, 'error')
+                return render_template('register_participant.html', event=event)
+            flash(f'참가자 등록 중 오류가 발생했습니다: {str(ie)}', 'error')
         except Exception as e:
             db.session.rollback()
             flash(f'참가자 등록 중 오류가 발생했습니다: {str(e)}', 'error')
@@ -154,24 +247,45 @@ def register_participant(event_id):
 # 이벤트 업데이트
 @event_bp.route('/update/<int:id>', methods=['GET', 'POST'])
 def update_event(id):
-    event = Event.query.get_or_404(id)
+    event = _get_event_or_404(id)
 
     if request.method == 'POST':
+        old_date = event.date
+        try:
+            new_date = Event.parse_date(request.form.get('date') or '')
+        except ValueError as e:
+            flash(f'날짜가 올바르지 않습니다: {e}', 'error')
+            return redirect(url_for('event_bp.update_event', id=id))
         event.title = request.form.get('title')
-        event.date = request.form.get('date')
+        event.date = new_date
         event_location = request.form.get('location')
         event.description = request.form.get('description')
+        capacity = request.form.get('capacity', type=int)
+        if capacity is not None and capacity < 1:
+            flash('정원은 1명 이상이어야 합니다.', 'error')
+            return redirect(url_for('event_bp.update_event', id=id))
+        event.capacity = capacity
+        event.mark_updated()
 
         # Location 업데이트
         if event_location:
-            location = Location.query.filter_by(name=event_location).first()
-            if not location:
-                location = Location(name=event_location)
-                db.session.add(location)
-            event.location = location
+            event.location_id = locations.resolve(event_location)
 
         try:
+            event_calendar.event_moved(old_date, event.date)
+            counters.touch(id)
+            # 정원이 늘었으면 대기자를 승격
+            db.session.flush()
+            promoted = seating.fill_open_seats(id)
             db.session.commit()
+            search.index_event(event)
+            leaderboard.update_event(event)
+            cache.bump_global()
+            cache.bump_event(id)
+            if promoted:
+                leaderboard.participant_added(event, promoted)
+            # 정원 변경/승격 뒤 카운터 재계산은 작업 큐에서
+            jobs.enqueue('event.refresh_stats', event_id=id)
             flash('이벤트가 성공적으로 수정되었습니다.', 'success')
             return redirect(url_for('auth_bp.mypage'))
         except Exception as e:
@@ -184,30 +298,25 @@ def update_event(id):
 # 행사별 참석률 통계
 @event_bp.route('/stats/<int:event_id>')
 def event_stats(event_id):
-    event = Event.query.get_or_404(event_id)
-    total_participants = Participant.query.filter_by(event_id=event_id).count()
-    attended_participants = Participant.query.filter_by(event_id=event_id, attendance=True).count()
-    attendance_rate = (attended_participants / total_participants) * 100 if total_participants > 0 else 0
-    return render_template('event_stats.html', event=event, attendance_rate=attendance_rate)
+    event = _get_event_or_404(event_id)
+    # 비정규화 카운터로 계산 (COUNT 쿼리 없음)
+    return render_template('event_stats.html', event=event, attendance_rate=event.attendance_rate)
 
 
 @event_bp.route('/<int:event_id>/participants', methods=['GET'])
 def participant_list(event_id):
     # 이벤트 가져오기
-    event = Event.query.get_or_404(event_id)
+    event = _get_event_or_404(event_id)
 
     # 참가자 목록 가져오기
     participants = Participant.query.filter_by(event_id=event_id).all()
 
-    # 총 참가자 수 계산
-    total_participants = len(participants)
+    # 총 참가자 수와 참석률은 비정규화 카운터에서 읽는다
+    total_participants = event.participant_count
+    attendance_rate = event.attendance_rate
 
-    # 참석자 수 계산
-    attendees = sum(1 for p in participants if p.attendance)
-    attendance_rate = (attendees / total_participants * 100) if total_participants > 0 else 0
-
-    # 피드백 가져오기
-    feedbacks = Feedback.query.filter_by(event_id=event_id).all()
+    # 피드백은 최신순 한 페이지만 (평점 분포는 event 카운터에서)
+    feedbacks = feedback_service.feedback_page(event_id, request.args.get(feedback_service.CURSOR_PARAM))
 
     return render_template(
         'participant_list.html',
@@ -218,12 +327,121 @@ def participant_list(event_id):
         feedbacks=feedbacks
     )
 
+# 참가자 일괄 등록 (CSV/XLSX 명렬표)
+@event_bp.route('/<int:event_id>/participants/import', methods=['POST'])
+def import_participants(event_id):
+    if 'user_id' not in session:
+        flash('로그인이 필요합니다.', 'error')
+        return redirect(url_for('auth_bp.login'))
+
+    # 권한 확인
+    user = principal.current_principal()
+    if user is None or not user.is_admin():
+        flash('참가자 일괄 등록 권한이 없습니다.', 'error')
+        return redirect(url_for('event_bp.participant_list', event_id=event_id))
+
+    event = _get_event_or_404(event_id)
+    roster = request.files.get('file')
+    if not roster or not roster.filename:
+        flash('업로드할 파일을 선택하세요.', 'error')
+        return redirect(url_for('event_bp.participant_list', event_id=event_id))
+
+    try:
+        report = participant_import.import_participants(
+            event_id, participant_import.read_rows(roster)
+        )
+    except participant_import.RosterImportError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('event_bp.participant_list', event_id=event_id))
+    except Exception as e:
+        flash(f'참가자 일괄 등록 중 오류가 발생했습니다: {str(e)}', 'error')
+        return redirect(url_for('event_bp.participant_list', event_id=event_id))
+
+    if report.inserted:
+        cache.bump_event(event_id)
+    if report.seated:
+        leaderboard.participant_added(event, report.seated)
+
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify(report.to_dict())
+    return render_template('import_report.html', event=event, report=report)
+
+# 참가자/출석/피드백 내보내기 (관리자 전용)
+# ?format=csv|ndjson (기본 csv), ?gzip=1 이면 gzip으로 압축해서 보낸다
+def _export_response(dataset, event_id=None, date_from=None, date_to=None):
+    user = principal.current_principal()
+    if user is None or not user.is_admin():
+        return jsonify({"message": "Forbidden"}), 403
+
+    fmt = request.args.get('format', 'csv')
+    try:
+        body = export.stream(dataset, fmt, event_id, date_from, date_to)
+    except export.ExportError as e:
+        return jsonify({"message": str(e)}), 400
+
+    name = export.filename(dataset, fmt, event_id, date_from, date_to)
+    mimetype = export.FORMATS[fmt]
+    if request.args.get('gzip') == '1':
+        body = export.gzip_chunks(body)
+        name += '.gz'
+        mimetype = 'application/gzip'
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{name}"'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+@event_bp.route('/<int:event_id>/export/<dataset>', methods=['GET'])
+def export_event(event_id, dataset):
+    _get_event_or_404(event_id)
+    return _export_response(dataset, event_id=event_id)
+
+
+# 기간 내 모든 행사 (?from=YYYY-MM-DD&to=YYYY-MM-DD, 생략하면 제한 없음)
+@event_bp.route('/export/<dataset>', methods=['GET'])
+def export_range(dataset):
+    try:
+        date_from = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+        date_to = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+    except ValueError:
+        return jsonify({"message": "Dates must be YYYY-MM-DD"}), 400
+    return _export_response(dataset, date_from=date_from, date_to=date_to)
+
+# 입구 QR 체크인 (관리자 전용). 스캐너가 입력한 코드를 줄마다 하나씩 받아 한 번에 처리한다
+@event_bp.route('/<int:event_id>/checkin', methods=['GET', 'POST'])
+def checkin_page(event_id):
+    if 'user_id' not in session:
+        flash('로그인이 필요합니다.', 'error')
+        return redirect(url_for('auth_bp.login'))
+
+    user = principal.current_principal()
+    if user is None or not user.is_admin():
+        flash('체크인 권한이 없습니다.', 'error')
+        return redirect(url_for('event_bp.event_detail', event_id=event_id))
+
+    result = None
+    if request.method == 'POST':
+        scans = [line for line in request.form.get('uuids', '').splitlines() if line.strip()]
+        try:
+            result = checkin.check_in(event_id, scans)
+        except checkin.CheckinError as e:
+            flash(str(e), 'error')
+        except Exception as e:
+            db.session.rollback()
+            flash(f'체크인 중 오류가 발생했습니다: {str(e)}', 'error')
+
+    # 체크인 반영 후의 카운터를 읽는다
+    event = db.session.query(Event.id, Event.title, Event.participant_count, Event.attended_count)\
+        .filter(Event.id == event_id, Event.deleted.is_(False)).first_or_404()
+    return render_template('checkin.html', event=event, result=result)
+
 # 참가자 정보 조회 및 수정
-@event_bp.route('/<int:event_id>/participants/<uuid>', methods=['GET', 'POST'])
+@event_bp.route('/<int:event_id>/participants/<uuid:uuid>', methods=['GET', 'POST'])
 def participant_details(event_id, uuid):
     # 해당 참가자 정보 가져오기
     participant = Participant.query.filter_by(uuid=uuid, event_id=event_id).first_or_404()
-    event = Event.query.get_or_404(event_id)
+    event = _get_event_or_404(event_id)
 
     if request.method == 'POST':
         # 폼에서 수정된 값 가져오기
@@ -235,46 +453,38 @@ def participant_details(event_id, uuid):
         # 필수 필드 확인
         if not name or not contact or not student_id:
             flash('모든 필수 필드를 입력해야 합니다.', 'error')
-            return render_template(
-                'participant_details.html',
-                participant=participant,
-                feedbacks=Feedback.query.filter_by(event_id=event_id).all(),
-                event=event
-            )
+            return _render_participant_details(participant, event)
 
         # 학번 중복 확인
         existing_participant = Participant.query.filter_by(event_id=event_id, student_id=student_id).first()
         if existing_participant and existing_participant.id != participant.id:
             flash('해당 학번은 이미 등록되어 있습니다.', 'error')
-            return render_template(
-                'participant_details.html',
-                participant=participant,
-                feedbacks=Feedback.query.filter_by(event_id=event_id).all(),
-                event=event
-            )
+            return _render_participant_details(participant, event)
 
         try:
             # 데이터베이스에 변경 내용 저장
             participant.name = name
             participant.contact = contact
             participant.student_id = student_id
+            if not participant.waitlisted:
+                counters.attendance_changed(event_id, participant.attendance, attendance)
+            counters.touch(event_id)
             participant.attendance = attendance
             db.session.commit()
+            cache.bump_event(event_id)
             flash('참가자 정보가 성공적으로 수정되었습니다.', 'success')
             return redirect(url_for('auth_bp.mypage'))
         except Exception as e:
             db.session.rollback()
             flash(f'참가자 정보 수정 중 오류가 발생했습니다: {str(e)}', 'error')
-            return render_template(
-                'participant_details.html',
-                participant=participant,
-                feedbacks=Feedback.query.filter_by(event_id=event_id).all(),
-                event=event
-            )
+            return _render_participant_details(participant, event)
 
-    # 피드백 가져오기
-    feedbacks = Feedback.query.filter_by(event_id=event_id).all()
+    return _render_participant_details(participant, event)
 
+
+def _render_participant_details(participant, event):
+    # 피드백은 최신순 한 페이지만 읽는다 (오류로 다시 그릴 때도 같은 비용)
+    feedbacks = feedback_service.feedback_page(event.id, request.args.get(feedback_service.CURSOR_PARAM))
     return render_template(
         'participant_details.html',
         participant=participant,
@@ -283,11 +493,35 @@ def participant_details(event_id, uuid):
     )
 
 
+# 참가 신청 취소
+@event_bp.route('/<int:event_id>/participants/<uuid:uuid>/cancel', methods=['POST'])
+def cancel_participant(event_id, uuid):
+    participant = Participant.query.filter_by(uuid=uuid, event_id=event_id).first_or_404()
+    event = _get_event_or_404(event_id)
+    try:
+        db.session.delete(participant)
+        promoted = 0
+        if not participant.waitlisted:
+            # 좌석을 반납하고 대기자를 자동 승격
+            promoted = seating.release_seat(event_id, participant.attendance)
+        else:
+            counters.touch(event_id)
+        db.session.commit()
+        cache.bump_event(event_id)
+        if not participant.waitlisted:
+            # 취소 1명, 승격 promoted명
+            leaderboard.adjust(event, promoted - 1)
+        flash('참가 신청이 취소되었습니다.', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'참가 신청 취소 중 오류가 발생했습니다: {str(e)}', 'error')
+    return redirect(url_for('auth_bp.mypage'))
+
 
 # 피드백 작성 라우트
 @event_bp.route('/<int:event_id>/leave_feedback', methods=['POST'])
 def leave_feedback(event_id):
-    event = Event.query.get_or_404(event_id)
+    event = _get_event_or_404(event_id)
 
     feedback_text = request.form.get('feedback_text')
     rating = request.form.get('rating')
@@ -295,6 +529,9 @@ def leave_feedback(event_id):
     if not feedback_text or not rating:
         flash('피드백 내용과 평점을 입력해주세요.', 'error')
         return redirect(url_for('event_bp.event_detail', event_id=event_id))
+    if rating not in {'1', '2', '3', '4', '5'}:
+        flash('평점은 1~5 사이여야 합니다.', 'error')
+        return redirect(url_for('event_bp.event_detail', event_id=event_id))
 
     try:
         feedback = Feedback(
@@ -303,7 +540,9 @@ def leave_feedback(event_id):
             rating=int(rating)
         )
         db.session.add(feedback)
+        counters.feedback_added(event_id, feedback.rating)
         db.session.commit()
+        cache.bump_event(event_id)
         flash('피드백이 성공적으로 제출되었습니다.', 'success')
     except Exception as e:
         db.session.rollback()
@@ -316,7 +555,9 @@ def delete_feedback(event_id, feedback_id):
     feedback = Feedback.query.get_or_404(feedback_id)
     try:
         db.session.delete(feedback)
+        counters.feedback_removed(feedback.event_id, feedback.rating)
         db.session.commit()
+        cache.bump_event(feedback.event_id)
         flash('피드백이 성공적으로 삭제되었습니다.', 'success')
     except Exception as e:
         db.session.rollback()
@@ -327,10 +568,34 @@ def delete_feedback(event_id, feedback_id):
 
 @event_bp.route('/most_popular_event', methods=['GET'])
 def most_popular_event():
-    result = get_most_popular_event()
-    if result:
-        return jsonify({
-            "event_title": result.title,
-            "participant_count": result.participant_count
-        })
-    return jsonify({"message": "No data found"})
\ No newline at end of file
+    n = request.args.get('n', type=int)
+    since = request.args.get('since')
+    if since:
+        try:
+            since = date.fromisoformat(since)
+        except ValueError:
+            return jsonify({"message": "Invalid 'since' date, expected YYYY-MM-DD"}), 400
+
+    # 메모리 순위표에서 조회 (participant 테이블을 읽지 않음)
+    events = leaderboard.top(n or 1, since=since)
+
+    if n is None:
+        # n이 없으면 기존 단일 결과 형식 유지
+        if events:
+            return jsonify({
+                "event_title": events[0].title,
+                "participant_count": events[0].participant_count
+            })
+        return jsonify({"message": "No data found"})
+
+    return jsonify({
+        "events": [
+            {
+                "event_id": event.id,
+                "event_title": event.title,
+                "date": event.date.isoformat(),
+                "participant_count": event.participant_count
+            }
+            for event in events
+        ]
+    })
@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+from flask import current_app, request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip 사본만 만든다
+    brotli = None
+
+BUILD_DIR = 'dist'  # static 폴더 아래 빌드 결과 위치
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 12
+MAX_AGE = 365 * 24 * 3600  # 초
+IMMUTABLE_CACHE_CONTROL = f'public, max-age={MAX_AGE}, immutable'
+# 미리 압축할 파일 확장자 (png 같은 이미지는 이미 압축돼 있다)
+COMPRESSIBLE = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.map'}
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))  # 선호 순서
+
+# 정적 파일 빌드/서빙 (flask build-assets)
+# static 아래 파일을 내용 해시가 들어간 이름(styles.<해시>.css)으로 static/dist에 복사하고
+# br/gzip 사본을 미리 만든 뒤 원래 이름 -> 해시 이름 매니페스트를 남긴다.
+# url_for('static', filename='styles.css')는 매니페스트가 있으면 해시 이름을 돌려주고,
+# 해시 이름 요청은 1년 immutable 캐시 헤더와 함께 Accept-Encoding에 맞는 사본으로 응답한다.
+# 매니페스트가 없으면(빌드 전, 개발 환경) 원래 파일을 Flask 기본 방식으로 보낸다.
+
+
+def _hashed_name(path, digest):
+    root, ext = os.path.splitext(path)
+    return f'{root}.{digest[:HASH_LENGTH]}{ext}'
+
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def build(static_folder):
+    # 매니페스트를 반환한다. 배포 중 캐시된 페이지가 옛 해시 이름을 가리킬 수 있으므로
+    # 이전 빌드 파일은 지우지 않는다
+    build_root = os.path.join(static_folder, BUILD_DIR)
+    manifest = {}
+    for directory, dirnames, filenames in os.walk(static_folder):
+        if os.path.abspath(directory) == os.path.abspath(static_folder):
+            dirnames[:] = [name for name in dirnames if name != BUILD_DIR]
+        for filename in filenames:
+            source = os.path.join(directory, filename)
+            relative = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+
+            hashed = _hashed_name(relative, hashlib.sha256(data).hexdigest())
+            target = os.path.join(build_root, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+
+            encodings = []
+            if os.path.splitext(filename)[1].lower() in COMPRESSIBLE:
+                for encoding, suffix in ENCODINGS:
+                    if encoding == 'br' and brotli is None:
+                        continue
+                    compressed = _compress(data, encoding)
+                    # 줄어들지 않으면 사본을 두지 않는다
+                    if len(compressed) < len(data):
+                        with open(target + suffix, 'wb') as f:
+                            f.write(compressed)
+                        encodings.append(encoding)
+
+            manifest[relative] = {'path': f'{BUILD_DIR}/{hashed}', 'encodings': encodings}
+
+    os.makedirs(build_root, exist_ok=True)
+    # 다른 워커가 반쯤 쓴 매니페스트를 읽지 않도록 임시 파일에 쓴 뒤 교체
+    manifest_path = os.path.join(build_root, MANIFEST_NAME)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+def _manifest_path(app):
+    return app.config.get('ASSET_MANIFEST') or os.path.join(app.static_folder, BUILD_DIR, MANIFEST_NAME)
+
+
+def load_manifest(app):
+    # (원래 이름 -> 해시 경로, 해시 경로 -> 압축 사본 인코딩). 매니페스트가 없으면 빈 사전
+    try:
+        with open(_manifest_path(app), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    urls = {name: entry['path'] for name, entry in manifest.items()}
+    encodings = {entry['path']: tuple(entry['encodings']) for entry in manifest.values()}
+    return urls, encodings
+
+
+def _get_manifest():
+    # 워커마다 처음 쓸 때 한 번 읽는다 (새 빌드는 재시작 후 반영)
+    manifest = current_app.extensions.get('asset_manifest')
+    if manifest is None:
+        manifest = current_app.extensions.setdefault('asset_manifest', load_manifest(current_app))
+    return manifest
+
+
+def _static_url_defaults(endpoint, values):
+    # url_for('static', filename=...)를 해시 이름으로 바꾼다
+    if endpoint == 'static' and 'filename' in values:
+        urls, _ = _get_manifest()
+        values['filename'] = urls.get(values['filename'], values['filename'])
+
+
+def _choose_encoding(available):
+    accepted = request.accept_encodings
+    best = None
+    for encoding in available:
+        quality = accepted[encoding]
+        if quality and (best is None or quality > best[1]):
+            best = (encoding, quality)
+    return best[0] if best else None
+
+
+def _serve_static(filename):
+    _, encodings = _get_manifest()
+    if filename not in encodings:
+        return current_app.send_static_file(filename)
+
+    encoding = _choose_encoding(encodings[filename])
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    suffix = dict(ENCODINGS)[encoding] if encoding else ''
+    response = send_from_directory(current_app.static_folder, filename + suffix, mimetype=mimetype, max_age=MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if encodings[filename]:
+        response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+def init_assets(app):
+    if not app.has_static_folder:
+        return
+    app.url_defaults(_static_url_defaults)
+    app.view_functions['static'] = _serve_static
@@ -0,0 +1,252 @@
+import hashlib
+import os
+import pickle
+import random
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request, session, Response
+
+from services import db_routing
+
+DEFAULT_TTL = 60  # 초
+DEFAULT_MAX_ENTRIES = 1024
+
+GLOBAL_VERSION = 'version:global'
+
+
+# 프로세스 내 LRU 캐시 (워커마다 따로 가진다)
+class LRUCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (만료 시각, 값)
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 여러 워커가 공유하는 디스크 캐시 (같은 서버의 gunicorn 워커 간 공유)
+class FileSystemCache:
+    def __init__(self, directory, max_entries=DEFAULT_MAX_ENTRIES):
+        self._directory = directory
+        self._max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self._directory, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                expires_at, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if expires_at is not None and expires_at < time.time():
+            return None
+        return value
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        expires_at = time.time() + ttl if ttl else None
+        # 임시 파일에 쓴 뒤 교체해서 다른 워커가 반쯤 쓴 파일을 읽지 않게 한다
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        if random.random() < 0.01:
+            self._prune()
+
+    def _prune(self):
+        # 오래된 파일부터 지워 max_entries 이하로 유지
+        try:
+            entries = [os.path.join(self._directory, name) for name in os.listdir(self._directory)]
+            if len(entries) <= self._max_entries:
+                return
+            entries.sort(key=os.path.getmtime)
+            for path in entries[:len(entries) - self._max_entries]:
+                os.remove(path)
+        except OSError:
+            pass
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self._directory):
+            try:
+                os.remove(os.path.join(self._directory, name))
+            except OSError:
+                pass
+
+
+# 캐시를 끈 경우
+class NullCache:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+
+def get_cache():
+    # CACHE_BACKEND: 'memory'(기본), 'filesystem', 'none'
+    cache = current_app.extensions.get('page_cache')
+    if cache is None:
+        config = current_app.config
+        backend = config.get('CACHE_BACKEND', 'memory')
+        max_entries = config.get('CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+        if backend == 'filesystem':
+            directory = config.get('CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'school_event_hub_cache')
+            cache = FileSystemCache(directory, max_entries=max_entries)
+        elif backend == 'none':
+            cache = NullCache()
+        else:
+            cache = LRUCache(max_entries=max_entries)
+        cache = current_app.extensions.setdefault('page_cache', cache)
+    return cache
+
+
+def _event_version_key(event_id):
+    return f'version:event:{event_id}'
+
+
+def _new_version():
+    # 버전 값 뒤에 바뀐 시각을 붙여 둔다 (복제 지연 중인지 판단용)
+    return f'{uuid.uuid4().hex}@{time.time():.3f}'
+
+
+def _bumped_at(version):
+    try:
+        return float(version.rpartition('@')[2])
+    except ValueError:
+        return 0.0
+
+
+def _version(key):
+    # 버전은 만료 없이 백엔드에 저장한다. 없어졌으면 새 값을 만들어 예전 키와 겹치지 않게 한다
+    cache = get_cache()
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        cache.set(key, version, ttl=None)
+    return version
+
+
+def global_version():
+    # 여러 행사에 걸친 데이터의 현재 버전 (API ETag용)
+    return _version(GLOBAL_VERSION)
+
+
+def event_version(event_id):
+    # 행사 하나(상세/참가자/통계)의 현재 버전 (API ETag용)
+    return _version(_event_version_key(event_id))
+
+
+def bump_global():
+    # 행사 목록/홈처럼 여러 행사를 보여주는 페이지를 무효화
+    get_cache().set(GLOBAL_VERSION, _new_version(), ttl=None)
+
+
+def bump_event(event_id):
+    # 해당 행사 상세 페이지를 무효화하고 새 버전을 반환
+    version = _new_version()
+    get_cache().set(_event_version_key(event_id), version, ttl=None)
+    return version
+
+
+def _page_key(versions):
+    versions = ':'.join(versions)
+    query = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+    # 네비게이션 바가 로그인 여부에 따라 달라지므로 키에 포함
+    logged_in = 'user_id' in session
+    return f'page:{request.path}?{query}|auth={int(logged_in)}|v={versions}'
+
+
+def _store_stream(cache, key, chunks, ttl):
+    # 스트리밍 응답을 그대로 보내면서 끝까지 전송되면 캐시에 저장
+    body = []
+    for chunk in chunks:
+        body.append(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        yield chunk
+    cache.set(key, b''.join(body), ttl=ttl)
+
+
+def cached_page(event_scoped=False):
+    # 전체 버전(또는 행사별 버전)을 키에 넣어 HTML 응답을 캐시한다.
+    # 쓰기 라우트가 bump_global/bump_event를 호출하면 키가 바뀌어 오래된 페이지가 보이지 않는다
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # 표시할 flash 메시지가 있으면 사용자마다 내용이 다르므로 캐시하지 않는다
+            if request.method != 'GET' or session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            if event_scoped:
+                version_keys = [_event_version_key(kwargs['event_id'])]
+            else:
+                version_keys = [GLOBAL_VERSION]
+            cache = get_cache()
+            versions = [_version(key) for key in version_keys]
+            key = _page_key(versions)
+
+            body = cache.get(key)
+            if body is not None:
+                response = Response(body, mimetype='text/html')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            # 버전이 바뀐 직후에는 replica가 아직 예전 데이터를 줄 수 있으므로, 새 키에 담을 페이지는
+            # 복제 지연(DB_READ_YOUR_WRITES_SECONDS) 동안 primary에서 읽어 렌더링한다
+            lag = current_app.config.get('DB_READ_YOUR_WRITES_SECONDS', db_routing.DEFAULT_STICKY_SECONDS)
+            if max(_bumped_at(version) for version in versions) > time.time() - lag:
+                db_routing.use_primary()
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and response.mimetype == 'text/html':
+                ttl = current_app.config.get('CACHE_TTL', DEFAULT_TTL)
+                if response.is_streamed:
+                    response.response = _store_stream(cache, key, response.response, ttl)
+                else:
+                    cache.set(key, response.get_data(), ttl=ttl)
+                response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,108 @@
+import uuid
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import BINARY, type_coerce, update
+
+from models import db, Event, Participant
+from services import cache, counters
+from services.cache import LRUCache
+
+MAX_BATCH = 500  # 한 번에 받는 스캔 수
+ROSTER_TTL = 12 * 3600  # 초
+ROSTER_MAX_EVENTS = 64  # 워커마다 동시에 색인해 두는 행사 수
+
+# QR 체크인
+# 행사별로 좌석이 배정된 참가자 UUID(16바이트) 집합을 워커 메모리에 두고, 잘못 찍힌 코드는
+# 참가자 테이블을 읽지 않고 바로 거른다. 명단 색인은 명단 버전(Event.roster_version)이 바뀌면
+# 다시 읽는다. 신청/취소/승격/일괄 등록은 어느 워커나 프로세스에서 처리돼도 이 값을 올리고
+# 체크인은 올리지 않으므로, 체크인마다 PK 조회 한 번으로 색인이 최신인지 확인하고 계속 쓴다.
+# 유효한 코드는 UPDATE 한 번으로 출석 처리한다.
+
+Roster = namedtuple('Roster', ['version', 'uuids'])
+
+
+class CheckinResult(namedtuple('CheckinResult', ['checked_in', 'already_checked_in', 'rejected'])):
+    __slots__ = ()
+
+    def to_dict(self):
+        return {
+            'checked_in': self.checked_in,
+            'already_checked_in': self.already_checked_in,
+            'rejected': self.rejected,
+        }
+
+
+class CheckinError(ValueError):
+    pass
+
+
+def parse_scan(value):
+    # UUID 그대로 또는 QR에 담긴 참가자 페이지 URL(.../participants/<uuid>)을 받는다
+    if not isinstance(value, str):
+        return None
+    text = value.strip().rstrip('/').rsplit('/', 1)[-1]
+    try:
+        return uuid.UUID(text)
+    except ValueError:
+        return None
+
+
+def _get_cache():
+    roster_cache = current_app.extensions.get('checkin_rosters')
+    if roster_cache is None:
+        roster_cache = current_app.extensions.setdefault('checkin_rosters', LRUCache(max_entries=ROSTER_MAX_EVENTS))
+    return roster_cache
+
+
+def _roster_version(event_id):
+    return db.session.query(Event.roster_version).filter(Event.id == event_id).scalar()
+
+
+def roster(event_id):
+    version = _roster_version(event_id)
+    entry = _get_cache().get(event_id)
+    if entry is None or entry.version != version:
+        # 변환 없이 16바이트 그대로 읽는다
+        raw_uuid = type_coerce(Participant.uuid, BINARY(16))
+        rows = db.session.query(raw_uuid)\
+            .filter(Participant.event_id == event_id, Participant.waitlisted.is_(False))
+        entry = Roster(version, frozenset(bytes(row[0]) for row in rows))
+        _get_cache().set(event_id, entry, ttl=ROSTER_TTL)
+    return entry
+
+
+def check_in(event_id, scans):
+    if len(scans) > MAX_BATCH:
+        raise CheckinError(f'한 번에 최대 {MAX_BATCH}개까지 체크인할 수 있습니다.')
+
+    entry = roster(event_id)
+    valid, seen, rejected = [], set(), []
+    for scan in scans:
+        value = parse_scan(scan)
+        if value is None or value.bytes not in entry.uuids:
+            rejected.append(scan)
+        elif value.bytes not in seen:
+            seen.add(value.bytes)
+            valid.append(value)
+
+    checked_in = 0
+    if valid:
+        # 아직 출석 처리되지 않은 참가자만 바꾸므로 여러 단말이 같은 코드를 찍어도 한 번만 센다
+        result = db.session.execute(
+            update(Participant)
+            .where(Participant.event_id == event_id)
+            .where(Participant.uuid.in_(valid))
+            .where(Participant.waitlisted.is_(False))
+            .where(Participant.attendance.isnot(True))
+            .values(attendance=True)
+            .execution_options(synchronize_session=False)
+        )
+        checked_in = result.rowcount
+        if checked_in:
+            counters.checked_in(event_id, checked_in)
+        db.session.commit()
+        if checked_in:
+            cache.bump_event(event_id)
+
+    return CheckinResult(checked_in, len(valid) - checked_in, rejected)
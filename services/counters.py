@@ -0,0 +1,139 @@
+from sqlalchemy import case
+from sqlalchemy.sql import func
+
+from models import db, Event, Participant, Feedback, RATINGS
+from services import cache
+from services.jobs import job
+
+REPAIR_CHUNK_SIZE = 500
+
+# Event의 비정규화 카운터는 UPDATE ... SET col = col + n 으로 DB에서 바로 증감한다.
+# 호출한 라우트의 commit과 같은 트랜잭션에 묶이므로 롤백되면 함께 취소된다.
+# 같은 UPDATE에서 행 버전(Event.version)도 올리고, 좌석 배정 인원이 바뀌면 명단 버전(Event.roster_version)도 올린다.
+
+
+def _increment(event_id, **deltas):
+    values = {
+        getattr(Event, column): getattr(Event, column) + delta
+        for column, delta in deltas.items() if delta
+    }
+    values[Event.version] = Event.version + 1
+    if deltas.get('participant_count'):
+        values[Event.roster_version] = Event.roster_version + 1
+    Event.query.filter_by(id=event_id).update(values, synchronize_session=False)
+
+
+def touch(*event_ids):
+    # 카운터는 그대로이고 행사/참가자 내용만 바뀐 경우 (행사 수정, 참가자 정보 수정, 대기자 등록 등)
+    Event.query.filter(Event.id.in_(event_ids))\
+        .update({Event.version: Event.version + 1}, synchronize_session=False)
+
+
+def participant_added(event_id, attended, count=1):
+    _increment(event_id, participant_count=count, attended_count=count if attended else 0)
+
+
+def participant_removed(event_id, attended):
+    _increment(event_id, participant_count=-1, attended_count=-1 if attended else 0)
+
+
+def participants_removed(event_id, removed, attended):
+    # 여러 명을 한 번에 제거 (회원탈퇴 등). attended는 그중 출석 처리된 인원
+    _increment(event_id, participant_count=-removed, attended_count=-attended)
+
+
+def attendance_changed(event_id, was_attended, attended):
+    if was_attended != attended:
+        _increment(event_id, attended_count=1 if attended else -1)
+
+
+def checked_in(event_id, count):
+    # 체크인으로 출석 처리된 인원 (불참 -> 참석만 센다)
+    _increment(event_id, attended_count=count)
+
+
+def _rating_column(rating):
+    if rating not in RATINGS:
+        raise ValueError('평점은 1~5 사이여야 합니다.')
+    return f'rating_{rating}_count'
+
+
+def feedback_added(event_id, rating):
+    _increment(event_id, rating_sum=rating, rating_count=1, **{_rating_column(rating): 1})
+
+
+def feedback_removed(event_id, rating):
+    _increment(event_id, rating_sum=-rating, rating_count=-1, **{_rating_column(rating): -1})
+
+
+def _recount(event_ids):
+    # 원본 테이블에서 행사별 카운터를 다시 계산해 bulk_update_mappings용 dict 목록으로 반환
+    participant_totals = {
+        row.event_id: row for row in db.session.query(
+            Participant.event_id,
+            func.count(Participant.id).label('total'),
+            func.sum(case((Participant.attendance == True, 1), else_=0)).label('attended')  # noqa: E712
+        ).filter(Participant.event_id.in_(event_ids))
+         .filter(Participant.waitlisted.is_(False))  # 대기자는 좌석 수에서 제외
+         .group_by(Participant.event_id)
+    }
+    feedback_totals = {
+        row.event_id: row for row in db.session.query(
+            Feedback.event_id,
+            func.count(Feedback.id).label('total'),
+            func.sum(Feedback.rating).label('rating_sum'),
+            *[func.sum(case((Feedback.rating == rating, 1), else_=0)).label(f'rating_{rating}_count')
+              for rating in RATINGS]
+        ).filter(Feedback.event_id.in_(event_ids)).group_by(Feedback.event_id)
+    }
+
+    mappings = []
+    for event_id in event_ids:
+        participants = participant_totals.get(event_id)
+        feedbacks = feedback_totals.get(event_id)
+        mapping = {
+            'id': event_id,
+            'participant_count': participants.total if participants else 0,
+            'attended_count': int(participants.attended or 0) if participants else 0,
+            'rating_count': feedbacks.total if feedbacks else 0,
+            'rating_sum': int(feedbacks.rating_sum or 0) if feedbacks else 0,
+        }
+        for rating in RATINGS:
+            column = f'rating_{rating}_count'
+            mapping[column] = int(getattr(feedbacks, column) or 0) if feedbacks else 0
+        mappings.append(mapping)
+    return mappings
+
+
+def repair_event_counters(chunk_size=REPAIR_CHUNK_SIZE):
+    # 원본 테이블에서 카운터를 다시 계산 (이벤트 id 순으로 chunk_size개씩 나눠 커밋)
+    last_id = 0
+    repaired = 0
+    while True:
+        event_ids = [row.id for row in db.session.query(Event.id)
+                     .filter(Event.id > last_id)
+                     .order_by(Event.id)
+                     .limit(chunk_size)]
+        if not event_ids:
+            break
+
+        db.session.bulk_update_mappings(Event, _recount(event_ids))
+        touch(*event_ids)
+        db.session.commit()
+
+        repaired += len(event_ids)
+        last_id = event_ids[-1]
+    return repaired
+
+
+@job('event.refresh_stats')
+def refresh_event_stats(event_id):
+    # 행사 한 개의 카운터를 다시 계산 (행사 수정 후 작업 큐에서 실행).
+    # 행 잠금을 먼저 잡아 세는 동안 들어온 좌석 예약(seating.reserve_seat)을 덮어쓰지 않게 한다
+    locked = db.session.query(Event.id).filter(Event.id == event_id).with_for_update().first()
+    if locked is None:
+        return
+    db.session.bulk_update_mappings(Event, _recount([event_id]))
+    touch(event_id)
+    db.session.commit()
+    cache.bump_event(event_id)
@@ -0,0 +1,165 @@
+import random
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request, session as http_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Delete, Insert, Select, Update, event
+from sqlalchemy.pool import QueuePool
+
+REPLICA_BIND_PREFIX = 'replica_'
+READ_METHODS = ('GET', 'HEAD')
+STICKY_SESSION_KEY = '_db_primary_until'
+DEFAULT_STICKY_SECONDS = 5  # 복제 지연보다 길게 잡는다
+
+
+# 풀에서 연결을 얻기까지 기다린 시간 (풀마다 하나)
+class PoolWaitStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+
+    def record(self, elapsed, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += elapsed
+            self.max_wait = max(self.max_wait, elapsed)
+            if timed_out:
+                self.timeouts += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'avg_wait_ms': round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0,
+                'max_wait_ms': round(self.max_wait * 1000, 3),
+                'timeouts': self.timeouts,
+            }
+
+
+# 연결 대기 시간을 재는 QueuePool
+class TimedQueuePool(QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats  # pre_ping/재생성 후에도 통계를 이어간다
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return connection
+
+
+def engine_options(config):
+    # 모든 bind(primary/replica)에 같은 풀 설정을 적용한다
+    if config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        # SQLite는 파일 잠금을 기다리도록 타임아웃을 주고, 스레드 간 연결 공유를 허용한다
+        return {'connect_args': {'timeout': 30, 'check_same_thread': False}}
+    return {
+        'poolclass': TimedQueuePool,
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+
+def _sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+def enable_foreign_keys(app, db):
+    # SQLite는 연결마다 켜야 ON DELETE CASCADE가 동작한다 (MySQL은 항상 켜져 있음)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', _sqlite_foreign_keys)
+
+
+def configure_replicas(app):
+    # SQLALCHEMY_REPLICA_URIS를 replica_0, replica_1 ... bind로 등록 (db.init_app 전에 호출)
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    replica_keys = []
+    for index, uri in enumerate(app.config.get('SQLALCHEMY_REPLICA_URIS') or []):
+        key = f'{REPLICA_BIND_PREFIX}{index}'
+        binds[key] = uri
+        replica_keys.append(key)
+    app.config['SQLALCHEMY_BINDS'] = binds
+    app.extensions['db_replicas'] = replica_keys
+
+
+def init_routing(app):
+    # 쓰기가 있었던 요청 뒤에는 잠시 primary에서만 읽게 한다 (read-your-writes)
+    sticky_seconds = app.config.get('DB_READ_YOUR_WRITES_SECONDS', DEFAULT_STICKY_SECONDS)
+
+    @app.after_request
+    def stick_to_primary_after_write(response):
+        if g.get('_db_wrote') and app.extensions.get('db_replicas'):
+            http_session[STICKY_SESSION_KEY] = time.time() + sticky_seconds
+        return response
+
+
+def _replica_key():
+    # 한 요청 안에서는 같은 replica를 쓴다
+    if '_db_replica' not in g:
+        replicas = current_app.extensions.get('db_replicas')
+        g._db_replica = random.choice(replicas) if replicas else None
+    return g._db_replica
+
+
+def use_primary():
+    # 이 요청의 남은 읽기를 primary에서 한다 (방금 바뀐 데이터를 캐시에 담을 때 등)
+    if has_request_context():
+        g._db_primary = True
+
+
+def _reads_from_replica():
+    if not has_request_context() or request.method not in READ_METHODS:
+        return False
+    if g.get('_db_wrote') or g.get('_db_primary'):
+        return False
+    return http_session.get(STICKY_SESSION_KEY, 0) < time.time()
+
+
+# GET/HEAD 요청의 SELECT를 replica로 보내는 세션
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+                if has_request_context():
+                    g._db_wrote = True
+            elif (isinstance(clause, Select) and clause._for_update_arg is None
+                  and _reads_from_replica()):
+                key = _replica_key()
+                if key is not None:
+                    return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def pool_report(db):
+    report = {}
+    for key, engine in db.engines.items():
+        pool = engine.pool
+        item = {'url': engine.url.render_as_string(hide_password=True), 'status': pool.status()}
+        stats = getattr(pool, 'wait_stats', None)
+        if stats is not None:
+            item['checked_out'] = pool.checkedout()
+            item['overflow'] = pool.overflow()
+            item.update(stats.to_dict())
+        report[key or 'primary'] = item
+    return report
@@ -0,0 +1,184 @@
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import and_, case, delete
+from sqlalchemy.sql import func
+
+from models import db, Event, Participant, Feedback, User
+from services import cache, counters, event_calendar, leaderboard, search, seating
+from services.jobs import enqueue, job
+
+# 행사/계정 삭제
+# 자식 행(참가자/피드백)은 스키마의 ON DELETE CASCADE로 DB가 지운다 (ORM은 자식을 읽지 않는다).
+# 자식 행이 많으면 요청에서는 행사를 삭제 대기(Event.deleted)로 숨기고 검색/순위표/캐시만 정리하며,
+# 실제 삭제는 작업 큐(services/jobs)가 chunk_size개씩 나눠 커밋해서 긴 잠금을 피한다.
+
+CHUNK_SIZE = 1000
+BACKGROUND_THRESHOLD = 5000  # 이 개수를 넘는 자식 행이 있으면 백그라운드에서 삭제
+CHUNK_PAUSE = 0.05  # 초. chunk 사이에 다른 트랜잭션이 잠금을 얻을 틈을 준다
+
+
+def _delete_in_chunks(model, column, value, chunk_size, pause):
+    # PK 순으로 chunk_size개씩 지우고 바로 커밋
+    deleted = 0
+    while True:
+        ids = [row.id for row in db.session.query(model.id)
+               .filter(column == value)
+               .order_by(model.id)
+               .limit(chunk_size)]
+        if not ids:
+            return deleted
+        db.session.execute(delete(model).where(model.id.in_(ids)))
+        db.session.commit()
+        deleted += len(ids)
+        if pause:
+            time.sleep(pause)
+
+
+def _delete_event_row(event_id):
+    # 행사 행을 지우고 달력 버킷에서 뺀다 (숨길 때 이미 뺀 행사는 제외, 커밋은 호출한 쪽에서)
+    row = db.session.query(Event.date, Event.deleted).filter(Event.id == event_id).first()
+    db.session.execute(delete(Event).where(Event.id == event_id))
+    if row is not None and not row.deleted:
+        event_calendar.event_removed(row.date)
+
+
+def _hide_events(event_ids):
+    # 백그라운드 삭제가 끝날 때까지 목록/상세에서 숨기고 달력 버킷에서 뺀다 (커밋은 호출한 쪽에서)
+    rows = db.session.query(Event.id, Event.date)\
+        .filter(Event.id.in_(event_ids), Event.deleted.is_(False))\
+        .with_for_update().all()
+    if not rows:
+        return
+    Event.query.filter(Event.id.in_([row.id for row in rows]))\
+        .update({Event.deleted: True, Event.version: Event.version + 1, Event.updated_at: datetime.utcnow()},
+                synchronize_session=False)
+    for row in rows:
+        event_calendar.event_removed(row.date)
+
+
+def purge_event(event_id, chunk_size=CHUNK_SIZE, pause=CHUNK_PAUSE):
+    # 참가자/피드백을 나눠 지운 뒤 행사 행을 지운다
+    _delete_in_chunks(Participant, Participant.event_id, event_id, chunk_size, pause)
+    _delete_in_chunks(Feedback, Feedback.event_id, event_id, chunk_size, pause)
+    _delete_event_row(event_id)
+    db.session.commit()
+
+
+def _release_registrations(user_id):
+    # 탈퇴하는 사용자가 다른 행사에 신청한 좌석을 카운터에서 빼고 대기자를 승격.
+    # [(행사, 참가 인원 변화)]를 반환 (커밋 후 순위표/캐시 갱신용)
+    # 대기자로만 신청한 행사도 참가자 목록이 바뀌므로 함께 센다 (좌석 수는 대기자 제외)
+    seated = Participant.waitlisted.is_(False)
+    rows = db.session.query(
+        Event.id.label('id'),
+        Event.title.label('title'),
+        Event.date.label('date'),
+        func.sum(case((seated, 1), else_=0)).label('total'),
+        func.sum(case((and_(seated, Participant.attendance == True), 1), else_=0)).label('attended')  # noqa: E712
+    ).join(Participant, Participant.event_id == Event.id)\
+     .filter(Participant.user_id == user_id, Event.user_id != user_id)\
+     .group_by(Event.id, Event.title, Event.date)\
+     .all()
+    db.session.execute(delete(Participant).where(Participant.user_id == user_id))
+    changes = []
+    for row in rows:
+        total = int(row.total or 0)
+        counters.participants_removed(row.id, total, int(row.attended or 0))
+        promoted = seating.fill_open_seats(row.id) if total else 0
+        changes.append((row, promoted - total))
+    return changes
+
+
+def _after_registrations_released(changes):
+    for event, delta in changes:
+        if delta:
+            leaderboard.adjust(event, delta)
+        cache.bump_event(event.id)
+
+
+def _forget_events(event_ids):
+    # 삭제(예정)된 행사를 검색 색인/순위표/페이지 캐시에서 바로 뺀다
+    for event_id in event_ids:
+        search.remove_event(event_id)
+        leaderboard.remove_event(event_id)
+        cache.bump_event(event_id)
+    cache.bump_global()
+
+
+def purge_account(user_id, chunk_size=CHUNK_SIZE, pause=CHUNK_PAUSE):
+    # 사용자가 만든 행사를 하나씩 나눠 지운 뒤 사용자 행을 지운다
+    event_ids = [row.id for row in db.session.query(Event.id).filter(Event.user_id == user_id)]
+    for event_id in event_ids:
+        purge_event(event_id, chunk_size, pause)
+    changes = _release_registrations(user_id)
+    db.session.execute(delete(User).where(User.id == user_id))
+    db.session.commit()
+    _after_registrations_released(changes)
+
+
+def event_size(event_id):
+    # 비정규화 카운터로 자식 행 수를 어림 (대기자는 participant_count에 포함되지 않으므로 넉넉히 잡는다)
+    row = db.session.query(Event.participant_count, Event.rating_count).filter(Event.id == event_id).first()
+    return (row.participant_count + row.rating_count) if row else 0
+
+
+def account_size(user_id):
+    total = db.session.query(func.coalesce(func.sum(Event.participant_count + Event.rating_count), 0))\
+        .filter(Event.user_id == user_id).scalar()
+    return int(total)
+
+
+def _chunk_size():
+    return current_app.config.get('DELETE_CHUNK_SIZE', CHUNK_SIZE)
+
+
+# 큰 행사/계정 삭제는 작업 큐로 넘긴다 (한 번에 하나씩, 재시작해도 이어서 진행)
+@job('event.purge', concurrency=1)
+def purge_event_job(event_id):
+    purge_event(event_id, _chunk_size())
+
+
+@job('account.purge', concurrency=1)
+def purge_account_job(user_id):
+    purge_account(user_id, _chunk_size())
+
+
+def _threshold():
+    return current_app.config.get('DELETE_BACKGROUND_THRESHOLD', BACKGROUND_THRESHOLD)
+
+
+def delete_event(event_id):
+    # 작으면 바로 삭제(DB가 자식 행 cascade), 크면 백그라운드로 넘긴다. 백그라운드면 True
+    background = event_size(event_id) > _threshold()
+    if background:
+        # 작업이 실행되기 전에도 바로 사라지도록 이 트랜잭션에서 숨긴다
+        _hide_events([event_id])
+        db.session.commit()
+        enqueue('event.purge', event_id=event_id)
+    else:
+        _delete_event_row(event_id)
+        db.session.commit()
+    _forget_events([event_id])
+    return background
+
+
+def delete_account(user_id):
+    # 작으면 바로 삭제, 크면 로그인을 막아 두고 백그라운드로 넘긴다. 백그라운드면 True
+    event_ids = [row.id for row in db.session.query(Event.id).filter(Event.user_id == user_id)]
+    background = account_size(user_id) > _threshold()
+    if background:
+        # 삭제가 끝날 때까지 다시 로그인하지 못하도록 비밀번호를 무효화
+        User.query.filter_by(id=user_id).update({User.password: '!'}, synchronize_session=False)
+        _hide_events(event_ids)
+        db.session.commit()
+        enqueue('account.purge', user_id=user_id)
+    else:
+        changes = _release_registrations(user_id)
+        event_calendar.user_events_removed(user_id)
+        db.session.execute(delete(User).where(User.id == user_id))
+        db.session.commit()
+        _after_registrations_released(changes)
+    _forget_events(event_ids)
+    return background
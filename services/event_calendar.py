@@ -0,0 +1,122 @@
+from collections import namedtuple
+from datetime import date, datetime
+
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from models import db, Event, EventDay, Location
+from services.pagination import decode_cursor, encode_cursor
+
+MAX_RANGE_DAYS = 366
+DEFAULT_PER_PAGE = 100
+MAX_PER_PAGE = 500
+
+# 달력(월/주) 조회
+# 날짜별 행사 수는 event_day 테이블에 미리 세어 두고(행사 생성/수정/삭제와 같은 트랜잭션에서 갱신)
+# 월 격자는 최대 42행만 읽는다. 장소로 거를 때는 (date, location_id, id) 커버링 인덱스에서
+# 테이블을 읽지 않고 센다. 삭제 대기(Event.deleted) 행사는 세지 않는다.
+
+CalendarPage = namedtuple('CalendarPage', ['items', 'next_cursor'])
+
+
+def as_date(value):
+    # 폼에서 온 문자열/Event.__init__이 만든 datetime을 date로
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
+
+def _adjust(day, delta):
+    # 해당 날짜 버킷을 delta만큼 증감 (없으면 만든다)
+    dialect = db.session.get_bind().dialect.name
+    values = {'day': day, 'event_count': delta}
+    if dialect == 'mysql':
+        stmt = mysql.insert(EventDay).values(**values)
+        stmt = stmt.on_duplicate_key_update(event_count=EventDay.event_count + delta)
+    elif dialect in ('sqlite', 'postgresql'):
+        module = sqlite if dialect == 'sqlite' else postgresql
+        stmt = module.insert(EventDay).values(**values).on_conflict_do_update(
+            index_elements=['day'], set_={'event_count': EventDay.event_count + delta}
+        )
+    else:
+        result = db.session.execute(
+            update(EventDay).where(EventDay.day == day).values(event_count=EventDay.event_count + delta)
+        )
+        if result.rowcount:
+            return
+        stmt = insert(EventDay).values(**values)
+    db.session.execute(stmt)
+
+
+def event_added(day):
+    _adjust(as_date(day), 1)
+
+
+def event_removed(day, count=1):
+    _adjust(as_date(day), -count)
+
+
+def event_moved(old_day, new_day):
+    old_day, new_day = as_date(old_day), as_date(new_day)
+    if old_day != new_day:
+        # 동시에 반대로 옮기는 수정과 교착되지 않도록 날짜 순으로 잠근다
+        for day, delta in sorted([(old_day, -1), (new_day, 1)]):
+            _adjust(day, delta)
+
+
+def user_events_removed(user_id):
+    # 사용자의 행사가 DB cascade로 한꺼번에 지워지기 전에 호출
+    rows = db.session.query(Event.date, func.count(Event.id))\
+        .filter(Event.user_id == user_id, Event.deleted.is_(False)).group_by(Event.date).all()
+    for day, count in rows:
+        event_removed(day, count)
+
+
+def rebuild():
+    # event 테이블에서 버킷을 다시 만든다 (flask repair-counters)
+    db.session.execute(delete(EventDay))
+    db.session.execute(
+        insert(EventDay).from_select(
+            ['day', 'event_count'],
+            select(Event.date, func.count(Event.id)).where(Event.deleted.is_(False)).group_by(Event.date)
+        )
+    )
+    db.session.commit()
+
+
+def day_counts(date_from, date_to, location_id=None):
+    if location_id is None:
+        rows = db.session.query(EventDay.day, EventDay.event_count)\
+            .filter(EventDay.day.between(date_from, date_to), EventDay.event_count > 0)
+    else:
+        rows = db.session.query(Event.date, func.count(Event.id))\
+            .filter(Event.date.between(date_from, date_to), Event.location_id == location_id, Event.deleted.is_(False))\
+            .group_by(Event.date)
+    return {day.isoformat(): count for day, count in rows}
+
+
+def events_in_range(date_from, date_to, location_id=None, cursor=None, per_page=DEFAULT_PER_PAGE):
+    # (date, id) 오름차순 키셋 페이지
+    query = db.session.query(Event.id, Event.title, Event.date, Location.name.label('location'))\
+        .outerjoin(Location, Location.id == Event.location_id)\
+        .filter(Event.date.between(date_from, date_to), Event.deleted.is_(False))
+    if location_id is not None:
+        query = query.filter(Event.location_id == location_id)
+
+    values = decode_cursor(cursor)
+    if values and len(values) == 2:
+        try:
+            last_date, last_id = date.fromisoformat(values[0]), int(values[1])
+        except (TypeError, ValueError):
+            pass
+        else:
+            query = query.filter(or_(
+                Event.date > last_date,
+                and_(Event.date == last_date, Event.id > last_id)
+            ))
+
+    rows = query.order_by(Event.date, Event.id).limit(per_page + 1).all()
+    next_cursor = encode_cursor(rows[per_page - 1].date, rows[per_page - 1].id) if len(rows) > per_page else None
+    return CalendarPage(rows[:per_page], next_cursor)
@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+import zlib
+from collections import namedtuple
+from datetime import date
+
+from sqlalchemy import select
+
+from models import db, Event, Participant, Feedback
+
+# 참가자/출석/피드백 내보내기 (CSV, NDJSON)
+# 행은 yield_per로 서버 측 커서에서 FETCH_SIZE개씩 받아 바로 인코딩해 내보내므로
+# 전체 행 수와 관계없이 메모리는 FETCH_SIZE개 행 + 출력 버퍼 정도만 쓴다.
+# 정렬은 자식 테이블 PK 순서라 정렬 버퍼 없이 첫 행부터 바로 흘려보낸다.
+
+FETCH_SIZE = 1000
+FLUSH_BYTES = 64 * 1024  # 출력 버퍼가 이만큼 차면 내보낸다
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+Dataset = namedtuple('Dataset', ['model', 'columns', 'filters'])
+
+
+class ExportError(ValueError):
+    pass
+
+
+# 데이터셋 이름 -> (기준 테이블, 내보낼 컬럼, 추가 조건)
+DATASETS = {
+    'participants': Dataset(Participant, {
+        'id': Participant.id,
+        'event_id': Event.id,
+        'event_title': Event.title,
+        'event_date': Event.date,
+        'name': Participant.name,
+        'contact': Participant.contact,
+        'student_id': Participant.student_id,
+        'attendance': Participant.attendance,
+        'waitlisted': Participant.waitlisted,
+    }, ()),
+    # 출석부: 좌석이 배정된 참가자만
+    'attendance': Dataset(Participant, {
+        'event_id': Event.id,
+        'event_title': Event.title,
+        'event_date': Event.date,
+        'name': Participant.name,
+        'student_id': Participant.student_id,
+        'attendance': Participant.attendance,
+    }, (Participant.waitlisted.is_(False),)),
+    'feedback': Dataset(Feedback, {
+        'id': Feedback.id,
+        'event_id': Event.id,
+        'event_title': Event.title,
+        'event_date': Event.date,
+        'rating': Feedback.rating,
+        'feedback_text': Feedback.feedback_text,
+    }, ()),
+}
+
+
+def build_query(dataset, event_id=None, date_from=None, date_to=None):
+    spec = DATASETS[dataset]
+    model = spec.model
+    stmt = select(*[column.label(name) for name, column in spec.columns.items()])\
+        .select_from(model)\
+        .join(Event, Event.id == model.event_id)\
+        .where(Event.deleted.is_(False), *spec.filters)
+    if event_id is not None:
+        stmt = stmt.where(model.event_id == event_id)
+    if date_from is not None:
+        stmt = stmt.where(Event.date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Event.date <= date_to)
+    return stmt.order_by(model.id).execution_options(yield_per=FETCH_SIZE)
+
+
+def _value(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunks(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')  # 엑셀에서 한글이 깨지지 않도록 BOM
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_value(value) for value in row])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _ndjson_chunks(columns, rows):
+    lines = []
+    size = 0
+    for row in rows:
+        line = json.dumps(dict(zip(columns, map(_value, row))), ensure_ascii=False) + '\n'
+        lines.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield ''.join(lines).encode('utf-8')
+            lines = []
+            size = 0
+    yield ''.join(lines).encode('utf-8')
+
+
+def gzip_chunks(chunks):
+    # gzip 스트림으로 감싼다 (wbits=31: gzip 헤더/트레일러 포함)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream(dataset, fmt, event_id=None, date_from=None, date_to=None):
+    # 응답 본문 생성기. 요청 컨텍스트 안에서 반복해야 한다 (stream_with_context)
+    if dataset not in DATASETS:
+        raise ExportError(f'알 수 없는 데이터: {dataset}')
+    if fmt not in FORMATS:
+        raise ExportError(f'지원하지 않는 형식: {fmt}')
+    if date_from and date_to and date_from > date_to:
+        raise ExportError('시작일이 종료일보다 늦습니다.')
+
+    columns = list(DATASETS[dataset].columns)
+    stmt = build_query(dataset, event_id, date_from, date_to)
+
+    def rows():
+        result = db.session.execute(stmt)
+        try:
+            for partition in result.partitions():
+                yield from partition
+        finally:
+            result.close()
+
+    encode = _csv_chunks if fmt == 'csv' else _ndjson_chunks
+    return encode(columns, rows())
+
+
+def filename(dataset, fmt, event_id=None, date_from=None, date_to=None):
+    if event_id is not None:
+        scope = f'event{event_id}'
+    else:
+        scope = f"{date_from or 'start'}_{date_to or 'end'}"
+    return f'{dataset}_{scope}.{fmt}'
@@ -0,0 +1,16 @@
+from models import db, Feedback
+from services.pagination import keyset_page
+
+# 피드백 목록은 최신순(id 내림차순) 키셋 페이지로만 읽는다.
+# 평균/평점 분포는 Event의 비정규화 카운터(rating_count, rating_N_count)에서 읽으므로
+# 피드백 수와 관계없이 페이지당 쿼리 하나로 끝난다.
+
+CURSOR_PARAM = 'feedback_cursor'
+PER_PAGE = 10
+
+
+def feedback_page(event_id, cursor, per_page=PER_PAGE):
+    # feedback.event_id 인덱스는 PK(id)를 포함하므로 (event_id, id) 범위 탐색이 된다
+    query = db.session.query(Feedback.id, Feedback.feedback_text, Feedback.rating)\
+        .filter(Feedback.event_id == event_id)
+    return keyset_page(query, Feedback.id, cursor, per_page)
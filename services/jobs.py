@@ -0,0 +1,378 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from flask import current_app
+
+from models import db
+
+# 요청 밖에서 처리할 작업 큐
+# 작업은 로컬 SQLite 파일(JOBS_DB_PATH)에 먼저 기록되므로 프로세스가 재시작돼도 사라지지 않는다.
+# 같은 서버의 워커 프로세스들이 파일을 공유하고, 각 프로세스의 러너가 작업을 하나씩 가져가 실행한다.
+# 가져간 작업에는 잠금 기한(locked_until)이 붙고 실행하는 동안 러너가 계속 연장한다.
+# 연장이 끊긴 작업(죽은 프로세스)은 어느 러너든 다음 claim에서 다시 대기열에 넣는다.
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 5  # 초. 재시도할 때마다 두 배
+POLL_INTERVAL = 1.0  # 초
+LEASE = 60  # 초. 실행 중인 작업의 잠금 시간 (러너가 LEASE / 3마다 연장)
+RETENTION = 24 * 3600  # 초. 끝난 작업 기록 보관 기간
+
+JobType = namedtuple('JobType', ['name', 'handler', 'max_attempts', 'concurrency'])
+
+_registry = {}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    locked_by TEXT,
+    locked_until REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_run_at ON jobs (status, run_at);
+"""
+
+
+def job(name, max_attempts=DEFAULT_MAX_ATTEMPTS, concurrency=1):
+    # 작업 핸들러 등록. 핸들러는 앱 컨텍스트 안에서 payload를 키워드 인자로 받는다
+    def decorator(handler):
+        _registry[name] = JobType(name, handler, max_attempts, concurrency)
+        return handler
+    return decorator
+
+
+class JobQueue:
+    def __init__(self, path):
+        self.path = path
+        with self._connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            # 잠금 컬럼이 없던 예전 파일
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+            for column, kind in (('locked_by', 'TEXT'), ('locked_until', 'REAL')):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} {kind}')
+
+    def _connect(self):
+        # 스레드마다 짧게 연결해서 쓴다 (autocommit)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def put(self, job_type, payload, delay=0):
+        now = time.time()
+        with self._connection() as conn:
+            cursor = conn.execute(
+                'INSERT INTO jobs (type, payload, max_attempts, run_at, created_at) VALUES (?, ?, ?, ?, ?)',
+                (job_type.name, json.dumps(payload), job_type.max_attempts, now + delay, now)
+            )
+            return cursor.lastrowid
+
+    def put_many(self, job_type, payloads, delay=0):
+        # 여러 작업을 한 트랜잭션(쓰기 한 번)으로 기록
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(
+                    'INSERT INTO jobs (type, payload, max_attempts, run_at, created_at) VALUES (?, ?, ?, ?, ?)',
+                    [(job_type.name, json.dumps(payload), job_type.max_attempts, now + delay, now) for payload in payloads]
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+    def claim(self, lease=LEASE):
+        # 실행할 작업 하나를 running으로 바꾸고 잠가서 가져온다 (BEGIN IMMEDIATE로 다른 프로세스와 겹치지 않게)
+        # 반환값의 locked_by는 이번 잠금의 토큰. renew/finish/fail에 같이 넘긴다
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            # 잠금이 만료된 작업 회수. 이미 마지막 시도였으면 실패로 끝낸다
+            expired = "status = 'running' AND (locked_until IS NULL OR locked_until < ?)"
+            conn.execute(
+                f"UPDATE jobs SET status = 'failed', finished_at = ?, error = ?, locked_by = NULL, locked_until = NULL "
+                f"WHERE {expired} AND attempts >= max_attempts",
+                (now, 'LeaseExpired: 실행하던 프로세스가 응답하지 않습니다.', now)
+            )
+            conn.execute(
+                f"UPDATE jobs SET status = 'queued', run_at = ?, locked_by = NULL, locked_until = NULL WHERE {expired}",
+                (now, now)
+            )
+            # 작업 종류별 동시 실행 수는 모든 프로세스의 running 작업으로 센다
+            busy = [
+                row['type'] for row in conn.execute("SELECT type, COUNT(*) AS n FROM jobs WHERE status = 'running' GROUP BY type")
+                if row['type'] in _registry and row['n'] >= _registry[row['type']].concurrency
+            ]
+            exclude = f"AND type NOT IN ({','.join('?' * len(busy))})" if busy else ''
+            row = conn.execute(
+                f"SELECT * FROM jobs WHERE status = 'queued' AND run_at <= ? {exclude} ORDER BY run_at, id LIMIT 1",
+                (now, *busy)
+            ).fetchone()
+            claimed = None
+            if row is not None:
+                claimed = dict(row, locked_by=uuid.uuid4().hex)
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, locked_by = ?, locked_until = ? "
+                    "WHERE id = ?",
+                    (now, claimed['locked_by'], now + lease, row['id'])
+                )
+            conn.execute('COMMIT')
+            return claimed
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def renew(self, leases, lease=LEASE):
+        # 실행 중인 작업의 잠금 연장 (leases: 작업 id -> 토큰). 이미 다른 러너가 회수한 작업은 건드리지 않는다
+        locked_until = time.time() + lease
+        with self._connection() as conn:
+            conn.executemany(
+                "UPDATE jobs SET locked_until = ? WHERE id = ? AND locked_by = ? AND status = 'running'",
+                [(locked_until, job_id, token) for job_id, token in leases.items()]
+            )
+
+    def finish(self, job_id, token):
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, error = NULL, locked_by = NULL, locked_until = NULL "
+                "WHERE id = ? AND locked_by = ?",
+                (time.time(), job_id, token)
+            )
+
+    def fail(self, job_id, token, attempts, max_attempts, error):
+        now = time.time()
+        with self._connection() as conn:
+            if attempts < max_attempts:
+                delay = RETRY_BASE_DELAY * 2 ** (attempts - 1)
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', run_at = ?, error = ?, locked_by = NULL, locked_until = NULL "
+                    "WHERE id = ? AND locked_by = ?",
+                    (now + delay, error, job_id, token)
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', finished_at = ?, error = ?, locked_by = NULL, locked_until = NULL "
+                    "WHERE id = ? AND locked_by = ?",
+                    (now, error, job_id, token)
+                )
+
+    def prune(self, retention=RETENTION):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM jobs WHERE status = 'done' AND finished_at < ?", (time.time() - retention,))
+
+    def retry(self, job_id):
+        # 실패한 작업을 바로 다시 실행
+        with self._connection() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = 0, run_at = ? WHERE id = ? AND status = 'failed'",
+                (time.time(), job_id)
+            ).rowcount == 1
+
+    def stats(self, window=3600):
+        since = time.time() - window
+        with self._connection() as conn:
+            depth = {}
+            for row in conn.execute('SELECT type, status, COUNT(*) AS n FROM jobs GROUP BY type, status'):
+                depth.setdefault(row['type'], {})[row['status']] = row['n']
+            latency = {
+                row['type']: {
+                    'completed': row['n'],
+                    'avg_wait_ms': round((row['wait'] or 0) * 1000, 1),
+                    'max_wait_ms': round((row['max_wait'] or 0) * 1000, 1),
+                    'avg_run_ms': round((row['run'] or 0) * 1000, 1),
+                }
+                for row in conn.execute(
+                    """SELECT type, COUNT(*) AS n,
+                              AVG(started_at - created_at) AS wait,
+                              MAX(started_at - created_at) AS max_wait,
+                              AVG(finished_at - started_at) AS run
+                       FROM jobs WHERE status = 'done' AND finished_at >= ? GROUP BY type""",
+                    (since,)
+                )
+            }
+            oldest = conn.execute(
+                "SELECT MIN(created_at) FROM jobs WHERE status = 'queued' AND run_at <= ?", (time.time(),)
+            ).fetchone()[0]
+            failed = [
+                dict(row) for row in conn.execute(
+                    "SELECT id, type, payload, attempts, error, finished_at FROM jobs WHERE status = 'failed' "
+                    "ORDER BY finished_at DESC LIMIT 20"
+                )
+            ]
+        return {
+            'depth': depth,
+            'latency': latency,
+            'oldest_queued_age_s': round(time.time() - oldest, 1) if oldest else 0,
+            'recent_failures': failed,
+        }
+
+
+# 대기열에서 작업을 가져와 스레드 풀에서 실행하고, 실행 중인 작업의 잠금을 연장한다
+class JobRunner:
+    def __init__(self, app, job_queue, workers=DEFAULT_WORKERS, poll_interval=POLL_INTERVAL):
+        self._app = app
+        self._queue = job_queue
+        self._workers = workers
+        self._poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._running = {}  # 작업 종류 -> 실행 중인 수
+        self._leases = {}  # 실행 중인 작업 id -> 잠금 토큰
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='job-runner', daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def running(self):
+        with self._lock:
+            return dict(self._running)
+
+    def _full(self):
+        with self._lock:
+            return len(self._leases) >= self._workers
+
+    def join(self):
+        self._thread.join()
+
+    def _run(self):
+        last_prune = 0
+        last_renew = time.monotonic()
+        while True:
+            row = None
+            try:
+                if time.monotonic() - last_renew > LEASE / 3:
+                    with self._lock:
+                        leases = dict(self._leases)
+                    if leases:
+                        self._queue.renew(leases)
+                    last_renew = time.monotonic()
+                if time.monotonic() - last_prune > 3600:
+                    self._queue.prune()
+                    last_prune = time.monotonic()
+                if not self._full():
+                    row = self._queue.claim()
+            except Exception:
+                self._app.logger.exception('작업 대기열을 읽는 중 오류가 발생했습니다.')
+            if row is None:
+                self._wakeup.wait(self._poll_interval)
+                self._wakeup.clear()
+                continue
+            with self._lock:
+                self._running[row['type']] = self._running.get(row['type'], 0) + 1
+                self._leases[row['id']] = row['locked_by']
+            self._executor.submit(self._execute, row)
+
+    def _execute(self, row):
+        job_type = _registry.get(row['type'])
+        try:
+            if job_type is None:
+                raise LookupError(f"등록되지 않은 작업 종류: {row['type']}")
+            with self._app.app_context():
+                try:
+                    job_type.handler(**json.loads(row['payload']))
+                except Exception:
+                    db.session.rollback()
+                    raise
+            self._queue.finish(row['id'], row['locked_by'])
+        except Exception as e:
+            self._app.logger.exception('작업 %s(%s) 실행 중 오류가 발생했습니다.', row['id'], row['type'])
+            max_attempts = job_type.max_attempts if job_type else row['max_attempts']
+            self._queue.fail(row['id'], row['locked_by'], row['attempts'] + 1, max_attempts, f'{type(e).__name__}: {e}')
+        finally:
+            with self._lock:
+                self._running[row['type']] -= 1
+                del self._leases[row['id']]
+            self.wake()
+
+
+_runner_lock = threading.Lock()
+
+
+def get_queue(app=None):
+    app = app or current_app
+    job_queue = app.extensions.get('job_queue')
+    if job_queue is None:
+        with _runner_lock:
+            job_queue = app.extensions.get('job_queue')
+            if job_queue is None:
+                path = app.config.get('JOBS_DB_PATH')
+                if not path:
+                    # 재부팅/임시 파일 정리에도 남도록 기본값은 인스턴스 폴더
+                    os.makedirs(app.instance_path, exist_ok=True)
+                    path = os.path.join(app.instance_path, 'jobs.db')
+                job_queue = app.extensions['job_queue'] = JobQueue(path)
+    return job_queue
+
+
+def get_runner(app=None):
+    app = app or current_app
+    runner = app.extensions.get('job_runner')
+    if runner is None:
+        job_queue = get_queue(app)
+        with _runner_lock:
+            runner = app.extensions.get('job_runner')
+            if runner is None:
+                runner = app.extensions['job_runner'] = JobRunner(
+                    app, job_queue, workers=app.config.get('JOBS_WORKERS', DEFAULT_WORKERS)
+                )
+    return runner
+
+
+def enqueue(name, delay=0, **payload):
+    # 작업을 기록하고 러너를 깨운다. payload는 JSON으로 저장할 수 있는 값만 넣는다
+    job_type = _registry[name]
+    job_id = get_queue().put(job_type, payload, delay=delay)
+    if current_app.config.get('JOBS_RUN_IN_PROCESS', True):
+        get_runner().wake()
+    return job_id
+
+
+def enqueue_many(name, payloads, delay=0):
+    # 같은 종류의 작업 여러 개를 한 번에 기록한다 (신청 그룹 커밋처럼 요청마다 쓰지 않을 때)
+    if not payloads:
+        return
+    get_queue().put_many(_registry[name], payloads, delay=delay)
+    if current_app.config.get('JOBS_RUN_IN_PROCESS', True):
+        get_runner().wake()
+
+
+def init_jobs(app):
+    # 러너는 첫 요청 때 시작한다 (앱 생성/임포트 시점에는 스레드를 띄우지 않는다).
+    # JOBS_RUN_IN_PROCESS=0이면 웹 프로세스는 기록만 하고 `flask run-jobs` 프로세스가 실행한다
+    if not app.config.get('JOBS_RUN_IN_PROCESS', True):
+        return
+
+    @app.before_request
+    def start_job_runner():
+        get_runner(app)
@@ -0,0 +1,173 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+from flask import current_app
+
+from models import db, Event
+
+MAX_TOP_N = 100
+STORE_SIZE = MAX_TOP_N * 2  # 메모리에 두는 최대 행사 수 (감소로 빠지는 행사를 대비해 여유를 둔다)
+RESEED_INTERVAL = 300  # 초. 다른 워커에서 생긴 변경을 주기적으로 반영
+
+PopularEvent = namedtuple('PopularEvent', ['id', 'title', 'date', 'participant_count'])
+
+
+# 참가자 수 기준 인기 행사 순위표 (상위 STORE_SIZE개만 유지)
+# event.participant_count(비정규화 카운터) 상위 행사로 한 번 채운 뒤, 참가 신청/취소 때마다
+# 해당 행사의 카운터를 행에서 다시 읽어 반영하므로 조회 시 participant 테이블을 읽지 않는다.
+# _floor는 순위표 밖 행사의 참가자 수 상한이다. 순위표의 모든 행사는 _floor 이상이므로
+# 순위표 안의 순서가 곧 전체 순위다. 행사가 _floor 아래로 내려가면 순위표에서 뺀다.
+class Leaderboard:
+    def __init__(self, size=STORE_SIZE):
+        self._size = size
+        self._lock = threading.Lock()
+        self._seed_lock = threading.Lock()  # 다시 채우기는 한 번에 하나만
+        self._entries = {}  # event_id -> PopularEvent
+        self._ranking = []  # (-participant_count, event_id) 오름차순 정렬
+        self._floor = 0
+        self._seeded_at = None
+
+    def seed(self):
+        # 상위 size+1개를 읽어 size개를 두고, 남은 하나의 참가자 수를 _floor로 삼는다
+        rows = db.session.query(Event.id, Event.title, Event.date, Event.participant_count)\
+            .filter(Event.participant_count > 0, Event.deleted.is_(False))\
+            .order_by(Event.participant_count.desc(), Event.id)\
+            .limit(self._size + 1)\
+            .all()
+        floor = rows[self._size].participant_count if len(rows) > self._size else 0
+        entries = {row.id: PopularEvent(row.id, row.title, row.date, row.participant_count) for row in rows[:self._size]}
+        ranking = sorted((-entry.participant_count, entry.id) for entry in entries.values())
+        with self._lock:
+            self._entries = entries
+            self._ranking = ranking
+            self._floor = floor
+            self._seeded_at = time.monotonic()
+
+    def _ensure_seeded(self):
+        if self._seeded_at is None:
+            # 처음에는 한 요청만 채우고 나머지는 기다렸다가 그 결과를 쓴다
+            with self._seed_lock:
+                if self._seeded_at is None:
+                    self.seed()
+            return
+        expired = time.monotonic() - self._seeded_at > RESEED_INTERVAL
+        shrunk = self._floor and len(self._entries) < MAX_TOP_N  # 감소/삭제로 순위표 밖 행사가 필요해졌다
+        if expired or shrunk:
+            # 한 요청만 다시 채우고, 다른 요청은 기다리지 않고 기존 순위표를 쓴다
+            if self._seed_lock.acquire(blocking=False):
+                try:
+                    self.seed()
+                finally:
+                    self._seed_lock.release()
+
+    def _discard(self, event_id):
+        entry = self._entries.pop(event_id, None)
+        if entry:
+            key = (-entry.participant_count, event_id)
+            index = bisect_left(self._ranking, key)
+            if index < len(self._ranking) and self._ranking[index] == key:
+                del self._ranking[index]
+        return entry
+
+    def _store(self, entry):
+        self._entries[entry.id] = entry
+        insort(self._ranking, (-entry.participant_count, entry.id))
+        if len(self._ranking) > self._size:
+            # 가장 적은 행사를 빼고 그 수를 순위표 밖의 상한으로 올린다
+            _, evicted_id = self._ranking.pop()
+            evicted = self._entries.pop(evicted_id)
+            self._floor = max(self._floor, evicted.participant_count)
+
+    def refresh(self, event):
+        # 커밋된 카운터를 행에서 읽어 반영한다 (증감량을 더하지 않으므로 순위표 밖 행사도 정확하다)
+        if self._seeded_at is None:
+            return  # 아직 채우기 전이면 첫 조회 때 DB 카운터로 반영된다
+        count = db.session.query(Event.participant_count)\
+            .filter(Event.id == event.id, Event.deleted.is_(False)).scalar()
+        with self._lock:
+            entry = self._discard(event.id)
+            if not count:
+                return
+            if count < self._floor:
+                # 순위표 밖 행사보다 적을 수 있으므로 빼 둔다 (다시 늘면 이 경로로 들어온다)
+                return
+            if entry is None and len(self._ranking) >= self._size and count <= -self._ranking[-1][0]:
+                self._floor = max(self._floor, count)
+                return
+            self._store(PopularEvent(event.id, event.title, event.date, count))
+
+    def update_event(self, event):
+        with self._lock:
+            entry = self._discard(event.id)
+            if entry:
+                self._store(entry._replace(title=event.title, date=event.date))
+
+    def remove_event(self, event_id):
+        with self._lock:
+            self._discard(event_id)
+
+    def _query_top(self, n, since):
+        # 순위표만으로 n개를 채울 수 없을 때 (since로 거른 경우 등) DB에서 직접 센다.
+        # since가 있으면 idx_event_date_popularity로 기간 안의 행만 읽어 정렬한다 (테이블 전체를 정렬하지 않음)
+        query = db.session.query(Event.id, Event.title, Event.date, Event.participant_count)\
+            .filter(Event.participant_count > 0, Event.deleted.is_(False))
+        if since:
+            query = query.filter(Event.date >= since)
+        rows = query.order_by(Event.participant_count.desc(), Event.id).limit(n)
+        return [PopularEvent(row.id, row.title, row.date, row.participant_count) for row in rows]
+
+    def top(self, n=1, since=None):
+        self._ensure_seeded()
+        n = max(1, min(n, MAX_TOP_N))
+        result = []
+        with self._lock:
+            floor = self._floor
+            for _, event_id in self._ranking:
+                entry = self._entries[event_id]
+                if since and entry.date < since:
+                    continue
+                result.append(entry)
+                if len(result) == n:
+                    break
+        if len(result) < n and floor:
+            # 순위표 밖에 참가자가 있는 행사가 더 있을 수 있다
+            return self._query_top(n, since)
+        return result
+
+
+def get_leaderboard():
+    leaderboard = current_app.extensions.get('event_leaderboard')
+    if leaderboard is None:
+        leaderboard = current_app.extensions.setdefault('event_leaderboard', Leaderboard())
+    return leaderboard
+
+
+def seed():
+    get_leaderboard().seed()
+
+
+def adjust(event, delta):
+    if delta:
+        get_leaderboard().refresh(event)
+
+
+def participant_added(event, count=1):
+    adjust(event, count)
+
+
+def participant_removed(event, count=1):
+    adjust(event, -count)
+
+
+def update_event(event):
+    get_leaderboard().update_event(event)
+
+
+def remove_event(event_id):
+    get_leaderboard().remove_event(event_id)
+
+
+def top(n=1, since=None):
+    return get_leaderboard().top(n, since=since)
@@ -0,0 +1,84 @@
+from flask import current_app
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from models import db, Location
+
+WARM_LIMIT = 10000  # 시작할 때 미리 읽는 장소 수 (장소는 몇 개 되지 않는다)
+
+# 장소 이름 -> id
+# 워커마다 이름 -> id 사전을 두고, 없는 이름만 upsert 한 번으로 id를 얻는다.
+# upsert는 요청 트랜잭션과 별도로 바로 커밋하므로, 행사 생성이 실패해 롤백돼도
+# 캐시에 남은 id는 실제로 있는 행을 가리키고, 동시에 같은 이름을 넣어도 unique 오류가 나지 않는다.
+
+
+def _get_cache():
+    # 이름 -> id 사전. 값은 한 번 정해지면 바뀌지 않으므로 잠금 없이 읽고 쓴다
+    return current_app.extensions.setdefault('location_cache', {})
+
+
+def normalize(name):
+    return (name or '').strip()
+
+
+def warm():
+    # 기존 장소를 한 번에 읽어 둔다 (warm_up 또는 처음 resolve할 때)
+    rows = db.session.execute(select(Location.name, Location.id).limit(WARM_LIMIT)).all()
+    _get_cache().update({row.name: row.id for row in rows})
+    # lookup()이 먼저 사전을 만들 수 있으므로 채웠는지는 따로 기록한다
+    current_app.extensions['location_cache_warmed'] = True
+    return len(rows)
+
+
+def _upsert(connection, name):
+    dialect = connection.dialect.name
+    if dialect == 'mysql':
+        # 이미 있으면 LAST_INSERT_ID(id)로 기존 id를 돌려받는다 (왕복 한 번)
+        stmt = mysql.insert(Location).values(name=name)
+        stmt = stmt.on_duplicate_key_update(id=func.last_insert_id(Location.id))
+        return connection.execute(stmt).lastrowid
+    if dialect in ('sqlite', 'postgresql'):
+        module = sqlite if dialect == 'sqlite' else postgresql
+        stmt = module.insert(Location).values(name=name).on_conflict_do_nothing(index_elements=['name'])
+        result = connection.execute(stmt)
+        if result.rowcount == 1 and result.inserted_primary_key:
+            return result.inserted_primary_key[0]
+    else:
+        try:
+            with connection.begin_nested():
+                return connection.execute(insert(Location).values(name=name)).inserted_primary_key[0]
+        except IntegrityError:
+            pass
+    # 다른 요청이 먼저 넣은 경우
+    return connection.execute(select(Location.id).where(Location.name == name)).scalar_one()
+
+
+def resolve(name):
+    # 장소 이름의 id를 반환 (없으면 만든다). 빈 이름이면 None
+    name = normalize(name)
+    if not name:
+        return None
+    if not current_app.extensions.get('location_cache_warmed'):
+        warm()  # WARMUP 없이 시작했으면 처음 쓸 때 채운다
+    location_cache = _get_cache()
+    location_id = location_cache.get(name)
+    if location_id is None:
+        with db.engine.begin() as connection:
+            location_id = _upsert(connection, name)
+        location_cache[name] = location_id
+    return location_id
+
+
+def lookup(name):
+    # 조회 전용 (없는 장소를 만들지 않는다). 없으면 None
+    name = normalize(name)
+    if not name:
+        return None
+    location_cache = _get_cache()
+    location_id = location_cache.get(name)
+    if location_id is None:
+        location_id = db.session.query(Location.id).filter(Location.name == name).scalar()
+        if location_id is not None:
+            location_cache[name] = location_id
+    return location_id
@@ -0,0 +1,52 @@
+from collections import namedtuple
+
+from sqlalchemy.orm import load_only
+
+from models import db, Event, Participant, User, UserRole
+from services.pagination import EventPage, Section, keyset_page
+
+# 마이페이지 섹션별 커서 파라미터 이름
+CURSOR_PARAMS = ('events_cursor', 'registered_cursor', 'requests_cursor')
+
+MyPageData = namedtuple('MyPageData', ['events', 'registered_events', 'admin_requests'])
+
+
+def created_events(user_id, cursor, per_page):
+    # (date, id) 내림차순. idx_event_user_date 인덱스 범위 탐색
+    query = Event.query.options(load_only(Event.id, Event.title, Event.date, Event.description, Event.updated_at))\
+        .filter(Event.user_id == user_id)
+    page = EventPage(query, cursor, per_page)
+    items = list(page)
+    return Section(items, page.next_cursor)
+
+
+def registered_events(user_id, cursor, per_page):
+    # 신청 순서(참가자 id) 내림차순. 템플릿이 더 읽지 않도록 필요한 컬럼만 한 번에 가져온다
+    query = db.session.query(
+        Participant.id.label('id'),
+        Event.id.label('event_id'),
+        Event.title.label('title'),
+        Event.date.label('date'),
+        Event.description.label('description'),
+        Event.updated_at.label('updated_at'),
+        Participant.attendance.label('attendance'),
+        Participant.waitlisted.label('waitlisted'),
+        Participant.uuid.label('participant_uuid')
+    ).join(Event, Event.id == Participant.event_id)\
+     .filter(Participant.user_id == user_id, Event.deleted.is_(False))
+    return keyset_page(query, Participant.id, cursor, per_page)
+
+
+def admin_requests(cursor, per_page):
+    # 가입 순서(id) 오름차순. idx_user_role(role, id) 인덱스 범위 탐색
+    query = db.session.query(User.id, User.name, User.email).filter(User.role == UserRole.USER)
+    return keyset_page(query, User.id, cursor, per_page, descending=False)
+
+
+def load_mypage(user, cursors, per_page):
+    # 섹션마다 한 번씩, 최대 3개의 쿼리로 마이페이지 데이터를 읽는다
+    return MyPageData(
+        events=created_events(user.id, cursors.get('events_cursor'), per_page),
+        registered_events=registered_events(user.id, cursors.get('registered_cursor'), per_page),
+        admin_requests=admin_requests(cursors.get('requests_cursor'), per_page) if user.is_superadmin() else None
+    )
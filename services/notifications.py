@@ -0,0 +1,56 @@
+import json
+import urllib.request
+
+from flask import current_app
+
+from models import db, Event, Participant
+from services.jobs import enqueue, enqueue_many, job
+
+WEBHOOK_TIMEOUT = 5  # 초
+
+# 참가 신청 확인 알림
+# 신청 요청에서는 작업만 기록하고, 알림은 작업 큐에서 보낸다 (실패하면 재시도).
+# NOTIFY_WEBHOOK_URL이 있으면 JSON으로 POST하고, 없으면 로그만 남긴다.
+
+
+def _post(url, payload):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'}, method='POST')
+    with urllib.request.urlopen(req, timeout=WEBHOOK_TIMEOUT) as response:
+        response.read()
+
+
+@job('participant.confirmation', max_attempts=5)
+def send_confirmation(participant_uuid):
+    row = db.session.query(
+        Participant.name, Participant.contact, Participant.waitlisted, Event.id, Event.title, Event.date
+    ).join(Event, Event.id == Participant.event_id)\
+     .filter(Participant.uuid == participant_uuid).first()
+    if row is None:
+        return  # 그 사이 신청이 취소됨
+
+    # 실행 시점의 상태를 보낸다 (그 사이 대기자에서 승격됐을 수 있음)
+    payload = {
+        'type': 'participant.confirmation',
+        'participant_uuid': participant_uuid,
+        'name': row.name,
+        'contact': row.contact,
+        'event_id': row.id,
+        'event_title': row.title,
+        'event_date': row.date.isoformat() if row.date else None,
+        'status': 'waitlisted' if row.waitlisted else 'confirmed',
+    }
+    url = current_app.config.get('NOTIFY_WEBHOOK_URL')
+    if url:
+        _post(url, payload)
+    else:
+        current_app.logger.info('참가 신청 확인: %s', payload)
+
+
+def confirm_registration(participant_uuid):
+    enqueue('participant.confirmation', participant_uuid=participant_uuid)
+
+
+def confirm_registrations(participant_uuids):
+    # 그룹 커밋된 신청들의 알림을 작업 큐에 한 번에 기록
+    enqueue_many('participant.confirmation', [{'participant_uuid': value} for value in participant_uuids])
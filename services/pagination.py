@@ -0,0 +1,105 @@
+import base64
+import json
+from collections import namedtuple
+from datetime import date
+
+from sqlalchemy import and_, or_
+
+from models import Event
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+Section = namedtuple('Section', ['items', 'next_cursor'])
+
+
+def clamp_per_page(value):
+    # 잘못된 값이 들어오면 기본값 사용
+    try:
+        per_page = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PER_PAGE
+    return max(1, min(per_page, MAX_PER_PAGE))
+
+
+def encode_cursor(*values):
+    # 마지막 행의 정렬 키를 URL에 안전한 불투명 문자열로 인코딩
+    payload = [v.isoformat() if isinstance(v, date) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    # 손상된 커서는 첫 페이지로 취급
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def _last_id(cursor):
+    # 단일 id 키셋 커서
+    values = decode_cursor(cursor)
+    if not values or len(values) != 1:
+        return None
+    try:
+        return int(values[0])
+    except (TypeError, ValueError):
+        return None
+
+
+def keyset_page(query, id_column, cursor, per_page, descending=True):
+    # id 하나로 정렬하는 키셋 페이지. 행에 id 속성이 있어야 한다
+    last_id = _last_id(cursor)
+    if last_id is not None:
+        query = query.filter(id_column < last_id if descending else id_column > last_id)
+    order = id_column.desc() if descending else id_column.asc()
+    rows = query.order_by(order).limit(per_page + 1).all()
+    next_cursor = encode_cursor(rows[per_page - 1].id) if len(rows) > per_page else None
+    return Section(rows[:per_page], next_cursor)
+
+
+# (date, id) 내림차순 키셋 페이지
+# 반복하는 동안 행을 하나씩 가져오므로 템플릿 스트리밍과 함께 쓰면
+# 모든 행을 읽기 전에 첫 바이트를 보낼 수 있다. next_cursor는 반복이 끝난 뒤에 채워진다
+class EventPage:
+    def __init__(self, query, cursor=None, per_page=DEFAULT_PER_PAGE):
+        self.per_page = per_page
+        self.next_cursor = None
+
+        # 백그라운드 삭제를 기다리는 행사는 목록에서 뺀다
+        query = query.filter(Event.deleted.is_(False))
+        position = self._decode_position(cursor)
+        if position:
+            last_date, last_id = position
+            # idx_event_date(date) 인덱스는 PK(id)를 포함하므로 (date, id) 범위 탐색이 된다
+            query = query.filter(or_(
+                Event.date < last_date,
+                and_(Event.date == last_date, Event.id < last_id)
+            ))
+
+        # 다음 페이지 존재 여부 확인을 위해 한 행 더 가져온다
+        self._query = query.order_by(Event.date.desc(), Event.id.desc()).limit(per_page + 1)
+
+    @staticmethod
+    def _decode_position(cursor):
+        values = decode_cursor(cursor)
+        if not values or len(values) != 2:
+            return None
+        try:
+            return date.fromisoformat(values[0]), int(values[1])
+        except (TypeError, ValueError):
+            return None
+
+    def __iter__(self):
+        last = None
+        for index, event in enumerate(self._query.yield_per(self.per_page)):
+            if index == self.per_page:
+                self.next_cursor = encode_cursor(last.date, last.id)
+                break
+            last = event
+            yield event
@@ -0,0 +1,183 @@
+import csv
+import io
+import uuid
+from collections import namedtuple
+
+from sqlalchemy import insert, or_
+
+from models import db, Participant, CONTACT_PATTERN
+from services import seating
+
+IMPORT_BATCH_SIZE = 500
+
+# 명렬표 헤더 -> Participant 컬럼 (영문/한글 헤더 모두 허용)
+COLUMN_ALIASES = {
+    'name': 'name', '이름': 'name', '성명': 'name',
+    'contact': 'contact', '연락처': 'contact', '전화번호': 'contact',
+    'student_id': 'student_id', '학번': 'student_id',
+}
+REQUIRED_COLUMNS = ('name', 'contact', 'student_id')
+
+RowError = namedtuple('RowError', ['row', 'message'])
+
+
+class RosterImportError(ValueError):
+    pass
+
+
+class ImportReport:
+    def __init__(self):
+        self.inserted = 0
+        self.seated = 0
+        self.errors = []
+
+    def add_error(self, row, message):
+        self.errors.append(RowError(row, message))
+
+    def to_dict(self):
+        return {
+            'inserted': self.inserted,
+            'seated': self.seated,
+            'waitlisted': self.inserted - self.seated,
+            'errors': [{'row': error.row, 'message': error.message} for error in self.errors]
+        }
+
+
+def _cell(value):
+    # 엑셀 숫자 셀(1012345678.0 등)도 문자열로 맞춘다
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _iter_csv(stream):
+    # 업로드 스트림을 한 줄씩 읽는다 (BOM 있는 엑셀 CSV 포함)
+    yield from csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+
+
+def _iter_xlsx(stream):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RosterImportError('XLSX 파일을 읽으려면 openpyxl 패키지가 필요합니다.')
+    # read_only 모드는 시트를 한 행씩 스트리밍한다
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_rows(file_storage):
+    # (행 번호, {name, contact, student_id}) 를 순서대로 반환
+    filename = (file_storage.filename or '').lower()
+    if filename.endswith('.xlsx'):
+        rows = _iter_xlsx(file_storage.stream)
+    elif filename.endswith('.csv'):
+        rows = _iter_csv(file_storage.stream)
+    else:
+        raise RosterImportError('CSV 또는 XLSX 파일만 업로드할 수 있습니다.')
+
+    header = next(rows, None)
+    if header is None:
+        raise RosterImportError('빈 파일입니다.')
+    columns = [COLUMN_ALIASES.get(_cell(name).lower()) for name in header]
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise RosterImportError(f"필수 열이 없습니다: {', '.join(missing)}")
+
+    for row_number, values in enumerate(rows, start=2):
+        record = {}
+        for column, value in zip(columns, values):
+            if column:
+                record[column] = _cell(value)
+        if any(record.values()):
+            yield row_number, record
+
+
+def _existing_keys(event_id, batch):
+    # 배치 전체를 한 번의 쿼리로 unique_event_student_id / unique_event_contact 와 대조
+    student_ids = {record['student_id'] for _, record in batch}
+    contacts = {record['contact'] for _, record in batch}
+    rows = db.session.query(Participant.student_id, Participant.contact)\
+        .filter(Participant.event_id == event_id)\
+        .filter(or_(Participant.student_id.in_(student_ids), Participant.contact.in_(contacts)))
+    existing_student_ids, existing_contacts = set(), set()
+    for student_id, contact in rows:
+        existing_student_ids.add(student_id)
+        existing_contacts.add(contact)
+    return existing_student_ids, existing_contacts
+
+
+def _import_batch(event_id, batch, seen_student_ids, seen_contacts, report):
+    # 배치 단위로 연락처 형식을 한 번에 검사
+    valid = [bool(CONTACT_PATTERN.match(record['contact'])) for _, record in batch]
+
+    candidates = []
+    for (row_number, record), contact_ok in zip(batch, valid):
+        if not all(record.get(column) for column in REQUIRED_COLUMNS):
+            report.add_error(row_number, '이름, 연락처, 학번을 모두 입력해야 합니다.')
+        elif not contact_ok:
+            report.add_error(row_number, f"유효하지 않은 연락처 형식입니다: {record['contact']}")
+        elif record['student_id'] in seen_student_ids:
+            report.add_error(row_number, f"파일 안에서 학번이 중복됩니다: {record['student_id']}")
+        elif record['contact'] in seen_contacts:
+            report.add_error(row_number, f"파일 안에서 연락처가 중복됩니다: {record['contact']}")
+        else:
+            seen_student_ids.add(record['student_id'])
+            seen_contacts.add(record['contact'])
+            candidates.append((row_number, record))
+
+    if not candidates:
+        return
+
+    existing_student_ids, existing_contacts = _existing_keys(event_id, candidates)
+    values = []
+    for row_number, record in candidates:
+        if record['student_id'] in existing_student_ids:
+            report.add_error(row_number, f"이미 해당 학번으로 등록된 참가자가 있습니다: {record['student_id']}")
+        elif record['contact'] in existing_contacts:
+            report.add_error(row_number, f"이미 해당 연락처로 등록된 참가자가 있습니다: {record['contact']}")
+        else:
+            values.append({
+                'name': record['name'],
+                'contact': record['contact'],
+                'student_id': record['student_id'],
+                'event_id': event_id,
+                'user_id': None,  # 업로드한 관리자의 신청으로 보이지 않도록 계정과 연결하지 않는다
+                'uuid': str(uuid.uuid4()),
+            })
+
+    if values:
+        # 남은 좌석만큼 앞에서부터 배정하고 나머지는 대기자로 등록
+        granted = seating.allocate_seats(event_id, len(values))
+        for index, value in enumerate(values):
+            value['waitlisted'] = index >= granted
+            value['attendance'] = index < granted
+
+        # executemany 한 번으로 배치 삽입
+        db.session.execute(insert(Participant), values)
+        report.inserted += len(values)
+        report.seated += granted
+
+
+def import_participants(event_id, rows, batch_size=IMPORT_BATCH_SIZE):
+    # 전체를 하나의 트랜잭션으로 처리 (좌석 배정 카운터도 함께 롤백된다)
+    report = ImportReport()
+    seen_student_ids, seen_contacts = set(), set()
+    batch = []
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _import_batch(event_id, batch, seen_student_ids, seen_contacts, report)
+                batch = []
+        if batch:
+            _import_batch(event_id, batch, seen_student_ids, seen_contacts, report)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return report
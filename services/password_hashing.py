@@ -0,0 +1,125 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+DEFAULT_TIMEOUT = 10  # 초
+
+
+class HashingBusy(Exception):
+    # 대기열이 가득 찼거나 제한 시간 안에 해시를 끝내지 못했거나 워커 프로세스가 죽음 (503으로 응답)
+    pass
+
+
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify(stored, password):
+    return check_password_hash(stored, password)
+
+
+def needs_rehash(stored, method=DEFAULT_METHOD):
+    # werkzeug 해시 형식: "<method>$<salt>$<hash>"
+    return stored.split('$', 1)[0] != method
+
+
+# 해시 계산을 별도 프로세스에서 처리하는 풀. 실행 중 + 대기 작업 수를 제한한다
+class HashingPool:
+    def __init__(self, workers=None, queue_limit=None, timeout=DEFAULT_TIMEOUT):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_limit = self.workers * 4 if queue_limit is None else queue_limit
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_limit)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # 첫 사용 시 생성. 스레드가 있는 워커를 fork하지 않도록 spawn을 쓴다
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+        return self._executor
+
+    def _replace_broken(self, executor):
+        # 워커 프로세스가 죽으면 풀 전체가 깨지므로 버리고 새 풀을 만든다 (다른 요청이 이미 바꿨으면 그대로)
+        with self._lock:
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._replace_broken(executor)
+            raise HashingBusy()
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HashingBusy()
+        except BrokenProcessPool:
+            self._replace_broken(executor)
+            raise HashingBusy()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def get_pool():
+    pool = current_app.extensions.get('password_hashing')
+    if pool is None:
+        config = current_app.config
+        pool = HashingPool(
+            workers=config.get('PASSWORD_HASH_WORKERS'),
+            queue_limit=config.get('PASSWORD_HASH_QUEUE'),
+            timeout=config.get('PASSWORD_HASH_TIMEOUT', DEFAULT_TIMEOUT)
+        )
+        pool = current_app.extensions.setdefault('password_hashing', pool)
+    return pool
+
+
+def _method():
+    return current_app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+
+
+def hash_password(password):
+    return get_pool().run(_hash, password, _method())
+
+
+def verify_password(stored, password):
+    return get_pool().run(_verify, stored, password)
+
+
+def upgrade_hash(user, password):
+    # 로그인 성공 후 예전 방식/파라미터로 저장된 해시를 현재 설정으로 다시 만든다.
+    # 바쁠 때는 건너뛰고 다음 로그인에서 다시 시도한다
+    if not needs_rehash(user.password, _method()):
+        return False
+    try:
+        user.password = hash_password(password)
+    except HashingBusy:
+        return False
+    return True
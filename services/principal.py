@@ -0,0 +1,55 @@
+from collections import namedtuple
+
+from flask import current_app, g, session
+
+from models import db, User, UserRole
+from services.cache import LRUCache
+
+DEFAULT_TTL = 60  # 초. 다른 워커에서 바뀐 권한은 최대 이 시간 뒤에 반영된다
+DEFAULT_MAX_ENTRIES = 4096
+
+
+# 권한 확인에 필요한 사용자 정보만 담는다 (User 행 전체를 읽지 않는다)
+class Principal(namedtuple('Principal', ['id', 'name', 'role'])):
+    __slots__ = ()
+
+    def is_admin(self):
+        return self.role in [UserRole.ADMIN, UserRole.SUPERADMIN]
+
+    def is_superadmin(self):
+        return self.role == UserRole.SUPERADMIN
+
+
+def _get_cache():
+    cache = current_app.extensions.get('principal_cache')
+    if cache is None:
+        cache = LRUCache(max_entries=current_app.config.get('PRINCIPAL_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        cache = current_app.extensions.setdefault('principal_cache', cache)
+    return cache
+
+
+def get_principal(user_id):
+    cache = _get_cache()
+    principal = cache.get(user_id)
+    if principal is None:
+        row = db.session.query(User.id, User.name, User.role).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        principal = Principal(row.id, row.name, row.role)
+        cache.set(user_id, principal, ttl=current_app.config.get('PRINCIPAL_CACHE_TTL', DEFAULT_TTL))
+    return principal
+
+
+def current_principal():
+    # 로그인한 사용자의 Principal (요청 안에서는 한 번만 조회). 로그인하지 않았거나 탈퇴한 경우 None
+    if 'user_id' not in session:
+        return None
+    if '_principal' not in g:
+        g._principal = get_principal(session['user_id'])
+    return g._principal
+
+
+def invalidate(user_id):
+    # 권한 변경/삭제를 커밋한 뒤 호출
+    _get_cache().delete(user_id)
+    g.pop('_principal', None)
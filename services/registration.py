@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+from collections import Counter, namedtuple
+
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from models import db, Participant
+from services import cache, leaderboard, notifications, seating
+
+BATCH_INTERVAL = 0.005  # 초. 이 시간 동안 모인 신청을 한 번에 커밋
+MAX_BATCH_SIZE = 500
+SUBMIT_TIMEOUT = 5
+
+EventRef = namedtuple('EventRef', ['id', 'title', 'date'])
+
+
+def integrity_error_message(error):
+    # unique 제약 조건 위반을 사용자 메시지로 변환 (MySQL은 제약 이름, SQLite는 컬럼 이름이 들어온다)
+    text = str(getattr(error, 'orig', error)).lower()
+    if 'unique_event_student_id' in text or 'participant.student_id' in text:
+        return '이미 해당 학번으로 등록된 참가자가 있습니다.'
+    if 'unique_event_contact' in text or 'participant.contact' in text:
+        return '이미 해당 연락처로 등록된 참가자가 있습니다.'
+    return None
+
+
+class PendingRegistration:
+    __slots__ = ('values', 'event', 'done', 'error', 'seated')
+
+    def __init__(self, values, event):
+        # 일단 대기자로 넣고 커밋 직전에 남은 좌석만큼 배정한다
+        self.values = dict(values, waitlisted=True, attendance=False)
+        self.event = event
+        self.done = threading.Event()
+        self.error = None
+        self.seated = False
+
+
+# 참가 신청 그룹 커밋 배처
+# 요청 스레드는 신청을 큐에 넣고 기다리며, 백그라운드 스레드가 BATCH_INTERVAL 동안
+# 모인 신청을 한 번의 INSERT(executemany)와 한 번의 커밋으로 처리한다.
+# 중복 검사는 unique 제약 조건에 맡기고, 위반이 섞인 배치만 SAVEPOINT로 한 건씩 다시 넣는다.
+# 좌석은 행사별로 한 번에 배정하고(seating.seat_participants) 나머지는 대기자로 남긴다.
+# 확인 알림도 배치마다 작업 큐에 한 번만 기록한다
+class RegistrationBatcher:
+    def __init__(self, app, interval=BATCH_INTERVAL, max_batch_size=MAX_BATCH_SIZE):
+        self._app = app
+        self._interval = interval
+        self._max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='registration-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, values, event, timeout=SUBMIT_TIMEOUT):
+        pending = PendingRegistration(values, EventRef(event.id, event.title, event.date))
+        self._queue.put(pending)
+        if not pending.done.wait(timeout):
+            raise TimeoutError('참가 신청 처리 시간이 초과되었습니다.')
+        if pending.error is not None:
+            raise pending.error
+        return pending.seated
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._interval
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                with self._app.app_context():
+                    self._flush(batch)
+            except Exception:
+                self._app.logger.exception('참가 신청 배치 처리 중 오류가 발생했습니다.')
+
+    def _insert_one_by_one(self, batch):
+        accepted = []
+        for pending in batch:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(Participant), [pending.values])
+                accepted.append(pending)
+            except IntegrityError as e:
+                pending.error = e
+        return accepted
+
+    def _flush(self, batch):
+        committed = []
+        try:
+            try:
+                db.session.execute(insert(Participant), [pending.values for pending in batch])
+                accepted = batch
+            except IntegrityError:
+                db.session.rollback()
+                accepted = self._insert_one_by_one(batch)
+
+            by_event = {}
+            for pending in accepted:
+                by_event.setdefault(pending.event, []).append(pending)
+            for event, pendings in by_event.items():
+                seated = set(seating.seat_participants(event.id, [pending.values['uuid'] for pending in pendings]))
+                for pending in pendings:
+                    pending.seated = pending.values['uuid'] in seated
+            db.session.commit()
+            committed = [pending for pending in accepted if pending.seated]
+        except Exception as e:
+            db.session.rollback()
+            for pending in batch:
+                if pending.error is None:
+                    pending.error = e
+        finally:
+            db.session.remove()
+            for pending in batch:
+                pending.done.set()
+
+        # 순위표와 페이지 캐시 버전은 커밋이 끝난 뒤에만 반영
+        for event, count in Counter(pending.event for pending in committed).items():
+            leaderboard.participant_added(event, count)
+        for event_id in {pending.event.id for pending in batch if pending.error is None}:
+            cache.bump_event(event_id)
+        try:
+            notifications.confirm_registrations([pending.values['uuid'] for pending in batch if pending.error is None])
+        except Exception:
+            self._app.logger.exception('참가 신청 확인 알림 작업을 기록하지 못했습니다.')
+
+
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    batcher = current_app.extensions.get('registration_batcher')
+    if batcher is None:
+        with _batcher_lock:
+            batcher = current_app.extensions.get('registration_batcher')
+            if batcher is None:
+                batcher = RegistrationBatcher(
+                    current_app._get_current_object(),
+                    interval=current_app.config.get('REGISTRATION_BATCH_INTERVAL', BATCH_INTERVAL)
+                )
+                current_app.extensions['registration_batcher'] = batcher
+    return batcher
+
+
+def submit(values, event):
+    # 좌석이 배정되면 True, 대기자로 등록되면 False
+    return get_batcher().submit(values, event)
@@ -0,0 +1,251 @@
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import func, text
+
+from models import db, Event
+from services.pagination import encode_cursor, decode_cursor
+
+NGRAM_SIZE = 2
+TITLE_WEIGHT = 2  # 제목에 나온 토큰은 설명보다 가중치를 높게
+SYNC_INTERVAL = 2.0  # 초. 다른 워커/프로세스가 바꾼 행사를 색인에 반영하는 주기
+SYNC_MARGIN = timedelta(seconds=60)  # 늦게 커밋된 트랜잭션의 updated_at도 읽도록 겹쳐 읽는 범위
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(value, n=NGRAM_SIZE):
+    # 한국어는 띄어쓰기만으로 검색어가 잘리지 않으므로 단어를 n-gram으로 쪼갠다
+    # ("과학전시회" -> "과학", "학전", "전시", "시회")
+    tokens = []
+    for word in _WORD_RE.findall((value or '').lower()):
+        if len(word) <= n:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+# SQLite/테스트 환경용 프로세스 내 역색인 검색 엔진
+# 첫 검색 때 한 번만 전체 이벤트로 색인을 만들고, 이후에는
+# index_event/remove_event로 변경된 이벤트만 갱신한다.
+# 색인은 워커마다 따로 있으므로 검색할 때 SYNC_INTERVAL마다 DB의 updated_at(idx_event_updated_at)으로
+# 다른 워커가 만들거나 고치거나 숨긴 행사를 다시 읽고, 행 수가 다르면 지워진 행사를 뺀다
+class InMemorySearchEngine:
+    name = 'memory'
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = defaultdict(dict)  # token -> {event_id: 가중 빈도}
+        self._documents = {}  # event_id -> 해당 문서의 토큰 집합
+        self._built = False
+        self._watermark = None  # 색인에 반영한 가장 늦은 updated_at
+        self._synced_at = 0
+
+    def _load(self, since=None):
+        # since 이후(SYNC_MARGIN만큼 겹쳐서) 바뀐 행사를 색인에 반영한다
+        query = db.session.query(Event.id, Event.title, Event.description, Event.deleted, Event.updated_at)
+        if since is not None:
+            query = query.filter(Event.updated_at >= since - SYNC_MARGIN)
+        for row in query.yield_per(1000):
+            self._remove(row.id)
+            if not row.deleted:
+                self._add(row.id, row.title, row.description)
+            if self._watermark is None or row.updated_at > self._watermark:
+                self._watermark = row.updated_at
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            self._load()
+            self._built = True
+            self._synced_at = time.monotonic()
+
+    def _sync(self):
+        if time.monotonic() - self._synced_at < SYNC_INTERVAL:
+            return
+        with self._lock:
+            if time.monotonic() - self._synced_at < SYNC_INTERVAL:
+                return
+            self._synced_at = time.monotonic()
+            self._load(self._watermark)
+            # 바로 지운 행사는 행이 없어 updated_at으로 찾을 수 없다
+            count = db.session.query(func.count(Event.id)).filter(Event.deleted.is_(False)).scalar()
+            if count != len(self._documents):
+                live = {row.id for row in db.session.query(Event.id).filter(Event.deleted.is_(False))}
+                for event_id in set(self._documents) - live:
+                    self._remove(event_id)
+
+    def _add(self, event_id, title, description):
+        weights = defaultdict(int)
+        for token in tokenize(title):
+            weights[token] += TITLE_WEIGHT
+        for token in tokenize(description):
+            weights[token] += 1
+        for token, weight in weights.items():
+            self._postings[token][event_id] = weight
+        self._documents[event_id] = set(weights)
+
+    def _remove(self, event_id):
+        for token in self._documents.pop(event_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(event_id, None)
+            if not postings:
+                del self._postings[token]
+
+    def index_event(self, event):
+        # 아직 색인을 만들기 전이면 첫 검색 때 함께 색인된다
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(event.id)
+            self._add(event.id, event.title, event.description)
+
+    def remove_event(self, event_id):
+        with self._lock:
+            if self._built:
+                self._remove(event_id)
+
+    def _postings_for(self, token):
+        if len(token) >= NGRAM_SIZE:
+            return self._postings.get(token, {})
+        # 한 글자 검색어는 그 글자를 포함하는 모든 토큰을 합친다
+        merged = {}
+        for candidate, postings in self._postings.items():
+            if token in candidate:
+                for event_id, weight in postings.items():
+                    merged[event_id] = merged.get(event_id, 0) + weight
+        return merged
+
+    def search(self, query, after=None, limit=20):
+        self._ensure_built()
+        self._sync()
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+
+        with self._lock:
+            total = max(len(self._documents), 1)
+            scores = None
+            # 모든 토큰을 포함하는 문서만 남기고 tf-idf 합으로 점수를 매긴다
+            for token in sorted(tokens, key=lambda t: len(self._postings_for(t))):
+                postings = self._postings_for(token)
+                if not postings:
+                    return []
+                idf = math.log(1 + total / len(postings))
+                if scores is None:
+                    scores = {event_id: weight * idf for event_id, weight in postings.items()}
+                else:
+                    scores = {
+                        event_id: score + postings[event_id] * idf
+                        for event_id, score in scores.items()
+                        if event_id in postings
+                    }
+                if not scores:
+                    return []
+
+        ranked = sorted(
+            ((round(score, 6), event_id) for event_id, score in scores.items()),
+            reverse=True
+        )
+        if after:
+            ranked = [item for item in ranked if item < after]
+        return ranked[:limit]
+
+
+# eventmanagement.sql의 idx_event_full_text_search FULLTEXT 인덱스를 쓰는 엔진
+# 색인은 MySQL이 관리하므로 index_event/remove_event는 아무 일도 하지 않는다
+class MySQLFullTextSearchEngine:
+    name = 'mysql'
+
+    _MATCH = "MATCH(title, description) AGAINST (:query IN NATURAL LANGUAGE MODE)"
+
+    def index_event(self, event):
+        pass
+
+    def remove_event(self, event_id):
+        pass
+
+    def search(self, query, after=None, limit=20):
+        params = {'query': query, 'limit': limit}
+        having = ''
+        if after:
+            having = "HAVING score < :score OR (score = :score AND id < :id)"
+            params['score'], params['id'] = after
+        sql = text(f"""
+            SELECT id, {self._MATCH} AS score
+            FROM event
+            WHERE {self._MATCH} AND deleted = FALSE
+            {having}
+            ORDER BY score DESC, id DESC
+            LIMIT :limit
+        """)
+        rows = db.session.execute(sql, params)
+        return [(row.score, row.id) for row in rows]
+
+
+def get_search_engine():
+    # 앱마다 하나의 엔진을 두고, SEARCH_ENGINE 설정이 없으면 DB 종류로 결정
+    engine = current_app.extensions.get('event_search')
+    if engine is None:
+        kind = current_app.config.get('SEARCH_ENGINE')
+        if kind is None:
+            kind = 'mysql' if db.engine.dialect.name == 'mysql' else 'memory'
+        engine = MySQLFullTextSearchEngine() if kind == 'mysql' else InMemorySearchEngine()
+        current_app.extensions['event_search'] = engine
+    return engine
+
+
+def index_event(event):
+    get_search_engine().index_event(event)
+
+
+def remove_event(event_id):
+    get_search_engine().remove_event(event_id)
+
+
+# 관련도(score, id) 내림차순 키셋 페이지. EventPage와 같은 인터페이스
+class SearchPage:
+    def __init__(self, query, cursor=None, per_page=20):
+        self.per_page = per_page
+        self.next_cursor = None
+
+        after = self._decode_position(cursor)
+        ranked = get_search_engine().search(query, after=after, limit=per_page + 1)
+        if len(ranked) > per_page:
+            ranked = ranked[:per_page]
+            self.next_cursor = encode_cursor(*ranked[-1])
+        self._ids = [event_id for _, event_id in ranked]
+
+    @staticmethod
+    def _decode_position(cursor):
+        values = decode_cursor(cursor)
+        if not values or len(values) != 2:
+            return None
+        try:
+            return float(values[0]), int(values[1])
+        except (TypeError, ValueError):
+            return None
+
+    def __iter__(self):
+        if not self._ids:
+            return
+        # 검색 후 삭제 대기로 바뀐 행사는 건너뛴다
+        events = {event.id: event for event in Event.query.filter(Event.id.in_(self._ids), Event.deleted.is_(False))}
+        for event_id in self._ids:
+            if event_id in events:
+                yield events[event_id]
+
+
+def search_events(query, cursor=None, per_page=20):
+    return SearchPage(query, cursor=cursor, per_page=per_page)
@@ -0,0 +1,77 @@
+from sqlalchemy import or_, update
+
+from models import db, Event, Participant
+from services import counters
+
+# 정원(capacity)이 있는 행사의 좌석 배정
+# participant_count(배정된 좌석 수)를 조건부 UPDATE로 올려서 배정하므로
+# 테이블 잠금이나 COUNT(*) 없이도 동시 신청에서 정원을 넘지 않는다
+
+
+def reserve_seat(event_id):
+    # 남은 좌석이 있을 때만 카운터를 올린다. 영향받은 행이 1이면 배정 성공
+    result = db.session.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .where(or_(Event.capacity.is_(None), Event.participant_count < Event.capacity))
+        .values(
+            participant_count=Event.participant_count + 1,
+            attended_count=Event.attended_count + 1,
+            version=Event.version + 1,
+            roster_version=Event.roster_version + 1
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def allocate_seats(event_id, requested):
+    # 여러 좌석을 한 번에 배정 (일괄 등록/그룹 커밋용). 이벤트 행 하나만 잠근다
+    if requested <= 0:
+        return 0
+    row = db.session.query(Event.capacity, Event.participant_count)\
+        .filter(Event.id == event_id)\
+        .with_for_update()\
+        .one()
+    if row.capacity is None:
+        granted = requested
+    else:
+        granted = max(0, min(requested, row.capacity - row.participant_count))
+    if granted:
+        counters.participant_added(event_id, True, count=granted)
+    else:
+        counters.touch(event_id)  # 모두 대기자로 들어간다
+    return granted
+
+
+def seat_participants(event_id, uuids):
+    # 대기 상태로 넣은 참가자 중 앞에서부터 남은 좌석만큼 배정하고 배정된 uuid를 반환
+    granted = allocate_seats(event_id, len(uuids))
+    seated = uuids[:granted]
+    if seated:
+        Participant.query.filter(Participant.uuid.in_(seated))\
+            .update({Participant.waitlisted: False, Participant.attendance: True}, synchronize_session=False)
+    return seated
+
+
+def fill_open_seats(event_id):
+    # 빈 좌석이 있는 동안 대기자를 신청 순서대로 승격하고 승격 인원을 반환
+    promoted = 0
+    while True:
+        candidate = Participant.query\
+            .filter_by(event_id=event_id, waitlisted=True)\
+            .order_by(Participant.id)\
+            .with_for_update()\
+            .first()
+        if candidate is None or not reserve_seat(event_id):
+            return promoted
+        candidate.waitlisted = False
+        candidate.attendance = True
+        db.session.flush()
+        promoted += 1
+
+
+def release_seat(event_id, attended):
+    # 좌석을 반납하고 대기자를 자동 승격
+    counters.participant_removed(event_id, attended)
+    return fill_open_seats(event_id)
@@ -0,0 +1,159 @@
+import re
+import threading
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+N_PLUS_ONE_THRESHOLD = 3  # 한 요청에서 같은 모양의 쿼리가 이 횟수 이상이면 N+1 의심
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\?")
+_NUMBER_RE = re.compile(r'\b\d+\b')
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SPACE_RE = re.compile(r'\s+')
+
+_listeners_installed = False
+_install_lock = threading.Lock()
+
+
+def statement_shape(statement):
+    # 리터럴과 바인드 파라미터를 ?로 바꿔 같은 모양의 쿼리를 묶는다
+    shape = _STRING_RE.sub('?', statement)
+    shape = _PARAM_RE.sub('?', shape)
+    shape = _NUMBER_RE.sub('?', shape)
+    shape = _IN_LIST_RE.sub('(?)', shape)
+    return _SPACE_RE.sub(' ', shape).strip()
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, elapsed):
+        self.queries += 1
+        self.db_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def n_plus_one(self, threshold=N_PLUS_ONE_THRESHOLD):
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.db_time = 0.0
+        self.max_queries = 0
+        self.n_plus_one = Counter()  # 의심 쿼리 모양 -> 발견된 요청 수
+
+    def add(self, profile, suspects):
+        self.requests += 1
+        self.queries += profile.queries
+        self.db_time += profile.db_time
+        self.max_queries = max(self.max_queries, profile.queries)
+        self.n_plus_one.update(suspects.keys())
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'avg_queries': round(self.queries / self.requests, 2) if self.requests else 0,
+            'max_queries': self.max_queries,
+            'avg_db_time_ms': round(self.db_time / self.requests * 1000, 3) if self.requests else 0,
+            'total_db_time_ms': round(self.db_time * 1000, 3),
+            'n_plus_one': [
+                {'statement': shape, 'requests': count}
+                for shape, count in self.n_plus_one.most_common()
+            ],
+        }
+
+
+# 엔드포인트별 누적 통계 (프로세스 단위)
+class ProfileStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def add(self, endpoint, profile, suspects):
+        with self._lock:
+            self._endpoints.setdefault(endpoint, EndpointStats()).add(profile, suspects)
+
+    def report(self):
+        with self._lock:
+            items = [(endpoint, stats.to_dict()) for endpoint, stats in self._endpoints.items()]
+        items.sort(key=lambda item: item[1]['avg_queries'], reverse=True)
+        return dict(items)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and '_sql_profile' in g:
+        conn.info.setdefault('_sql_profiler_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_sql_profiler_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if has_request_context() and '_sql_profile' in g:
+        g._sql_profile.record(statement, elapsed)
+
+
+def _install_listeners():
+    # Engine 클래스에 등록하므로 엔진이 언제 만들어지든 모든 연결에 적용된다
+    global _listeners_installed
+    with _install_lock:
+        if not _listeners_installed:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            _listeners_installed = True
+
+
+def get_store(app):
+    return app.extensions['sql_profiler']
+
+
+def init_profiler(app):
+    # SQL_PROFILING이 켜진 경우에만 요청별 쿼리 수/DB 시간/N+1 의심 쿼리를 기록
+    app.extensions['sql_profiler'] = ProfileStore()
+    if not app.config.get('SQL_PROFILING'):
+        return
+    _install_listeners()
+    threshold = app.config.get('SQL_PROFILING_N_PLUS_ONE_THRESHOLD', N_PLUS_ONE_THRESHOLD)
+
+    @app.before_request
+    def start_sql_profile():
+        g._sql_profile = RequestProfile()
+
+    @app.after_request
+    def add_sql_profile_headers(response):
+        # 스트리밍 응답은 본문을 만들면서 쿼리를 실행하므로 헤더를 보낼 때의 수는 틀린 값이다.
+        # 이때는 헤더를 붙이지 않고, 스트림이 끝난 뒤 teardown에서 리포트(ProfileStore)에만 기록한다
+        profile = g.get('_sql_profile')
+        if profile is not None and not response.is_streamed:
+            response.headers['X-SQL-Queries'] = str(profile.queries)
+            response.headers['X-SQL-Time-Ms'] = f'{profile.db_time * 1000:.3f}'
+            response.headers['Server-Timing'] = f'db;dur={profile.db_time * 1000:.3f};desc="{profile.queries} queries"'
+            suspects = profile.n_plus_one(threshold)
+            if suspects:
+                response.headers['X-SQL-N-Plus-One'] = str(len(suspects))
+        return response
+
+    @app.teardown_request
+    def finish_sql_profile(exc):
+        profile = g.pop('_sql_profile', None)
+        if profile is None:
+            return
+        endpoint = request.endpoint or request.path
+        suspects = profile.n_plus_one(threshold)
+        for shape, count in suspects.items():
+            app.logger.warning('N+1 의심 쿼리 (%s, %d회): %s', endpoint, count, shape)
+        get_store(app).add(endpoint, profile, suspects)
@@ -0,0 +1,114 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+from jinja2 import FileSystemBytecodeCache, nodes
+from jinja2.ext import Extension
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024  # 워커마다 조각 캐시에 쓰는 메모리 상한
+
+# 템플릿 조각 캐시
+# {% cache 키..., 버전 %} ... {% endcache %} 블록의 렌더링 결과를 워커 메모리에 둔다.
+# 키 앞에는 템플릿 이름과 줄 번호가 자동으로 붙으므로 {% cache event.id, event.updated_at %}처럼
+# 행사 id와 내용 수정 시각(Event.updated_at)만 넘기면 된다. 조각에는 제목/날짜/설명만 있으므로
+# 참가 신청/체크인/피드백마다 오르는 행 버전(Event.version)은 쓰지 않는다.
+# 같은 키는 최신 버전 하나만 남기고, 전체 크기가 TEMPLATE_FRAGMENT_CACHE_BYTES를 넘으면
+# 오래 안 쓴 조각부터 버린다.
+# 사용자/권한에 따라 달라지는 내용(버튼, 출석 표시 등)은 블록 밖에 둔다.
+
+
+class FragmentStore:
+    def __init__(self, max_bytes):
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (버전, 조각, 크기)
+        self._size = 0
+
+    def get(self, key, version):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or item[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return item[1]
+
+    def set(self, key, version, value):
+        size = sys.getsizeof(value)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[2]
+            self._entries[key] = (version, value, size)
+            self._size += size
+            while self._size > self._max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+def get_store():
+    # TEMPLATE_FRAGMENT_CACHE_BYTES=0이면 None (캐시하지 않고 매번 렌더링)
+    store = current_app.extensions.get('fragment_cache')
+    if store is None:
+        max_bytes = current_app.config.get('TEMPLATE_FRAGMENT_CACHE_BYTES', DEFAULT_MAX_BYTES)
+        if not max_bytes:
+            return None
+        store = current_app.extensions.setdefault('fragment_cache', FragmentStore(max_bytes))
+    return store
+
+
+class FragmentCacheExtension(Extension):
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+
+        # 마지막 값이 버전, 나머지가 키
+        key = nodes.Tuple([nodes.Const(parser.name), nodes.Const(lineno)] + args[:-1], 'load')
+        call = self.call_method('_render', [key, args[-1]])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, key, version, caller):
+        store = get_store()
+        if store is None:
+            return caller()
+        # autoescape가 켜져 있으면 caller()는 Markup을 돌려주므로 다시 이스케이프되지 않는다
+        value = store.get(key, version)
+        if value is None:
+            value = caller()
+            store.set(key, version, value)
+        return value
+
+
+def init_templates(app):
+    # jinja_env는 처음 접근할 때 만들어지므로 그 전에 옵션을 넣는다
+    options = dict(app.jinja_options)
+    options['extensions'] = [*options.get('extensions', ()), FragmentCacheExtension]
+    # 컴파일한 템플릿 바이트코드를 파일로 남겨 새 워커는 파싱/컴파일 없이 읽는다
+    # (기본값: 임시 디렉터리의 사용자별 jinja2 캐시)
+    directory = app.config.get('JINJA_BYTECODE_CACHE_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    options['bytecode_cache'] = FileSystemBytecodeCache(directory)
+    app.jinja_options = options
+
+
+def precompile(app):
+    # 모든 템플릿을 미리 불러 메모리/바이트코드 캐시를 채운다 (warm_up)
+    env = app.jinja_env
+    names = env.list_templates(extensions=('html',))
+    for name in names:
+        env.get_template(name)
+    return len(names)
@@ -0,0 +1,74 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from models import db, Event, Location, User, UserRole
+
+
+# 테스트마다 임시 SQLite 파일과 작업 큐 파일을 쓰는 앱
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'test.db'),
+        'SECRET_KEY': 'test-secret',
+        'CACHE_BACKEND': 'none',
+        'JOBS_DB_PATH': str(tmp_path / 'jobs.db'),
+        'JOBS_RUN_IN_PROCESS': False,
+    })
+    with app.app_context():
+        db.create_all(bind_key=None)  # 모델은 모두 primary에 있다 (replica bind에는 만들지 않음)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    counter = iter(range(1, 10 ** 6))
+
+    def make_user(role=UserRole.USER):
+        n = next(counter)
+        with app.app_context():
+            user = User(name=f'사용자{n}', email=f'user{n}@test.example.com',
+                        password='!', role=role)
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+    return make_user
+
+
+@pytest.fixture
+def make_event(app, make_user):
+    # 행사를 만들고 id를 반환 (달력 버킷도 함께 맞춘다)
+    def make_event(title='과학 전시회', location='강당', days=30, **values):
+        from services import event_calendar
+        user_id = make_user(UserRole.ADMIN)
+        with app.app_context():
+            location_row = Location.query.filter_by(name=location).first() or Location(name=location)
+            db.session.add(location_row)
+            db.session.flush()
+            event = Event(title=title, date=date.today() + timedelta(days=days), location_id=location_row.id,
+                          description=values.pop('description', '학생들이 준비한 행사입니다'), user_id=user_id, **values)
+            db.session.add(event)
+            event_calendar.event_added(event.date)
+            db.session.commit()
+            return event.id
+    return make_event
+
+
+def login(client, user_id):
+    # 비밀번호 해시 풀을 띄우지 않도록 세션에 바로 넣는다
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
@@ -0,0 +1,56 @@
+def test_event_list_default_fields(client, make_event):
+    event_id = make_event(title='과학 전시회', location='강당')
+
+    response = client.get('/api/v2/events')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['next_cursor'] is None
+    assert [set(item) for item in body['events']] == [{'id', 'title', 'date', 'location'}]
+    assert body['events'][0]['id'] == event_id
+    assert body['events'][0]['location'] == '강당'
+
+
+def test_event_list_selected_fields(client, make_event):
+    make_event()
+
+    response = client.get('/api/v2/events?fields=id,title')
+
+    assert response.status_code == 200
+    assert set(response.get_json()['events'][0]) == {'id', 'title'}
+
+
+def test_event_list_unknown_field(client, make_event):
+    response = client.get('/api/v2/events?fields=id,password')
+
+    assert response.status_code == 400
+
+
+def test_event_detail_default_fields(client, make_event):
+    event_id = make_event(location='음악실')
+
+    response = client.get(f'/api/v2/events/{event_id}')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert set(body) == {'id', 'title', 'date', 'location'}
+    assert body['location'] == '음악실'
+
+
+def test_event_detail_missing(client):
+    assert client.get('/api/v2/events/999').status_code == 404
+
+
+def test_event_detail_not_modified_until_version_changes(app, client, make_event):
+    from models import db
+    from services import counters
+
+    event_id = make_event()
+    etag = client.get(f'/api/v2/events/{event_id}').headers['ETag']
+
+    assert client.get(f'/api/v2/events/{event_id}', headers={'If-None-Match': etag}).status_code == 304
+
+    with app.app_context():
+        counters.touch(event_id)
+        db.session.commit()
+    assert client.get(f'/api/v2/events/{event_id}', headers={'If-None-Match': etag}).status_code == 200
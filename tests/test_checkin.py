@@ -0,0 +1,59 @@
+import itertools
+import uuid
+
+import pytest
+
+from models import db, Participant
+from services import checkin, seating
+
+_phone_numbers = itertools.count(10000000)
+
+
+def _register(event_id, n):
+    # 좌석을 배정받은 참가자 n명의 uuid
+    uuids = []
+    for _ in range(n):
+        value = str(uuid.uuid4())
+        seated = seating.reserve_seat(event_id)
+        db.session.add(Participant(name='참가자', contact=f'010{next(_phone_numbers)}', student_id=value[:15],
+                                   event_id=event_id, uuid=value, attendance=False, waitlisted=not seated))
+        uuids.append(value)
+    db.session.commit()
+    return uuids
+
+
+@pytest.fixture
+def event_id(make_event):
+    return make_event(capacity=10)
+
+
+def test_check_in_rejects_unknown_codes(app, event_id):
+    with app.app_context():
+        uuids = _register(event_id, 2)
+        result = checkin.check_in(event_id, [uuids[0], uuids[0], str(uuid.uuid4()), 'not-a-code'])
+
+    assert result.checked_in == 1
+    assert result.already_checked_in == 0
+    assert len(result.rejected) == 2
+
+
+def test_roster_kept_across_check_ins(app, event_id):
+    with app.app_context():
+        uuids = _register(event_id, 3)
+        entry = checkin.roster(event_id)
+        checkin.check_in(event_id, uuids[:2])
+
+        # 출석 처리는 명단을 바꾸지 않으므로 다른 워커도 같은 색인을 계속 쓴다
+        assert checkin.roster(event_id) is entry
+
+
+def test_roster_reloaded_after_registration(app, event_id):
+    with app.app_context():
+        _register(event_id, 1)
+        entry = checkin.roster(event_id)
+        added = _register(event_id, 1)
+
+        reloaded = checkin.roster(event_id)
+        assert reloaded is not entry
+        assert uuid.UUID(added[0]).bytes in reloaded.uuids
+        assert checkin.check_in(event_id, added).checked_in == 1
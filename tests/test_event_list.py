@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+from models import UserRole
+
+from conftest import login
+
+
+def test_list_streams_events(client, make_event):
+    make_event(title='과학 전시회')
+    make_event(title='음악 콘서트')
+
+    response = client.get('/events/')
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    body = response.get_data(as_text=True)
+    assert '과학 전시회' in body
+    assert '음악 콘서트' in body
+
+
+def test_list_pages_with_cursor(client, make_event):
+    for days in range(1, 6):
+        make_event(title=f'행사{days}', days=days)
+
+    first = client.get('/events/?per_page=2').get_data(as_text=True)
+
+    assert '행사5' in first and '행사4' in first
+    assert '행사3' not in first
+    assert 'cursor=' in first
+
+
+def test_flash_shown_once_after_create(app, client, make_user):
+    app.config['CACHE_BACKEND'] = 'memory'
+    login(client, make_user(UserRole.ADMIN))
+    response = client.post('/events/create', data={
+        'title': '과학 전시회',
+        'date': (date.today() + timedelta(days=7)).isoformat(),
+        'location': '강당',
+    })
+    assert response.status_code == 302
+
+    assert '성공적으로 생성' in client.get('/events/').get_data(as_text=True)
+    with client.session_transaction() as session:
+        assert not session.get('_flashes')
+    assert '성공적으로 생성' not in client.get('/events/').get_data(as_text=True)
+    assert '성공적으로 생성' not in client.get('/').get_data(as_text=True)
+    # flash가 남아 있지 않으므로 목록 캐시가 다시 쓰인다
+    assert client.get('/events/').headers.get('X-Cache') == 'HIT'
+
+
+def test_fragment_key_ignores_counter_changes(app, make_event):
+    from models import Event, db
+    from services import counters
+    event_id = make_event()
+    with app.app_context():
+        before = db.session.get(Event, event_id).updated_at
+        counters.participant_added(event_id, attended=False)
+        db.session.commit()
+        db.session.expire_all()
+        event = db.session.get(Event, event_id)
+        assert event.updated_at == before
+        assert event.version > 0
+
+        # 같은 초 안에 두 번 고쳐도 수정 시각(조각 캐시 키)은 매번 바뀐다
+        event.mark_updated()
+        first = event.updated_at
+        event.mark_updated()
+        assert event.updated_at > first > before
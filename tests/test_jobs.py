@@ -0,0 +1,102 @@
+import threading
+import time
+import uuid
+
+import pytest
+
+from models import db, Participant
+from services import jobs, registration
+from services.jobs import JobQueue, job
+
+job('test.single', max_attempts=2, concurrency=1)(lambda: None)
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    return JobQueue(str(tmp_path / 'jobs.db'))
+
+
+def _job_type(name='test.single'):
+    return jobs._registry[name]
+
+
+def test_claim_locks_job(job_queue):
+    job_id = job_queue.put(_job_type(), {})
+
+    claimed = job_queue.claim()
+
+    assert claimed['id'] == job_id
+    assert claimed['locked_by']
+    assert job_queue.claim() is None  # concurrency=1, 다른 프로세스의 러너도 같은 파일을 본다
+
+
+def test_expired_lease_is_reclaimed(job_queue):
+    job_queue.put(_job_type(), {})
+    first = job_queue.claim(lease=0.05)
+    time.sleep(0.1)
+
+    second = job_queue.claim()
+
+    assert second['id'] == first['id']
+    assert second['locked_by'] != first['locked_by']
+    # 잠금을 잃은 러너의 완료 기록은 무시된다
+    job_queue.finish(first['id'], first['locked_by'])
+    assert job_queue.stats()['depth']['test.single'] == {'running': 1}
+
+
+def test_renewed_lease_is_not_reclaimed(job_queue):
+    job_queue.put(_job_type(), {})
+    claimed = job_queue.claim(lease=0.1)
+    time.sleep(0.06)
+    job_queue.renew({claimed['id']: claimed['locked_by']}, lease=0.1)
+    time.sleep(0.06)
+
+    assert job_queue.claim() is None
+
+
+def test_expired_lease_on_last_attempt_fails(job_queue):
+    job_queue.put(_job_type(), {})
+    for _ in range(2):
+        job_queue.claim(lease=0.01)
+        time.sleep(0.02)
+
+    assert job_queue.claim() is None
+    assert job_queue.stats()['depth']['test.single'] == {'failed': 1}
+
+
+def test_put_many(job_queue):
+    job_queue.put_many(_job_type(), [{}, {}, {}])
+
+    assert job_queue.stats()['depth']['test.single'] == {'queued': 3}
+
+
+def test_surge_registrations_enqueue_once_per_batch(app, make_event, monkeypatch):
+    event_id = make_event(capacity=2)
+    calls = []
+    monkeypatch.setattr(JobQueue, 'put', lambda *args, **kwargs: pytest.fail('신청마다 작업을 기록함'))
+    monkeypatch.setattr(JobQueue, 'put_many', lambda self, job_type, payloads, delay=0: calls.append(len(payloads)))
+
+    with app.app_context():
+        from models import Event
+        event = db.session.get(Event, event_id)
+        batcher = registration.RegistrationBatcher(app, interval=0.2)
+        results = []
+
+        def submit(n):
+            values = dict(name='참가자', contact=f'0101234567{n}', student_id=f'2024{n}',
+                          event_id=event_id, uuid=str(uuid.uuid4()), user_id=None)
+            results.append(batcher.submit(values, event))
+
+        threads = [threading.Thread(target=submit, args=(n,)) for n in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(results) == [False, True, True]
+        assert Participant.query.filter_by(event_id=event_id).count() == 3
+    # 알림은 신청 응답을 돌려준 뒤 배처 스레드에서 기록된다
+    deadline = time.monotonic() + 5
+    while not calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert calls == [3]
@@ -0,0 +1,15 @@
+from datetime import date, timedelta
+
+from services import leaderboard
+
+
+def test_top_since_falls_back_to_date_range(app, make_event):
+    early = make_event(title='이번 주 행사', days=2, participant_count=50)
+    later = make_event(title='다음 주 행사', days=10, participant_count=5)
+    popular = make_event(title='다음 달 행사', days=30, participant_count=20)
+    make_event(title='신청 없는 행사', days=15, participant_count=0)
+
+    with app.app_context():
+        assert [entry.id for entry in leaderboard.top(3)] == [early, popular, later]
+        since = date.today() + timedelta(days=5)
+        assert [entry.id for entry in leaderboard.top(3, since=since)] == [popular, later]
@@ -0,0 +1,53 @@
+import shutil
+
+import pytest
+
+from app import create_app
+from models import db
+from services import cache
+
+
+# replica는 테이블만 만든 시점의 primary 복사본이라 이후 쓰기가 전혀 복제되지 않는다 (복제 지연)
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'test.db'),
+        'SQLALCHEMY_REPLICA_URIS': ['sqlite:///' + str(tmp_path / 'replica.db')],
+        'SECRET_KEY': 'test-secret',
+        'CACHE_BACKEND': 'memory',
+        'JOBS_DB_PATH': str(tmp_path / 'jobs.db'),
+        'JOBS_RUN_IN_PROCESS': False,
+    })
+    with app.app_context():
+        db.create_all(bind_key=None)
+    shutil.copy(tmp_path / 'test.db', tmp_path / 'replica.db')
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def test_render_after_bump_reads_primary(app, client, make_event):
+    response = client.get('/events/')
+    response.get_data()  # 스트리밍 응답을 끝까지 읽어야 요청 컨텍스트가 닫힌다
+    assert response.headers.get('X-Cache') == 'MISS'
+    make_event(title='과학 전시회')
+    with app.app_context():
+        cache.bump_global()
+
+    # 새 버전 키에 담기는 페이지는 지연된 replica가 아니라 primary에서 읽는다
+    assert '과학 전시회' in client.get('/events/').get_data(as_text=True)
+    response = client.get('/events/')
+    assert response.headers.get('X-Cache') == 'HIT'
+    assert '과학 전시회' in response.get_data(as_text=True)
+
+
+def test_render_outside_lag_window_uses_replica(app, client, make_event):
+    app.config['DB_READ_YOUR_WRITES_SECONDS'] = 0
+    make_event(title='과학 전시회')
+    with app.app_context():
+        cache.bump_global()
+
+    assert '과학 전시회' not in client.get('/events/').get_data(as_text=True)
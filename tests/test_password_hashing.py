@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from services.password_hashing import HashingBusy, HashingPool, needs_rehash
+
+
+@pytest.fixture
+def pool():
+    pool = HashingPool(workers=1, queue_limit=1, timeout=30)
+    yield pool
+    pool.shutdown()
+
+
+def test_run_in_worker_process(pool):
+    assert pool.run(pow, 2, 10) == 1024
+
+
+def test_recovers_after_worker_crash(pool):
+    with pytest.raises(HashingBusy):
+        pool.run(os._exit, 1)
+
+    # 깨진 풀을 새 풀로 바꿨으므로 다음 요청은 정상 처리된다
+    assert pool.run(pow, 2, 10) == 1024
+
+
+def test_needs_rehash():
+    assert needs_rehash('pbkdf2:sha256:600000$salt$hash', 'scrypt:32768:8:1')
+    assert not needs_rehash('scrypt:32768:8:1$salt$hash', 'scrypt:32768:8:1')
@@ -0,0 +1,93 @@
+import threading
+
+from sqlalchemy.exc import OperationalError
+
+from models import db, Event, Participant
+from services import seating
+
+from benchmarks.seat_allocation import register
+
+
+def _event(app, event_id):
+    with app.app_context():
+        return db.session.get(Event, event_id)
+
+
+def test_reserve_seat_stops_at_capacity(app, make_event):
+    event_id = make_event(capacity=2)
+
+    with app.app_context():
+        results = [seating.reserve_seat(event_id) for _ in range(3)]
+        db.session.commit()
+
+    assert results == [True, True, False]
+    assert _event(app, event_id).participant_count == 2
+
+
+def test_reserve_seat_without_capacity(app, make_event):
+    event_id = make_event(capacity=None)
+
+    with app.app_context():
+        assert all(seating.reserve_seat(event_id) for _ in range(5))
+
+
+def test_allocate_seats_grants_remaining(app, make_event):
+    event_id = make_event(capacity=3)
+
+    with app.app_context():
+        assert seating.allocate_seats(event_id, 2) == 2
+        assert seating.allocate_seats(event_id, 2) == 1
+        assert seating.allocate_seats(event_id, 2) == 0
+        db.session.commit()
+
+    assert _event(app, event_id).participant_count == 3
+
+
+def test_release_seat_promotes_waitlist(app, make_event, make_user):
+    event_id = make_event(capacity=1)
+    user_id = make_user()
+
+    with app.app_context():
+        assert register(0, 0, event_id, user_id)
+        assert not register(0, 1, event_id, user_id)
+        seated = Participant.query.filter_by(event_id=event_id, waitlisted=False).one()
+        db.session.delete(seated)
+        promoted = seating.release_seat(event_id, seated.attendance)
+        db.session.commit()
+
+        assert promoted == 1
+        remaining = Participant.query.filter_by(event_id=event_id).one()
+        assert not remaining.waitlisted
+    assert _event(app, event_id).participant_count == 1
+
+
+def test_concurrent_registrations_never_oversell(app, make_event, make_user):
+    capacity, clients, attempts = 5, 8, 3
+    event_id = make_event(capacity=capacity)
+    user_id = make_user()
+    outcomes = []
+    lock = threading.Lock()
+    start = threading.Barrier(clients)
+
+    def client(client_id):
+        with app.app_context():
+            start.wait()
+            for attempt in range(attempts):
+                try:
+                    seated = register(client_id, attempt, event_id, user_id)
+                except OperationalError:
+                    db.session.rollback()
+                    continue
+                with lock:
+                    outcomes.append(seated)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with app.app_context():
+        seated_rows = Participant.query.filter_by(event_id=event_id, waitlisted=False).count()
+        counter = db.session.get(Event, event_id).participant_count
+    assert seated_rows == counter == outcomes.count(True) == min(capacity, len(outcomes))
@@ -0,0 +1,15 @@
+import os
+import statistics
+
+from benchmarks.startup_time import measure_once
+
+# import app + create_app() 중앙값 상한 (느린 CI에서는 STARTUP_BUDGET_MS로 올린다)
+BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', '1000'))
+RUNS = 3
+
+
+def test_startup_within_budget():
+    # 접속할 수 없는 DB 주소로 새 프로세스에서 잰다. 시작 중에 DB를 쓰면 measure_once가 RuntimeError를 낸다
+    samples = [sum(measure_once()[:2]) for _ in range(RUNS)]
+
+    assert statistics.median(samples) <= BUDGET_MS